@@ -5,7 +5,14 @@ from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
 from config import Config, DevelopmentConfig, ProductionConfig
-import logging
+from app.utils.cache import SharedCache
+from app.utils.health import HealthChecks
+from app.utils.metrics import Metrics
+from app.utils.query_profiler import QueryProfiler
+from app.utils.question_catalog import QuestionCatalog
+from app.utils.render_pool import RenderPool
+from app.utils.report_cache import ReportCache
+from app.utils.report_queue import ReportQueue
 
 db = SQLAlchemy()
 login_manager = LoginManager()
@@ -13,6 +20,14 @@ login_manager.login_view = 'auth.login'
 mail = Mail()
 migrate = Migrate()
 csrf = CSRFProtect()
+shared_cache = SharedCache()
+metrics = Metrics()
+health_checks = HealthChecks()
+query_profiler = QueryProfiler()
+question_catalog = QuestionCatalog()
+render_pool = RenderPool()
+report_cache = ReportCache()
+report_queue = ReportQueue()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -30,34 +45,39 @@ def create_app(config_class=Config):
     login_manager.init_app(app)
     mail.init_app(app)
     csrf.init_app(app)
+    shared_cache.init_app(app)
+    metrics.init_app(app)
+    health_checks.init_app(app)
+    query_profiler.init_app(app)
+    question_catalog.init_app(app)
+    render_pool.init_app(app)
+    report_cache.init_app(app)
+    report_queue.init_app(app)
+
+    # Management commands (flask schema ..., flask cache ..., flask percentiles ..., flask export ..., flask queries ...)
+    from app import cli
+    cli.init_app(app)
 
     # Ensure proper session cleanup
     @app.teardown_appcontext
     def shutdown_session(exception=None):
         db.session.remove()
 
-    with app.app_context():
-        # Import blueprints
-        from app.routes.auth import bp as auth_bp
-        from app.routes.assessment import bp as assessment_bp
-        from app.routes.main import bp as main_bp
-        from app.routes.health import bp as health_bp
-        
-        # Register blueprints
-        app.register_blueprint(auth_bp, url_prefix='/auth')
-        app.register_blueprint(assessment_bp, url_prefix='/assessment')
-        app.register_blueprint(main_bp)  # No url_prefix for main blueprint
-        app.register_blueprint(health_bp)  # No url_prefix for health checks
-        
-        # Create database tables
-        db.create_all()
-        
-        # Verify database connection
-        try:
-            from app.models.assessment import Question
-            total_questions = Question.query.count()
-            logging.info(f"Database initialized with {total_questions} questions")
-        except Exception as e:
-            logging.error(f"Error verifying database: {str(e)}")
+    # Import blueprints; heavy report dependencies (ReportLab, matplotlib) are
+    # imported by the views that need them, not here
+    from app.routes.auth import bp as auth_bp
+    from app.routes.assessment import bp as assessment_bp
+    from app.routes.main import bp as main_bp
+    from app.routes.health import bp as health_bp
+    from app.routes.admin import bp as admin_bp
+    
+    # Register blueprints
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(assessment_bp, url_prefix='/assessment')
+    app.register_blueprint(main_bp)  # No url_prefix for main blueprint
+    app.register_blueprint(health_bp)  # No url_prefix for health checks
+    app.register_blueprint(admin_bp, url_prefix='/admin')
     
-    return app
\ No newline at end of file
+    # The schema is created by `flask schema create` (or migrations), once,
+    # rather than by every worker at boot
+    return app
@@ -0,0 +1,197 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+
+schema_cli = AppGroup('schema', help='Create and check the database schema.')
+
+
+@schema_cli.command('create')
+def create_schema():
+    """Create any missing tables (for development; deployments run `flask db upgrade`)."""
+    from app import db
+
+    db.create_all()
+    click.echo(f"Schema ready: {len(db.metadata.tables)} tables")
+
+
+@schema_cli.command('verify')
+def verify_schema():
+    """Check that every table exists and that questions are loaded; exit 1 otherwise."""
+    from sqlalchemy import inspect
+    from app import db
+    from app.models.assessment import Question
+
+    existing = set(inspect(db.engine).get_table_names())
+    missing = sorted(set(db.metadata.tables) - existing)
+    if missing:
+        click.echo(f"Missing tables: {', '.join(missing)}")
+        raise SystemExit(1)
+
+    counts = dict(db.session.query(Question.assessment_type, db.func.count(Question.id))
+                  .group_by(Question.assessment_type).all())
+    for assessment_type, count in sorted(counts.items()):
+        click.echo(f"{assessment_type}: {count} questions")
+    if not counts:
+        click.echo("No questions loaded; run `python seed_db.py`")
+        raise SystemExit(1)
+    click.echo(f"Schema ok: {len(db.metadata.tables)} tables")
+
+
+cache_cli = AppGroup('cache', help='Manage the shared cache.')
+
+
+@cache_cli.command('clear')
+def clear_cache():
+    """Remove every entry from the shared cache (e.g. after recreating the database)."""
+    from app import shared_cache
+
+    shared_cache.clear()
+    click.echo(f"Cleared the {current_app.config['CACHE_BACKEND']} cache")
+
+
+percentiles_cli = AppGroup('percentiles', help='Maintain the score percentile histograms.')
+
+
+@percentiles_cli.command('rebuild')
+def rebuild_percentiles():
+    """Recount the percentile histograms from every stored assessment."""
+    from app.models.percentile import ScoreHistogram
+
+    counted = ScoreHistogram.rebuild()
+    click.echo(f"Counted {counted} assessments in the percentile histograms")
+
+
+cohorts_cli = AppGroup('cohorts', help='Maintain cohort aggregates.')
+
+
+@cohorts_cli.command('rebuild')
+@click.option('--cohort-id', type=int, help='Only rebuild this cohort.')
+def rebuild_cohorts(cohort_id):
+    """Recompute cohort aggregates from the members' stored results."""
+    from app import db
+    from app.models.cohort import Cohort
+
+    query = Cohort.query.order_by(Cohort.id)
+    if cohort_id is not None:
+        query = query.filter_by(id=cohort_id)
+    for cohort in query.all():
+        counted = cohort.rebuild()
+        db.session.commit()
+        click.echo(f"{cohort.name}: counted {counted} assessments")
+
+
+@click.command('export')
+@click.argument('kind', type=click.Choice(['results', 'responses']))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default='csv', show_default=True)
+@click.option('--type', 'assessment_type', help='Only export this assessment type.')
+@click.option('--since', type=click.DateTime(['%Y-%m-%d']), help='Completed on or after this date.')
+@click.option('--until', type=click.DateTime(['%Y-%m-%d']), help='Completed before this date.')
+@click.option('--cohort-id', type=int, help="Only export this cohort's members.")
+@click.option('--output', '-o', default='-', help='File to write; standard output by default.')
+@with_appcontext
+def export(kind, fmt, assessment_type, since, until, cohort_id, output):
+    """Stream assessment results or responses as CSV or JSON Lines."""
+    from app import db
+    from app.models.cohort import CohortMember
+    from app.utils.export import export_stream
+
+    user_ids = None
+    if cohort_id is not None:
+        user_ids = db.select([CohortMember.user_id]).where(CohortMember.cohort_id == cohort_id)
+    try:
+        chunks = export_stream(kind, fmt, assessment_type=assessment_type, since=since, until=until,
+                               user_ids=user_ids)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    with click.open_file(output, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+reports_cli = AppGroup('reports', help='Build PDF reports in bulk.')
+
+
+@reports_cli.command('build')
+@click.option('--output', '-o', required=True, help='Directory to write the PDFs to, or a .zip file.')
+@click.option('--type', 'assessment_type', help='Only this assessment type.')
+@click.option('--since', type=click.DateTime(['%Y-%m-%d']), help='Completed on or after this date.')
+@click.option('--until', type=click.DateTime(['%Y-%m-%d']), help='Completed before this date.')
+@click.option('--user', 'users', multiple=True, help='User id or email; repeat for several users.')
+@click.option('--cohort-id', type=int, help="Only this cohort's members.")
+@click.option('--workers', type=int, help='Worker processes (default: number of CPUs).')
+def build_reports(output, assessment_type, since, until, users, cohort_id, workers):
+    """Render the PDF report of every matching assessment in a process pool."""
+    from app import db
+    from app.models.assessment import ASSESSMENT_TYPES
+    from app.models.cohort import CohortMember
+    from app.models.user import User
+    from app.utils.report_batch import build_reports as build
+
+    if assessment_type and assessment_type not in ASSESSMENT_TYPES:
+        raise click.BadParameter(f"Unknown assessment type: {assessment_type}", param_hint='--type')
+    user_ids = None
+    if users:
+        user_ids = []
+        for user in users:
+            found = User.query.get(int(user)) if user.isdigit() else User.query.filter_by(email=user).first()
+            if found is None:
+                raise click.BadParameter(f"No such user: {user}", param_hint='--user')
+            user_ids.append(found.id)
+    if cohort_id is not None:
+        members = db.select([CohortMember.user_id]).where(CohortMember.cohort_id == cohort_id)
+        if user_ids is None:
+            user_ids = members
+        else:
+            user_ids = [user_id for (user_id,) in db.session.execute(members) if user_id in user_ids]
+
+    def progress(stats):
+        done = stats.rendered + stats.cached + stats.failed
+        if done % 100 == 0:
+            click.echo(f"{done} reports done, {done / stats.seconds:.1f}/s", err=True)
+
+    stats = build(output, workers=workers, assessment_type=assessment_type, since=since, until=until,
+                  user_ids=user_ids, progress=progress)
+    rate = stats.total / stats.seconds if stats.seconds else 0.0
+    click.echo(f"{stats.total} reports in {stats.seconds:.1f}s ({rate:.1f}/s): "
+               f"{stats.rendered} rendered, {stats.cached} from cache, {stats.failed} failed")
+    if stats.failed:
+        raise SystemExit(1)
+
+
+queries_cli = AppGroup('queries', help='Inspect the database queries behind the routes.')
+
+
+@queries_cli.command('explain')
+@click.option('--verbose', is_flag=True, help='Print every statement, not only failing ones.')
+def explain_queries(verbose):
+    """Fail if any hot query plan contains a full table scan (SQLite only)."""
+    from app import db
+    from app.utils.query_plans import explain_hot_queries
+
+    try:
+        results = explain_hot_queries(db)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    failures = 0
+    for name, statement, scans in results:
+        if scans:
+            failures += 1
+            click.echo(f"FULL SCAN  {name}: {', '.join(scans)}")
+            click.echo(f"           {' '.join(statement.split())}")
+        elif verbose:
+            click.echo(f"ok         {name}")
+    click.echo(f"{len(results)} statements checked, {failures} with full table scans")
+    if failures:
+        raise SystemExit(1)
+
+
+def init_app(app):
+    """Register the management commands on the flask CLI."""
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(percentiles_cli)
+    app.cli.add_command(cohorts_cli)
+    app.cli.add_command(export)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(queries_cli)
@@ -0,0 +1,19 @@
+from flask_wtf import FlaskForm
+from wtforms import StringField, SubmitField
+from wtforms.validators import DataRequired, Email, Length, Optional, ValidationError
+from app.models.cohort import Cohort
+
+class CohortForm(FlaskForm):
+    """Create a cohort."""
+    name = StringField('Name', validators=[DataRequired(), Length(max=100)])
+    description = StringField('Description', validators=[Optional(), Length(max=255)])
+    submit = SubmitField('Create Cohort')
+
+    def validate_name(self, name):
+        if Cohort.query.filter_by(name=name.data).first() is not None:
+            raise ValidationError('A cohort with this name already exists.')
+
+class MemberForm(FlaskForm):
+    """Add a user to a cohort by email."""
+    email = StringField('Email', validators=[DataRequired(), Email()])
+    submit = SubmitField('Add Member')
@@ -1,21 +1,54 @@
+from collections import namedtuple
 from datetime import datetime
 from app import db
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from app.utils.interpretation import get_assessment_interpretation
+
+# Bump when scoring or interpretation changes so stored result snapshots are recomputed
+SCORING_VERSION = 1
 
 class Question(db.Model):
     """Assessment question model."""
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.String(500), nullable=False)
     category = db.Column(db.String(50), nullable=False)  # emotional_intelligence, leadership, personal_growth
-    assessment_type = db.Column(db.String(50), nullable=False)  # Type of assessment this question belongs to
+    assessment_type = db.Column(db.String(50), nullable=False, index=True)  # Type of assessment this question belongs to
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def get_scale_label(self, value):
         """Return the label for a given scale value."""
         return ASSESSMENT_TYPES[self.assessment_type]['scale'].get(value, str(value))
 
+class QuestionCatalogVersion(db.Model):
+    """Single-row stamp bumped whenever the question set is reseeded."""
+    __tablename__ = 'question_catalog_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @classmethod
+    def current(cls):
+        """Current question set version, read from the database every time."""
+        return db.session.query(cls.version).filter_by(id=1).scalar() or 0
+    
+    @classmethod
+    def bump(cls):
+        """Mark the question set as changed; commit it together with the question changes."""
+        row = db.session.get(cls, 1)
+        if row is None:
+            db.session.add(cls(id=1, version=1))
+        else:
+            row.version = cls.version + 1
+
+# One row of the history page: only what the template needs
+HistoryEntry = namedtuple('HistoryEntry', ['id', 'assessment_type', 'completed_at', 'scores'])
+
 class Assessment(db.Model):
     """User assessment model."""
+    # Backs the keyset-paginated history: WHERE user_id = ? ORDER BY completed_at DESC, id DESC
+    __table_args__ = (db.Index('ix_assessment_user_completed', 'user_id', 'completed_at', 'id'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     assessment_type = db.Column(db.String(50), nullable=False)  # Type of assessment taken
@@ -23,26 +56,218 @@ class Assessment(db.Model):
     
     # Relationships
     responses = db.relationship('AssessmentResponse', backref='assessment', lazy=True)
+    result = db.relationship('AssessmentResult', backref='assessment', uselist=False, lazy=True)
+    
+    @classmethod
+    def record(cls, user_id, assessment_type, answers):
+        """
+        Add a completed assessment with its responses, score snapshot and aggregate counts.
+        
+        The assessment row is inserted on its own to get its id; the responses are
+        then written with one executemany INSERT (a multi-row VALUES statement on
+        psycopg2) instead of one ORM object and flush each.
+        
+        Args:
+            user_id (int): Owner of the assessment
+            assessment_type (str): Key of ASSESSMENT_TYPES
+            answers (list): Validated (question, score) pairs
+            
+        Returns:
+            Assessment: The new assessment; the caller commits the session
+        """
+        from app.models.cohort import CohortAggregate
+        from app.models.percentile import OVERALL, ScoreHistogram
+        
+        # Must run before this session writes; it commits on its own connection
+        ScoreHistogram.ensure_bins(assessment_type)
+        
+        now = datetime.utcnow()
+        assessment = cls(user_id=user_id, assessment_type=assessment_type, completed_at=now)
+        db.session.add(assessment)
+        db.session.flush()
+        
+        totals = {}
+        rows = []
+        for question, score in answers:
+            rows.append({
+                'assessment_id': assessment.id,
+                'question_id': question.id,
+                'score': score,
+                'created_at': now
+            })
+            total, count = totals.get(question.category, (0, 0))
+            totals[question.category] = (total + score, count + 1)
+        if rows:
+            db.session.execute(AssessmentResponse.__table__.insert(), rows)
+        
+        result = AssessmentResult.snapshot(assessment, totals)
+        
+        # Count the scores in the population histograms and rank the overall score
+        ScoreHistogram.record(assessment_type, result.category_scores, result.score)
+        percentiles, _ = ScoreHistogram.percentiles(assessment_type, {}, overall=result.score)
+        result.percentile = percentiles[OVERALL]
+        
+        # Keep the running totals of the user's cohorts up to date
+        CohortAggregate.record_submission(user_id, assessment_type, result.category_scores)
+        return assessment
+    
+    @classmethod
+    def history_page(cls, user_id, after=None, limit=20):
+        """
+        One page of a user's assessments, newest first, using keyset pagination.
+        
+        Only the columns the history page shows are selected, and the scores come
+        from the stored snapshots (one aggregate query covers any without one).
+        
+        Args:
+            user_id (int): Owner of the assessments
+            after (tuple): (completed_at, id) of the last row of the previous page, or None
+            limit (int): Page size
+            
+        Returns:
+            tuple: (list of HistoryEntry, (completed_at, id) cursor of the next page or None)
+        """
+        query = db.session.query(
+            cls.id, cls.assessment_type, cls.completed_at,
+            AssessmentResult.category_scores, AssessmentResult.scoring_version
+        ).outerjoin(
+            AssessmentResult, AssessmentResult.assessment_id == cls.id
+        ).filter(cls.user_id == user_id)
+        if after is not None:
+            completed_at, last_id = after
+            query = query.filter(or_(
+                cls.completed_at < completed_at,
+                and_(cls.completed_at == completed_at, cls.id < last_id)
+            ))
+        # Fetch one extra row to know whether there is a next page
+        rows = query.order_by(cls.completed_at.desc(), cls.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1].completed_at, rows[-1].id)
+        
+        stale = [row for row in rows if row.scoring_version != SCORING_VERSION]
+        totals = cls.get_category_totals([row.id for row in stale])
+        entries = []
+        for row in rows:
+            if row.id in totals:
+                scores = averages_from_totals(row.assessment_type, totals[row.id])
+            else:
+                scores = row.category_scores
+            entries.append(HistoryEntry(row.id, row.assessment_type, row.completed_at, scores))
+        return entries, next_cursor
+    
+    @staticmethod
+    def get_category_totals(assessment_ids):
+        """
+        Sum and count response scores per category for several assessments in one query.
+        
+        Args:
+            assessment_ids (list): Ids of the assessments to aggregate
+            
+        Returns:
+            dict: {assessment_id: {category: (sum, count)}}
+        """
+        totals = {assessment_id: {} for assessment_id in assessment_ids}
+        if not assessment_ids:
+            return totals
+        
+        # Submitted responses never change, so totals are cached until the scoring
+        # or the question set (which maps questions to categories) changes
+        from app import question_catalog, shared_cache
+        cached = shared_cache.namespace(
+            'category_totals', version=f'{SCORING_VERSION}.{question_catalog.get().version}'
+        )
+        missing = []
+        for assessment_id in assessment_ids:
+            hit = cached.get(assessment_id)
+            if hit is None:
+                missing.append(assessment_id)
+            else:
+                totals[assessment_id] = {category: tuple(value) for category, value in hit.items()}
+        if not missing:
+            return totals
+        
+        rows = db.session.query(
+            AssessmentResponse.assessment_id,
+            Question.category,
+            func.sum(AssessmentResponse.score),
+            func.count(AssessmentResponse.id)
+        ).join(
+            Question, AssessmentResponse.question_id == Question.id
+        ).filter(
+            AssessmentResponse.assessment_id.in_(missing)
+        ).group_by(
+            AssessmentResponse.assessment_id, Question.category
+        ).all()
+        for assessment_id, category, total, count in rows:
+            totals[assessment_id][category] = (total, count)
+        for assessment_id in missing:
+            cached.set(assessment_id, totals[assessment_id])
+        return totals
+    
+    @classmethod
+    def get_scores_for(cls, assessments):
+        """
+        Average score per category for each assessment.
+        
+        Stored result snapshots are used where they are current (load them with
+        joinedload(Assessment.result) to avoid a query per row); the rest are
+        computed with one aggregate query for all of them.
+        """
+        scores = {}
+        missing = []
+        for assessment in assessments:
+            if assessment.result is not None and assessment.result.is_current:
+                scores[assessment.id] = assessment.result.category_scores
+            else:
+                missing.append(assessment)
+        totals = cls.get_category_totals([assessment.id for assessment in missing])
+        for assessment in missing:
+            scores[assessment.id] = averages_from_totals(assessment.assessment_type, totals[assessment.id])
+        return scores
+    
+    def get_result(self):
+        """
+        Get the stored score snapshot, computing and saving it if it is missing or outdated.
+        
+        Returns:
+            AssessmentResult: Snapshot with category scores, interpretation and chart data
+        """
+        result = self.result
+        if result is not None and result.is_current:
+            return result
+        
+        result = AssessmentResult.snapshot(self, self.get_category_totals([self.id])[self.id], result)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request stored the snapshot first
+            db.session.rollback()
+            result = AssessmentResult.query.filter_by(assessment_id=self.id).first()
+        return result
     
     def get_category_score(self, category):
         """Calculate the average score for a specific category."""
-        category_responses = [r for r in self.responses if r.question.category == category]
-        if not category_responses:
-            return 0.0
-        return sum(r.score for r in category_responses) / len(category_responses)
+        return self.get_all_category_scores().get(category, 0.0)
         
     def get_all_category_scores(self):
-        """Calculate scores for all categories in this assessment type."""
-        scores = {}
-        categories = ASSESSMENT_TYPES[self.assessment_type]['categories']
-        for category in categories:
-            scores[category] = self.get_category_score(category)
-        return scores
+        """Calculate scores for all categories in this assessment type with a single GROUP BY query."""
+        totals = self.get_category_totals([self.id])[self.id]
+        return averages_from_totals(self.assessment_type, totals)
+
+def averages_from_totals(assessment_type, totals):
+    """Turn {category: (sum, count)} into averages for every category of the assessment type."""
+    scores = {}
+    for category in ASSESSMENT_TYPES[assessment_type]['categories']:
+        total, count = totals.get(category, (0, 0))
+        scores[category] = total / count if count else 0.0
+    return scores
 
 class AssessmentResponse(db.Model):
     """Individual response to an assessment question."""
     id = db.Column(db.Integer, primary_key=True)
-    assessment_id = db.Column(db.Integer, db.ForeignKey('assessment.id'), nullable=False)
+    assessment_id = db.Column(db.Integer, db.ForeignKey('assessment.id'), nullable=False, index=True)
     question_id = db.Column(db.Integer, db.ForeignKey('question.id'), nullable=False)
     score = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -54,6 +279,7 @@ class AssessmentResponse(db.Model):
 ASSESSMENT_TYPES = {
     'lsi': {
         'name': 'Life Styles Inventory (LSI)',
+        'abbreviation': 'LSI',  # Used in report file names
         'description': 'Evaluates thinking patterns and behavioral styles that impact leadership effectiveness.',
         'duration': 12,
         'categories': [
@@ -73,6 +299,7 @@ ASSESSMENT_TYPES = {
     },
     'oci': {
         'name': 'Organizational Culture Inventory (OCI)',
+        'abbreviation': 'OCI',  # Used in report file names
         'description': 'Identifies behavioral norms and cultural expectations within organizations.',
         'duration': 15,
         'categories': [
@@ -92,6 +319,7 @@ ASSESSMENT_TYPES = {
     },
     'lpi': {
         'name': 'Leadership Practices Inventory (LPI)',
+        'abbreviation': 'LPI',  # Used in report file names
         'description': 'Measures frequency of key leadership behaviors across five core practices.',
         'duration': 10,
         'categories': [
@@ -115,6 +343,7 @@ ASSESSMENT_TYPES = {
     },
     'influence': {
         'name': 'Influence Style Profiler',
+        'abbreviation': 'ISP',  # Used in report file names
         'description': 'Analyzes personal power and influence strategies in leadership situations.',
         'duration': 10,
         'categories': [
@@ -227,12 +456,13 @@ ASSESSMENT_QUESTIONS = {
 }
 
 class AssessmentResult(db.Model):
+    """Score snapshot of a completed assessment, written when it is submitted."""
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    assessment_id = db.Column(db.Integer, db.ForeignKey('assessment.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    assessment_id = db.Column(db.Integer, db.ForeignKey('assessment.id'), nullable=False, unique=True)
     responses = db.Column(db.JSON)  # Store user responses as JSON
     score = db.Column(db.Float)
-    percentile = db.Column(db.Float)
+    percentile = db.Column(db.Float)  # Overall score percentile when the assessment was completed
     completed_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Additional fields for different assessment types
@@ -241,5 +471,50 @@ class AssessmentResult(db.Model):
     practice_scores = db.Column(db.JSON)  # For LPI
     power_distribution = db.Column(db.JSON)  # For Influence Style Profiler
     
+    # Snapshot served by the results page, results API and PDF report
+    category_scores = db.Column(db.JSON)  # Average score per category, rounded to 2 places
+    interpretation = db.Column(db.Text)
+    visualization = db.Column(db.JSON)  # Chart payload returned by the results API
+    scoring_version = db.Column(db.Integer)
+    
+    @property
+    def is_current(self):
+        return self.scoring_version == SCORING_VERSION
+    
+    @classmethod
+    def snapshot(cls, assessment, totals, result=None):
+        """
+        Fill in the score snapshot for an assessment.
+        
+        Args:
+            assessment (Assessment): The completed assessment
+            totals (dict): {category: (sum, count)} of its response scores
+            result (AssessmentResult): Existing snapshot to update, or None to add a new one
+            
+        Returns:
+            AssessmentResult: The snapshot, added to the session but not committed
+        """
+        assessment_info = ASSESSMENT_TYPES[assessment.assessment_type]
+        category_scores = {
+            category: round(score, 2)
+            for category, score in averages_from_totals(assessment.assessment_type, totals).items()
+        }
+        if result is None:
+            result = cls(user_id=assessment.user_id, assessment=assessment)
+            db.session.add(result)
+        
+        result.category_scores = category_scores
+        result.score = round(sum(category_scores.values()) / len(category_scores), 2) if category_scores else 0.0
+        result.interpretation = get_assessment_interpretation(assessment.assessment_type, category_scores)
+        result.visualization = {
+            'type': assessment_info.get('visualization', 'radar'),  # Default to radar if not specified
+            'categories': list(category_scores.keys()),
+            'scores': list(category_scores.values()),
+            'max_score': assessment_info['max_score']
+        }
+        result.completed_at = assessment.completed_at
+        result.scoring_version = SCORING_VERSION
+        return result
+    
     def __repr__(self):
         return f'<AssessmentResult {self.id}>' 
\ No newline at end of file
@@ -0,0 +1,216 @@
+from collections import namedtuple
+from datetime import datetime
+from math import sqrt
+from sqlalchemy import bindparam
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models.assessment import Assessment, ASSESSMENT_TYPES
+
+# Summary of one category across a cohort
+CategoryStats = namedtuple('CategoryStats', ['category', 'count', 'mean', 'std'])
+
+class Cohort(db.Model):
+    """A group of users (team, department, organization) whose results are reported together."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+    description = db.Column(db.String(255))
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    members = db.relationship('CohortMember', backref='cohort', lazy='dynamic', cascade='all, delete-orphan')
+    aggregates = db.relationship('CohortAggregate', backref='cohort', lazy=True, cascade='all, delete-orphan')
+
+    @classmethod
+    def create(cls, name, created_by=None, description=None):
+        """
+        Add a cohort with a zeroed aggregate row for every assessment category.
+
+        Creating the rows up front means a submission only ever has to UPDATE them.
+
+        Returns:
+            Cohort: The new cohort; the caller commits the session
+        """
+        cohort = cls(name=name, description=description, created_by=created_by)
+        db.session.add(cohort)
+        db.session.flush()
+        CohortAggregate.create_rows(cohort.id)
+        return cohort
+
+    @property
+    def member_count(self):
+        return self.members.count()
+
+    def has_member(self, user_id):
+        return self.members.filter_by(user_id=user_id).first() is not None
+
+    def add_member(self, user):
+        """
+        Add a user and count their completed assessments in the aggregates.
+
+        Returns:
+            bool: False if the user was already a member
+        """
+        if self.has_member(user.id):
+            return False
+        db.session.add(CohortMember(cohort_id=self.id, user_id=user.id))
+        CohortAggregate.apply([self.id], member_scores([user.id]), sign=1)
+        return True
+
+    def remove_member(self, user):
+        """
+        Remove a user and take their assessments back out of the aggregates.
+
+        Returns:
+            bool: False if the user was not a member
+        """
+        member = self.members.filter_by(user_id=user.id).first()
+        if member is None:
+            return False
+        db.session.delete(member)
+        CohortAggregate.apply([self.id], member_scores([user.id]), sign=-1)
+        return True
+
+    def statistics(self):
+        """
+        Per-category count, mean and standard deviation from the running aggregates.
+
+        Reads one row per category no matter how many members the cohort has.
+
+        Returns:
+            dict: {assessment_type: [CategoryStats in ASSESSMENT_TYPES order]} for every
+            type with at least one counted assessment
+        """
+        rows = {
+            (row.assessment_type, row.category): row
+            for row in CohortAggregate.query.filter_by(cohort_id=self.id).all()
+        }
+        stats = {}
+        for assessment_type, info in ASSESSMENT_TYPES.items():
+            categories = []
+            for category in info['categories']:
+                row = rows.get((assessment_type, category))
+                if row is None or row.count <= 0:
+                    categories.append(CategoryStats(category, 0, 0.0, 0.0))
+                    continue
+                mean = row.total / row.count
+                # Population variance from the running sums; clamp float noise below zero
+                variance = max(row.total_squares / row.count - mean * mean, 0.0)
+                categories.append(CategoryStats(category, row.count, mean, sqrt(variance)))
+            if any(stat.count for stat in categories):
+                stats[assessment_type] = categories
+        return stats
+
+    def rebuild(self):
+        """
+        Recompute the aggregates from the members' stored results.
+
+        Returns:
+            int: Number of assessments counted
+        """
+        CohortAggregate.query.filter_by(cohort_id=self.id).delete()
+        CohortAggregate.create_rows(self.id)
+        user_ids = [user_id for (user_id,) in db.session.query(CohortMember.user_id).filter_by(cohort_id=self.id)]
+        scores = member_scores(user_ids)
+        CohortAggregate.apply([self.id], scores, sign=1)
+        return len(scores)
+
+    def __repr__(self):
+        return f'<Cohort {self.name}>'
+
+class CohortMember(db.Model):
+    """Membership of a user in a cohort."""
+    __table_args__ = (db.UniqueConstraint('cohort_id', 'user_id'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    cohort_id = db.Column(db.Integer, db.ForeignKey('cohort.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    joined_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('cohort_memberships', lazy=True))
+
+class CohortAggregate(db.Model):
+    """
+    Running count, sum and sum of squares of one category's scores across a cohort.
+
+    Updated with arithmetic in the UPDATE itself, so concurrent submissions from
+    different members never overwrite each other.
+    """
+    __table_args__ = (db.UniqueConstraint('cohort_id', 'assessment_type', 'category'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    cohort_id = db.Column(db.Integer, db.ForeignKey('cohort.id'), nullable=False)
+    assessment_type = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Float, nullable=False, default=0.0)
+    total_squares = db.Column(db.Float, nullable=False, default=0.0)
+
+    @classmethod
+    def create_rows(cls, cohort_id):
+        db.session.execute(cls.__table__.insert(), [
+            {'cohort_id': cohort_id, 'assessment_type': assessment_type, 'category': category,
+             'count': 0, 'total': 0.0, 'total_squares': 0.0}
+            for assessment_type, info in ASSESSMENT_TYPES.items()
+            for category in info['categories']
+        ])
+
+    @classmethod
+    def apply(cls, cohort_ids, scores, sign=1):
+        """
+        Add (sign=1) or remove (sign=-1) assessments in the aggregates of some cohorts.
+
+        Args:
+            cohort_ids (list): Cohorts to update
+            scores (list): (assessment_type, {category: score}) per assessment
+            sign (int): 1 to add, -1 to remove
+        """
+        params = [
+            {'b_cohort': cohort_id, 'b_type': assessment_type, 'b_category': category,
+             'b_count': sign, 'b_score': sign * float(score), 'b_square': sign * float(score) ** 2}
+            for cohort_id in cohort_ids
+            for assessment_type, category_scores in scores
+            for category, score in category_scores.items()
+        ]
+        if not params:
+            return
+        table = cls.__table__
+        db.session.execute(
+            table.update().where(
+                (table.c.cohort_id == bindparam('b_cohort')) &
+                (table.c.assessment_type == bindparam('b_type')) &
+                (table.c.category == bindparam('b_category'))
+            ).values(
+                count=table.c.count + bindparam('b_count'),
+                total=table.c.total + bindparam('b_score'),
+                total_squares=table.c.total_squares + bindparam('b_square')
+            ),
+            params
+        )
+
+    @classmethod
+    def record_submission(cls, user_id, assessment_type, category_scores):
+        """Count a new assessment in every cohort its user belongs to, in the caller's transaction."""
+        cohort_ids = [cohort_id for (cohort_id,) in db.session.query(CohortMember.cohort_id).filter_by(user_id=user_id)]
+        cls.apply(cohort_ids, [(assessment_type, category_scores)], sign=1)
+
+def member_scores(user_ids, batch_size=500):
+    """
+    Category scores of every completed assessment of the given users.
+
+    Returns:
+        list: (assessment_type, {category: score}) per assessment
+    """
+    scores = []
+    for start in range(0, len(user_ids), batch_size):
+        assessments = Assessment.query.options(joinedload(Assessment.result)).filter(
+            Assessment.user_id.in_(user_ids[start:start + batch_size])
+        ).all()
+        by_id = Assessment.get_scores_for(assessments)
+        scores.extend(
+            (assessment.assessment_type, by_id[assessment.id])
+            for assessment in assessments
+            if assessment.assessment_type in ASSESSMENT_TYPES
+        )
+    return scores
@@ -0,0 +1,204 @@
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.assessment import ASSESSMENT_TYPES
+
+# Category scores are averages of whole-number answers; 12 bins per scale point
+# puts averages of 2, 3, 4 or 6 answers exactly on a bin boundary
+BINS_PER_POINT = 12
+
+# Pseudo-category holding the overall (mean of categories) score
+OVERALL = '_overall'
+
+
+def bin_count(max_score):
+    """Number of histogram bins for a 1..max_score scale."""
+    return (max_score - 1) * BINS_PER_POINT + 1
+
+
+def score_bin(score, max_score):
+    """Histogram bin of a score on a 1..max_score scale, clamped to the scale."""
+    index = int(round((float(score) - 1) * BINS_PER_POINT))
+    return min(max(index, 0), bin_count(max_score) - 1)
+
+
+class ScoreHistogram(db.Model):
+    """
+    Number of completed assessments whose score for a category falls in each bin.
+
+    One row per (assessment type, category, bin). Submissions increment counts
+    with UPDATE ... SET count = count + 1, so concurrent workers never lose an
+    update, and a percentile is computed from the bins alone no matter how many
+    assessments exist.
+    """
+    __tablename__ = 'score_histogram'
+    __table_args__ = (db.UniqueConstraint('assessment_type', 'category', 'bin'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    assessment_type = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    bin = db.Column(db.Integer, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Assessment types whose bin rows are known to exist, per process
+    _ready_types = set()
+
+    @classmethod
+    def ensure_bins(cls, assessment_type):
+        """
+        Create the zeroed bin rows of an assessment type if they are missing.
+
+        Runs in its own transaction, before the caller writes anything, so a
+        concurrent worker inserting the same rows only costs a retry here.
+        """
+        if assessment_type in cls._ready_types:
+            return
+        info = ASSESSMENT_TYPES[assessment_type]
+        wanted = {
+            (category, index)
+            for category in list(info['categories']) + [OVERALL]
+            for index in range(bin_count(info['max_score']))
+        }
+        table = cls.__table__
+        for attempt in range(3):
+            try:
+                with db.engine.begin() as connection:
+                    existing = set(connection.execute(
+                        db.select([table.c.category, table.c.bin]).where(table.c.assessment_type == assessment_type)
+                    ).fetchall())
+                    missing = wanted - existing
+                    if missing:
+                        connection.execute(table.insert(), [
+                            {'assessment_type': assessment_type, 'category': category, 'bin': index, 'count': 0}
+                            for category, index in sorted(missing)
+                        ])
+                break
+            except IntegrityError:
+                # Another worker created some of them first; look again
+                if attempt == 2:
+                    raise
+        cls._ready_types.add(assessment_type)
+
+    @classmethod
+    def record(cls, assessment_type, category_scores, overall):
+        """
+        Count one completed assessment in the histograms, in the caller's transaction.
+
+        Args:
+            assessment_type (str): Key of ASSESSMENT_TYPES
+            category_scores (dict): Average score per category
+            overall (float): Overall score
+        """
+        max_score = ASSESSMENT_TYPES[assessment_type]['max_score']
+        table = cls.__table__
+        scores = dict(category_scores)
+        scores[OVERALL] = overall
+        db.session.execute(
+            table.update().where(
+                (table.c.assessment_type == bindparam('b_type')) &
+                (table.c.category == bindparam('b_category')) &
+                (table.c.bin == bindparam('b_bin'))
+            ).values(count=table.c.count + 1),
+            [
+                {'b_type': assessment_type, 'b_category': category, 'b_bin': score_bin(score, max_score)}
+                for category, score in scores.items()
+            ]
+        )
+
+    @classmethod
+    def percentiles(cls, assessment_type, category_scores, overall=None):
+        """
+        Percentile of each score among all completed assessments of the type.
+
+        Uses the mid-rank definition: everyone scoring lower plus half of those
+        in the same bin. Reads the type's bins with one query.
+
+        Args:
+            assessment_type (str): Key of ASSESSMENT_TYPES
+            category_scores (dict): Average score per category
+            overall (float): Overall score to rank as well, or None
+
+        Returns:
+            tuple: ({category: percentile or None}, number of assessments counted);
+            a percentile is None while nobody has been counted yet, and OVERALL
+            is included when overall is given
+        """
+        max_score = ASSESSMENT_TYPES[assessment_type]['max_score']
+        scores = dict(category_scores)
+        if overall is not None:
+            scores[OVERALL] = overall
+        counts = {}
+        rows = db.session.query(cls.category, cls.bin, cls.count).filter(
+            cls.assessment_type == assessment_type,
+            cls.category.in_(list(scores)),
+            cls.count > 0
+        ).all()
+        for category, index, count in rows:
+            counts.setdefault(category, {})[index] = count
+
+        result = {}
+        for category, score in scores.items():
+            bins = counts.get(category, {})
+            total = sum(bins.values())
+            if not total:
+                result[category] = None
+                continue
+            index = score_bin(score, max_score)
+            below = sum(count for bin_index, count in bins.items() if bin_index < index)
+            result[category] = round(100.0 * (below + bins.get(index, 0) / 2) / total, 1)
+        sample = max((sum(bins.values()) for bins in counts.values()), default=0)
+        return result, sample
+
+    @classmethod
+    def sample_size(cls, assessment_type):
+        """Number of assessments of the type counted in the histograms."""
+        return db.session.query(db.func.coalesce(db.func.sum(cls.count), 0)).filter(
+            cls.assessment_type == assessment_type,
+            cls.category == OVERALL
+        ).scalar()
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recount every histogram from the stored results.
+
+        Meant for backfilling after the table is added or after a scoring
+        change; submissions made while it runs may be counted twice or not at all.
+
+        Returns:
+            int: Number of assessments counted
+        """
+        from sqlalchemy.orm import joinedload
+        from app.models.assessment import Assessment
+
+        cls.query.delete()
+        db.session.commit()
+        cls._ready_types.clear()
+        # Create every bin before this session starts writing counts
+        for assessment_type in ASSESSMENT_TYPES:
+            cls.ensure_bins(assessment_type)
+
+        counted = 0
+        last_id = 0
+        while True:
+            assessments = Assessment.query.options(joinedload(Assessment.result)).filter(
+                Assessment.id > last_id
+            ).order_by(Assessment.id).limit(500).all()
+            if not assessments:
+                break
+            last_id = assessments[-1].id
+            scores = Assessment.get_scores_for(assessments)
+            for assessment in assessments:
+                if assessment.assessment_type not in ASSESSMENT_TYPES:
+                    continue
+                category_scores = scores[assessment.id]
+                if not category_scores:
+                    continue
+                overall = round(sum(category_scores.values()) / len(category_scores), 2)
+                cls.record(assessment.assessment_type, category_scores, overall)
+                counted += 1
+            db.session.commit()
+        return counted
+
+    def __repr__(self):
+        return f'<ScoreHistogram {self.assessment_type}.{self.category}[{self.bin}]={self.count}>'
@@ -0,0 +1,29 @@
+from datetime import datetime
+from app import db
+
+class ReportJob(db.Model):
+    """Background PDF report generation job, one per assessment."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    assessment_id = db.Column(db.Integer, db.ForeignKey('assessment.id'), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    filename = db.Column(db.String(255), index=True)  # Set once the PDF has been written
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    assessment = db.relationship('Assessment', backref=db.backref('report_job', uselist=False, lazy=True))
+
+    @property
+    def is_ready(self):
+        return self.status == self.STATUS_READY and bool(self.filename)
+
+    def __repr__(self):
+        return f'<ReportJob {self.id} assessment={self.assessment_id} {self.status}>'
@@ -0,0 +1,163 @@
+from datetime import datetime
+from functools import wraps
+from flask import Blueprint, render_template, redirect, url_for, flash, abort, send_file, request, Response, stream_with_context
+from flask_login import login_required, current_user
+from flask_wtf import FlaskForm
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from app import db, report_cache
+from app.forms.admin import CohortForm, MemberForm
+from app.models.assessment import ASSESSMENT_TYPES
+from app.models.cohort import Cohort, CohortMember
+from app.models.user import User
+from app.utils.export import export_stream, EXPORT_FORMATS, EXPORT_KINDS, MIMETYPES
+import logging
+
+bp = Blueprint('admin', __name__)
+
+# Members listed on the cohort dashboard; the statistics cover all of them
+DASHBOARD_MEMBER_LIMIT = 50
+
+def admin_required(view):
+    """Allow only logged-in administrators to reach the view."""
+    @wraps(view)
+    @login_required
+    def wrapped(*args, **kwargs):
+        if not current_user.is_admin:
+            abort(403)
+        return view(*args, **kwargs)
+    return wrapped
+
+@bp.route('/cohorts', methods=['GET', 'POST'])
+@admin_required
+def cohorts():
+    """List cohorts and create new ones."""
+    form = CohortForm()
+    if form.validate_on_submit():
+        cohort = Cohort.create(form.name.data, created_by=current_user.id, description=form.description.data)
+        db.session.commit()
+        flash(f'Cohort "{cohort.name}" created.', 'success')
+        return redirect(url_for('admin.cohort_dashboard', cohort_id=cohort.id))
+
+    # Member counts for every cohort in one grouped query
+    member_counts = dict(db.session.query(
+        CohortMember.cohort_id, func.count(CohortMember.id)
+    ).group_by(CohortMember.cohort_id).all())
+    return render_template('admin/cohorts.html',
+                         cohorts=Cohort.query.order_by(Cohort.name).all(),
+                         member_counts=member_counts,
+                         form=form)
+
+@bp.route('/cohorts/<int:cohort_id>')
+@admin_required
+def cohort_dashboard(cohort_id):
+    """Show the cohort's aggregate scores, read from its running totals."""
+    cohort = Cohort.query.get_or_404(cohort_id)
+    # The member list shows each user's name and email, so load them in the same query
+    members = (cohort.members.options(joinedload(CohortMember.user))
+               .order_by(CohortMember.joined_at.desc()).limit(DASHBOARD_MEMBER_LIMIT).all())
+    return render_template('admin/cohort.html',
+                         cohort=cohort,
+                         statistics=cohort.statistics(),
+                         member_count=cohort.member_count,
+                         members=members,
+                         member_form=MemberForm(),
+                         remove_form=FlaskForm(),
+                         assessment_types=ASSESSMENT_TYPES)
+
+@bp.route('/cohorts/<int:cohort_id>/members', methods=['POST'])
+@admin_required
+def add_member(cohort_id):
+    """Add a user to a cohort by email."""
+    cohort = Cohort.query.get_or_404(cohort_id)
+    form = MemberForm()
+    if not form.validate_on_submit():
+        flash('Please enter a valid email address.', 'error')
+        return redirect(url_for('admin.cohort_dashboard', cohort_id=cohort.id))
+
+    user = User.query.filter_by(email=form.email.data).first()
+    if user is None:
+        flash('No user with that email address.', 'error')
+    elif cohort.add_member(user):
+        db.session.commit()
+        flash(f'{user.email} added to {cohort.name}.', 'success')
+    else:
+        flash(f'{user.email} is already a member.', 'error')
+    return redirect(url_for('admin.cohort_dashboard', cohort_id=cohort.id))
+
+@bp.route('/cohorts/<int:cohort_id>/members/<int:user_id>/remove', methods=['POST'])
+@admin_required
+def remove_member(cohort_id, user_id):
+    """Remove a user from a cohort."""
+    cohort = Cohort.query.get_or_404(cohort_id)
+    user = User.query.get_or_404(user_id)
+    form = FlaskForm()
+    if form.validate_on_submit() and cohort.remove_member(user):
+        db.session.commit()
+        flash(f'{user.email} removed from {cohort.name}.', 'success')
+    return redirect(url_for('admin.cohort_dashboard', cohort_id=cohort.id))
+
+@bp.route('/cohorts/<int:cohort_id>/report/<assessment_type>')
+@admin_required
+def cohort_report(cohort_id, assessment_type):
+    """Download the cohort summary PDF for one assessment type."""
+    cohort = Cohort.query.get_or_404(cohort_id)
+    stats = cohort.statistics().get(assessment_type)
+    if not stats:
+        flash('No results to report for this assessment yet.', 'error')
+        return redirect(url_for('admin.cohort_dashboard', cohort_id=cohort.id))
+
+    # Imported here so ReportLab only loads in processes that build reports
+    from app.utils.pdf_generator import generate_cohort_pdf_report
+    filename = generate_cohort_pdf_report(cohort, assessment_type, stats, cohort.member_count)
+    if not filename:
+        logging.error(f"Cohort report failed for cohort {cohort.id}, {assessment_type}")
+        flash('An error occurred while generating the PDF.', 'error')
+        return redirect(url_for('admin.cohort_dashboard', cohort_id=cohort.id))
+
+    abbreviation = ASSESSMENT_TYPES[assessment_type].get('abbreviation', assessment_type.upper())
+    return send_file(
+        report_cache.path_for(filename),
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f"{cohort.name.replace(' ', '_')}_{abbreviation}.pdf"
+    )
+
+@bp.route('/export/<kind>.<fmt>')
+@admin_required
+def export(kind, fmt):
+    """
+    Stream every assessment result (or response) as CSV or JSON Lines.
+
+    Optional query parameters: type (assessment type), since and until
+    (YYYY-MM-DD, on completion time) and cohort (cohort id).
+    """
+    if kind not in EXPORT_KINDS or fmt not in EXPORT_FORMATS:
+        abort(404)
+    try:
+        since = parse_date(request.args.get('since'))
+        until = parse_date(request.args.get('until'))
+    except ValueError:
+        abort(400)
+    assessment_type = request.args.get('type') or None
+    if assessment_type and assessment_type not in ASSESSMENT_TYPES:
+        abort(400)
+
+    user_ids = None
+    cohort_id = request.args.get('cohort', type=int)
+    if cohort_id is not None:
+        Cohort.query.get_or_404(cohort_id)
+        user_ids = db.select([CohortMember.user_id]).where(CohortMember.cohort_id == cohort_id)
+
+    chunks = export_stream(kind, fmt, assessment_type=assessment_type, since=since, until=until, user_ids=user_ids)
+    filename = f"mindscape_{kind}_{datetime.utcnow():%Y%m%d}.{fmt}"
+    # The rows are read and encoded while the response is being sent
+    return Response(
+        stream_with_context(chunks),
+        mimetype=MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+def parse_date(value):
+    """Parse an optional YYYY-MM-DD query parameter."""
+    return datetime.strptime(value, '%Y-%m-%d') if value else None
@@ -1,13 +1,16 @@
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, send_file
+from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, send_file, make_response, session
 from flask_login import login_required, current_user
 from flask_wtf import FlaskForm
-from app.models.assessment import Question, Assessment, AssessmentResponse, ASSESSMENT_TYPES
-from app import db
+from sqlalchemy.orm import joinedload
+from app.models.assessment import Assessment, ASSESSMENT_TYPES, SCORING_VERSION
+from app.models.percentile import ScoreHistogram
+from app.models.report import ReportJob
+from app import db, question_catalog, report_cache, report_queue
 from datetime import datetime
-from app.utils.pdf_generator import generate_pdf_report
-from app.utils.interpretation import get_assessment_interpretation
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.report_cache import report_download_name
+import hashlib
 import os
-from threading import Thread
 import json
 from flask import current_app
 import logging
@@ -27,6 +30,66 @@ def get_assessment_type(assessment_type):
     """
     return ASSESSMENT_TYPES.get(assessment_type)
 
+def get_percentiles(assessment_type, category_scores):
+    """
+    Population percentile of each category score.
+    
+    Returns:
+        dict: Category to percentile, or an empty dict while fewer than
+        PERCENTILE_MIN_SAMPLE assessments of the type have been counted
+    """
+    percentiles, sample = ScoreHistogram.percentiles(assessment_type, category_scores)
+    if sample < current_app.config.get('PERCENTILE_MIN_SAMPLE', 20):
+        return {}
+    return percentiles
+
+# Bump whenever the results page or the results API payload changes, so
+# copies cached by browsers are not reused
+RESULTS_PAGE_VERSION = 1
+
+def results_etag(view, assessment_id):
+    """
+    Strong ETag of a results view, or None if the request can't be answered from cache.
+
+    A completed assessment never changes, so its results only change with the
+    scoring version, the page layout and the population behind the percentiles.
+    Costs two indexed lookups; nothing is scored or rendered.
+
+    Args:
+        view (str): 'page' or 'api'
+        assessment_id (int): Assessment shown
+
+    Returns:
+        str: ETag value, or None when the assessment is missing or not the user's
+        (the view itself answers those) or when flashed messages are waiting
+    """
+    if session.get('_flashes'):
+        return None
+    row = db.session.query(Assessment.user_id, Assessment.assessment_type).filter(
+        Assessment.id == assessment_id
+    ).first()
+    if row is None or row.user_id != current_user.id or row.assessment_type not in ASSESSMENT_TYPES:
+        return None
+    sample = ScoreHistogram.sample_size(row.assessment_type)
+    if sample < current_app.config.get('PERCENTILE_MIN_SAMPLE', 20):
+        sample = 0  # Percentiles are hidden until then
+    key = f"{view}:{assessment_id}:{current_user.id}:{SCORING_VERSION}:{RESULTS_PAGE_VERSION}:{sample}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def cacheable(response, etag):
+    """Let the browser keep a private copy of the response and revalidate it with its ETag."""
+    if etag:
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response
+
+def not_modified(etag):
+    """Empty 304 response if the browser already has this version, otherwise None."""
+    if etag and request.if_none_match.contains(etag):
+        return cacheable(current_app.response_class(status=304), etag)
+    return None
+
 class AssessmentForm(FlaskForm):
     """Empty form class for CSRF protection"""
     pass
@@ -49,8 +112,8 @@ def assessment_type(assessment_type):
         return redirect(url_for('assessment.take_assessment'))
     
     try:
-        # Get questions for the specific assessment type in a single query
-        questions = Question.query.filter_by(assessment_type=assessment_type).all()
+        # Questions come from the in-process catalog, not the database
+        questions = question_catalog.questions_for(assessment_type)
         
         if not questions:
             flash(f'No questions available for the {ASSESSMENT_TYPES[assessment_type]["name"]} assessment.', 'error')
@@ -87,42 +150,28 @@ def submit_assessment(assessment_type):
         flash('No responses were submitted.', 'error')
         return redirect(url_for('assessment.assessment_type', assessment_type=assessment_type))
     
-    try:
-        # Create new assessment
-        assessment = Assessment(
-            user_id=current_user.id,
-            assessment_type=assessment_type,
-            completed_at=datetime.utcnow()
-        )
-        db.session.add(assessment)
-        db.session.flush()
-        
-        # Get all questions in a single query
-        questions = Question.query.filter_by(assessment_type=assessment_type).all()
-        
-        # Process responses in a single transaction
-        for question in questions:
-            response_key = f'question_{question.id}'
-            if response_key not in request.form:
-                flash('Please answer all questions.', 'error')
-                return redirect(url_for('assessment.assessment_type', assessment_type=assessment_type))
-            
-            try:
-                score = int(request.form[response_key])
-                max_score = ASSESSMENT_TYPES[assessment_type]['max_score']
-                if not 1 <= score <= max_score:
-                    raise ValueError
-                
-                response = AssessmentResponse(
-                    assessment_id=assessment.id,
-                    question_id=question.id,
-                    score=score
-                )
-                db.session.add(response)
-            except ValueError:
-                flash('Invalid response value provided.', 'error')
-                return redirect(url_for('assessment.assessment_type', assessment_type=assessment_type))
+    # Validate every answer before anything is written
+    questions = question_catalog.questions_for(assessment_type)
+    max_score = ASSESSMENT_TYPES[assessment_type]['max_score']
+    answers = []
+    for question in questions:
+        response_key = f'question_{question.id}'
+        if response_key not in request.form:
+            flash('Please answer all questions.', 'error')
+            return redirect(url_for('assessment.assessment_type', assessment_type=assessment_type))
         
+        try:
+            score = int(request.form[response_key])
+            if not 1 <= score <= max_score:
+                raise ValueError
+        except ValueError:
+            flash('Invalid response value provided.', 'error')
+            return redirect(url_for('assessment.assessment_type', assessment_type=assessment_type))
+        answers.append((question, score))
+    
+    try:
+        # Write the assessment, its responses and the score snapshot in one transaction
+        assessment = Assessment.record(current_user.id, assessment_type, answers)
         db.session.commit()
         flash('Assessment completed successfully!', 'success')
         return redirect(url_for('assessment.results', assessment_id=assessment.id))
@@ -133,23 +182,19 @@ def submit_assessment(assessment_type):
         flash('An error occurred while saving your responses. Please try again.', 'error')
         return redirect(url_for('assessment.assessment_type', assessment_type=assessment_type))
 
-def generate_pdf_async(assessment, user, assessment_info, category_scores):
-    """Generate PDF report in a background thread."""
-    try:
-        # Generate the PDF report
-        pdf_path = generate_pdf_report(assessment, user, assessment_info, category_scores)
-        return pdf_path
-    except Exception as e:
-        print(f"Error in async PDF generation: {str(e)}")
-        return None
-
 @bp.route('/results/<int:assessment_id>')
 @login_required
 def results(assessment_id):
-    """Display assessment results and generate PDF report."""
+    """Display assessment results and queue the PDF report."""
+    # Answer a browser revalidation before any scoring or rendering
+    etag = results_etag('page', assessment_id)
+    unchanged = not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+
     try:
         # Get assessment and verify user has permission to view it
-        assessment = Assessment.query.get_or_404(assessment_id)
+        assessment = Assessment.query.options(joinedload(Assessment.result)).get_or_404(assessment_id)
         if assessment.user_id != current_user.id:
             flash('You do not have permission to view these results.', 'error')
             return redirect(url_for('assessment.history'))
@@ -160,53 +205,31 @@ def results(assessment_id):
             flash('Invalid assessment type.', 'error')
             return redirect(url_for('assessment.history'))
 
-        # Calculate category scores
-        category_scores = {}
-        category_counts = {}
-        
-        # Initialize scores for all categories
-        for category in assessment_info['categories']:
-            category_scores[category] = 0
-            category_counts[category] = 0
-        
-        # Sum up scores for each category
-        for response in assessment.responses:
-            category = response.question.category
-            category_scores[category] += response.score
-            category_counts[category] += 1
-        
-        # Calculate average for each category
-        for category in category_scores:
-            if category_counts[category] > 0:
-                category_scores[category] = round(
-                    category_scores[category] / category_counts[category],
-                    2
-                )
-
-        # Generate interpretation
-        interpretation = get_assessment_interpretation(assessment.assessment_type, category_scores)
+        # Scores and interpretation come from the snapshot stored at submit time
+        result = assessment.get_result()
+        category_scores = result.category_scores
+        interpretation = result.interpretation
+        percentiles = get_percentiles(assessment.assessment_type, category_scores)
 
-        # Generate PDF report
+        # Queue the PDF report; the page polls check_pdf_status until it is ready
         pdf_filename = None
         try:
-            pdf_filename = generate_pdf_report(
-                assessment=assessment,
-                user=current_user,
-                assessment_info=assessment_info,
-                category_scores=category_scores,
-                interpretation=interpretation
-            )
+            job = report_queue.enqueue(assessment.id, current_user.id)
+            if job.is_ready:
+                pdf_filename = job.filename
         except Exception as e:
-            print(f"Error generating PDF: {str(e)}")
+            db.session.rollback()
+            logging.error(f"Error queueing PDF report: {str(e)}")
 
-        return render_template(
+        return cacheable(make_response(render_template(
             'assessment/results.html',
             assessment=assessment,
             assessment_info=assessment_info,
             category_scores=category_scores,
             interpretation=interpretation,
+            percentiles=percentiles,
             pdf_filename=pdf_filename
-        )
+        )), etag)
 
     except Exception as e:
         print(f"Error displaying results: {str(e)}")
@@ -216,142 +239,132 @@ def results(assessment_id):
 @bp.route('/api/pdf_status/<int:assessment_id>')
 @login_required
 def check_pdf_status(assessment_id):
-    """Check if PDF has been generated for the assessment."""
+    """Report the state of the PDF job for the assessment."""
     try:
-        # Look for the PDF file
-        pdf_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'pdfs')
-        pattern = f"assessment_report_{assessment_id}_*.pdf"
-        matches = []
-        for filename in os.listdir(pdf_dir):
-            if filename.startswith(f"assessment_report_{assessment_id}_") and filename.endswith(".pdf"):
-                matches.append(filename)
-        
-        if matches:
-            # Get the most recent PDF
-            latest_pdf = sorted(matches)[-1]
-            return jsonify({
-                'status': 'ready',
-                'pdf_path': f'/static/pdfs/{latest_pdf}'
-            })
-        
-        return jsonify({'status': 'generating'})
+        job = ReportJob.query.filter_by(assessment_id=assessment_id).first()
+        if job is None or job.user_id != current_user.id:
+            return jsonify({'status': 'not_found'}), 404
+
+        payload = {'status': job.status, 'attempts': job.attempts}
+        if job.is_ready:
+            payload['pdf_path'] = url_for('assessment.download_pdf', filename=job.filename)
+        return jsonify(payload)
         
     except Exception as e:
         print(f"Error checking PDF status: {str(e)}")
         return jsonify({'status': 'error'})
 
+def get_history_page():
+    """
+    Load the history page selected by the cursor and limit query arguments.
+    
+    Returns:
+        tuple: (entries with completed_at in the display timezone, next page cursor or None)
+        
+    Raises:
+        ValueError: The cursor is malformed
+    """
+    cursor = request.args.get('cursor')
+    after = decode_cursor(cursor) if cursor else None
+    page_size = current_app.config.get('HISTORY_PAGE_SIZE', 20)
+    limit = min(max(request.args.get('limit', page_size, type=int), 1), 100)
+    entries, next_key = Assessment.history_page(current_user.id, after=after, limit=limit)
+    
+    # Convert UTC times to the display timezone, resolved once for the whole page
+    utc = timezone('UTC')
+    local_tz = timezone(current_app.config.get('DISPLAY_TIMEZONE', 'America/New_York'))
+    entries = [
+        entry._replace(completed_at=utc.localize(entry.completed_at).astimezone(local_tz))
+        for entry in entries
+    ]
+    return entries, encode_cursor(*next_key) if next_key else None
+
 @bp.route('/history')
 @login_required
 def history():
-    """Display user's assessment history."""
-    assessments = Assessment.query.filter_by(
-        user_id=current_user.id
-    ).order_by(Assessment.completed_at.desc()).all()
-    
-    # Convert UTC times to Eastern Time (EST/EDT)
-    local_tz = timezone('America/New_York')
-    for assessment in assessments:
-        if assessment.completed_at.tzinfo is None:
-            assessment.completed_at = timezone('UTC').localize(assessment.completed_at)
-        assessment.completed_at = assessment.completed_at.astimezone(local_tz)
+    """Display user's assessment history, one page at a time."""
+    try:
+        assessments, next_cursor = get_history_page()
+    except ValueError:
+        return redirect(url_for('assessment.history'))
     
     return render_template('assessment/history.html', 
                          assessments=assessments,
+                         next_cursor=next_cursor,
+                         is_first_page='cursor' not in request.args,
                          assessment_types=ASSESSMENT_TYPES)
 
+@bp.route('/api/history')
+@login_required
+def api_history():
+    """API endpoint for one page of the user's assessment history."""
+    try:
+        assessments, next_cursor = get_history_page()
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    return jsonify({
+        'assessments': [{
+            'id': assessment.id,
+            'assessment_type': assessment.assessment_type,
+            'completed_at': assessment.completed_at.isoformat(),
+            'scores': assessment.scores,
+            'results_url': url_for('assessment.results', assessment_id=assessment.id)
+        } for assessment in assessments],
+        'next_cursor': next_cursor
+    })
+
 @bp.route('/api/results/<int:assessment_id>')
 @login_required
 def api_results(assessment_id):
     """API endpoint for getting assessment results data for charts."""
-    assessment = Assessment.query.get_or_404(assessment_id)
+    etag = results_etag('api', assessment_id)
+    unchanged = not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+
+    assessment = Assessment.query.options(joinedload(Assessment.result)).get_or_404(assessment_id)
     
     # Ensure the user can only view their own results
     if assessment.user_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
     
-    # Get assessment type info
-    assessment_info = ASSESSMENT_TYPES.get(assessment.assessment_type)
-    if not assessment_info:
+    # Validate assessment type
+    if assessment.assessment_type not in ASSESSMENT_TYPES:
         return jsonify({'error': 'Invalid assessment type'}), 400
     
-    # Calculate scores for each category
-    category_scores = {}
-    for category in assessment_info['categories']:
-        score = assessment.get_category_score(category)
-        category_scores[category] = score
-    
-    return jsonify({
-        'type': assessment_info.get('visualization', 'radar'),  # Default to radar if not specified
-        'categories': list(category_scores.keys()),
-        'scores': list(category_scores.values()),
-        'max_score': assessment_info['max_score']
-    })
+    # The chart payload is stored with the score snapshot
+    result = assessment.get_result()
+    payload = dict(result.visualization)
+    payload['percentiles'] = get_percentiles(assessment.assessment_type, result.category_scores)
+    return cacheable(jsonify(payload), etag)
 
 @bp.route('/download/<path:filename>')
 @login_required
 def download_pdf(filename):
     """Download a PDF report."""
     try:
-        # Security check: ensure filename only contains safe characters
-        if not filename or '..' in filename:
-            flash('Invalid filename.', 'error')
+        # Reports are only served to the owner of the job that produced them
+        job = ReportJob.query.filter_by(filename=filename, user_id=current_user.id).first()
+        if job is None:
+            flash('You do not have permission to download this file.', 'error')
             return redirect(url_for('assessment.history'))
-            
-        # Construct the full path
-        pdf_dir = os.path.join(current_app.root_path, 'static', 'pdfs')
-        file_path = os.path.join(pdf_dir, filename)
-        
-        # Debug logging
-        print(f"Attempting to download PDF: {file_path}")
-        print(f"File exists: {os.path.exists(file_path)}")
-        
-        # Verify file exists and is in the correct directory
-        if not os.path.exists(file_path):
-            print(f"PDF file not found at path: {file_path}")
+
+        file_path = report_cache.path_for(filename)
+        if not file_path or not os.path.exists(file_path):
+            logging.warning(f"PDF file not found in report cache: {filename}")
             flash('PDF file not found.', 'error')
-            return redirect(url_for('assessment.history'))
-            
-        if not os.path.commonpath([file_path, pdf_dir]) == pdf_dir:
-            print(f"Security check failed: file path {file_path} is outside pdf_dir {pdf_dir}")
-            flash('Invalid file path.', 'error')
-            return redirect(url_for('assessment.history'))
-            
-        # Get the assessment ID from the filename
-        try:
-            # Handle both old and new filename formats
-            if '_' in filename:
-                if filename.startswith('assessment_report_'):
-                    assessment_id = int(filename.split('_')[2])
-                else:
-                    # New format: LSI_28Apr25.pdf
-                    return send_file(
-                        file_path,
-                        mimetype='application/pdf',
-                        as_attachment=True,
-                        download_name=filename
-                    )
-                    
-                assessment = Assessment.query.get_or_404(assessment_id)
-                
-                # Check if user has permission to download this PDF
-                if assessment.user_id != current_user.id:
-                    flash('You do not have permission to download this file.', 'error')
-                    return redirect(url_for('assessment.history'))
-            
-        except (ValueError, IndexError) as e:
-            print(f"Error parsing filename: {str(e)}")
-            # Don't redirect - try to send the file anyway if it exists
-            pass
-            
-        print(f"Sending file: {file_path}")
+            return redirect(url_for('assessment.results', assessment_id=job.assessment_id))
+
+        assessment = job.assessment
         return send_file(
             file_path,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=filename
+            download_name=report_download_name(assessment, ASSESSMENT_TYPES[assessment.assessment_type])
         )
         
     except Exception as e:
         print(f"Error downloading PDF: {str(e)}")
         flash('An error occurred while downloading the PDF.', 'error')
-        return redirect(url_for('assessment.history')) 
\ No newline at end of file
+        return redirect(url_for('assessment.history'))
@@ -1,7 +1,36 @@
-from flask import Blueprint, jsonify
+import hmac
+
+from flask import Blueprint, abort, current_app, jsonify, request
 
 bp = Blueprint('health', __name__)
 
 @bp.route('/health')
 def health_check():
-    return jsonify({"status": "healthy"}), 200 
\ No newline at end of file
+    return jsonify({"status": "healthy"}), 200
+
+@bp.route('/health/live')
+def liveness():
+    """Liveness probe: the process is up and answering; restart it if this fails."""
+    response = jsonify(current_app.extensions['health'].liveness())
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@bp.route('/health/ready')
+def readiness():
+    """Readiness probe: 503 while the database, pool, this worker's report queue or disk would fail requests."""
+    result = current_app.extensions['health'].readiness()
+    response = jsonify(result)
+    response.status_code = 200 if result['status'] == 'ready' else 503
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint; requires `Authorization: Bearer <METRICS_TOKEN>` when a token is set."""
+    if not current_app.config['METRICS_ENABLED']:
+        abort(404)
+    token = current_app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        abort(401)
+    body = current_app.extensions['metrics'].render()
+    return body, 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8', 'Cache-Control': 'no-store'}
@@ -5,10 +5,8 @@ from wtforms.validators import DataRequired
 import json
 import os
 from datetime import datetime
-from app.utils.pdf_generator import generate_pdf_report
 from flask_login import current_user, login_required
 from app.models.assessment import Question
-from seed_db import seed_questions
 
 bp = Blueprint('main', __name__)
 
@@ -81,6 +79,8 @@ def download_results(assessment_id):
     
     user = current_user if hasattr(current_user, 'is_authenticated') else MockUser(request.args.get('name', 'Anonymous'))
     
+    # Imported here so ReportLab only loads in processes that build reports
+    from app.utils.pdf_generator import generate_pdf_report
     pdf_path = generate_pdf_report(assessment, user, assessment_info, category_scores)
     full_path = os.path.join(current_app.root_path, 'static', pdf_path.lstrip('/static/'))
     
@@ -120,6 +120,8 @@ def calculate_score(assessment_id, responses):
 @bp.route('/seed')
 def seed_database():
     if Question.query.count() == 0:
+        from seed_db import seed_questions
         seed_questions()
+        current_app.extensions['question_catalog'].invalidate()
         return "✅ Questions seeded successfully."
     return "⚠️ Questions already exist. Seeding skipped." 
\ No newline at end of file
@@ -0,0 +1,383 @@
+import json
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+
+class MemoryBackend:
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Fastest, but every worker process has its own copy.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """
+    Cache in an SQLite file on local disk, shared by every process on the host.
+
+    Uses WAL mode so readers never wait for a writer. Each thread of each
+    process opens its own connection. Expired entries are dropped as they are
+    read and, every PRUNE_EVERY writes, in bulk; beyond max_entries the oldest
+    writes go first.
+    """
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path, max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entry ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)'
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM cache_entry WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return pickle.loads(value)
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at)
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(connection)
+
+    def _prune(self, connection):
+        connection.execute('DELETE FROM cache_entry WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        # INSERT OR REPLACE gives a rewritten key a new rowid, so low rowids are the oldest writes
+        connection.execute(
+            'DELETE FROM cache_entry WHERE rowid <= '
+            '(SELECT max(rowid) FROM cache_entry) - ?', (self.max_entries,)
+        )
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RedisBackend:
+    """
+    Minimal client for a Redis-protocol (RESP) server, shared by every host.
+
+    Speaks just enough of the protocol for GET, SET ... PX, DEL and FLUSHDB over
+    one socket per thread and process, so no client library is needed.
+    """
+
+    # Seconds to stop trying after the server could not be reached
+    RETRY_AFTER = 5
+
+    def __init__(self, url, timeout=1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def _socket(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            if time.monotonic() < self._down_until:
+                raise ConnectionError(f'Cache server {self.host}:{self.port} is unavailable')
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            except OSError:
+                # Don't make every request wait for the connect timeout
+                self._down_until = time.monotonic() + self.RETRY_AFTER
+                raise
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = (sock, sock.makefile('rb'))
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            if self.password:
+                self._call('AUTH', self.password)
+            if self.db:
+                self._call('SELECT', str(self.db))
+        return connection
+
+    def _call(self, *args):
+        sock, reader = self._socket()
+        parts = [f'*{len(args)}\r\n'.encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        try:
+            sock.sendall(b''.join(parts))
+            return self._read(reader)
+        except OSError:
+            # Drop the broken connection; the next call reconnects
+            self._local.connection = None
+            sock.close()
+            raise
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError('Connection closed by the cache server')
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload
+        if kind == b'-':
+            raise RedisError(payload.decode('utf-8', 'replace'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [self._read(reader) for _ in range(count)]
+        raise RedisError(f'Unexpected reply: {line!r}')
+
+    def get(self, key):
+        data = self._call('GET', key)
+        return None if data is None else pickle.loads(data)
+
+    def set(self, key, value, ttl=None):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if ttl:
+            self._call('SET', key, data, 'PX', int(ttl * 1000))
+        else:
+            self._call('SET', key, data)
+
+    def delete(self, key):
+        self._call('DEL', key)
+
+    def clear(self):
+        self._call('FLUSHDB')
+
+
+class Namespace:
+    """
+    A named, versioned section of the shared cache.
+
+    Keys are prefixed with the namespace name and version, so bumping the
+    version (e.g. with SCORING_VERSION) makes old entries unreachable. Backend
+    failures are logged and treated as misses: a broken cache makes requests
+    slower, never failing.
+    """
+
+    def __init__(self, cache, name, version=1, ttl=None):
+        self.cache = cache
+        self.name = name
+        self.version = version
+        self.ttl = ttl
+        self.prefix = f'{name}:v{version}:'
+
+    def make_key(self, key):
+        if not isinstance(key, str):
+            key = json.dumps(key, sort_keys=True, separators=(',', ':'), default=str)
+        return self.prefix + key
+
+    def get(self, key):
+        """Cached value, or None on a miss."""
+        try:
+            value = self.cache.backend.get(self.make_key(key))
+        except Exception as e:
+            self.cache.count(self.name, 'errors')
+            logging.warning(f"Cache get failed in {self.name}: {type(e).__name__}: {str(e)}")
+            return None
+        self.cache.count(self.name, 'misses' if value is None else 'hits')
+        return value
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.cache.backend.set(self.make_key(key), value, ttl or self.ttl)
+            self.cache.count(self.name, 'sets')
+        except Exception as e:
+            self.cache.count(self.name, 'errors')
+            logging.warning(f"Cache set failed in {self.name}: {type(e).__name__}: {str(e)}")
+
+    def get_or_set(self, key, compute, ttl=None):
+        """
+        Get a value, computing and storing it on a miss.
+
+        Args:
+            key: String, or any JSON-serializable value
+            compute (callable): Called with no arguments on a miss
+            ttl (float): Seconds to keep the value; defaults to the namespace's TTL
+
+        Returns:
+            The cached or computed value (None is never cached)
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        try:
+            self.cache.backend.delete(self.make_key(key))
+        except Exception as e:
+            self.cache.count(self.name, 'errors')
+            logging.warning(f"Cache delete failed in {self.name}: {type(e).__name__}: {str(e)}")
+
+
+class SharedCache:
+    """
+    Key-value cache for derived data, with pluggable backends.
+
+    CACHE_BACKEND selects 'memory' (per-process LRU), 'sqlite' (a file shared
+    by the processes on one host, CACHE_SQLITE_PATH) or 'redis' (any server
+    speaking the Redis protocol, CACHE_REDIS_URL). Callers work through
+    namespaces, which keep hit/miss counts for this process.
+
+    Entries are keyed by database ids, so a persistent cache must be cleared
+    (`flask cache clear`) when the database is recreated.
+    """
+
+    BACKENDS = ('memory', 'sqlite', 'redis')
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = None
+        self._namespaces = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_BACKEND', 'memory')
+        app.config.setdefault('CACHE_DEFAULT_TTL', 3600)
+        app.config.setdefault('CACHE_MAX_ENTRIES', 10000)
+        app.config.setdefault('CACHE_SQLITE_PATH', os.path.join(app.instance_path, 'cache.sqlite3'))
+        app.config.setdefault('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+        app.extensions['shared_cache'] = self
+        self.app = app
+        self.backend = self.create_backend(app.config)
+
+    @classmethod
+    def create_backend(cls, config):
+        name = config['CACHE_BACKEND']
+        if name == 'memory':
+            return MemoryBackend(config['CACHE_MAX_ENTRIES'])
+        if name == 'sqlite':
+            return SQLiteBackend(config['CACHE_SQLITE_PATH'], config['CACHE_MAX_ENTRIES'])
+        if name == 'redis':
+            return RedisBackend(config['CACHE_REDIS_URL'])
+        raise ValueError(f"Unknown CACHE_BACKEND {name!r}, expected one of {', '.join(cls.BACKENDS)}")
+
+    def namespace(self, name, version=1, ttl=None):
+        """
+        Get the namespace with this name, creating it on first use.
+
+        Args:
+            name (str): Namespace name, also the metrics label
+            version: Part of every key; change it to drop all old entries
+            ttl (float): Default seconds to keep values; CACHE_DEFAULT_TTL if None
+
+        Returns:
+            Namespace
+        """
+        key = (name, version)
+        namespace = self._namespaces.get(key)
+        if namespace is None:
+            with self._lock:
+                namespace = self._namespaces.get(key)
+                if namespace is None:
+                    namespace = Namespace(self, name, version, ttl or self.app.config['CACHE_DEFAULT_TTL'])
+                    self._namespaces[key] = namespace
+        return namespace
+
+    def count(self, name, event):
+        with self._lock:
+            counters = self._stats.setdefault(name, {'hits': 0, 'misses': 0, 'sets': 0, 'errors': 0})
+            counters[event] += 1
+
+    def stats(self):
+        """
+        Hit/miss counters of this process.
+
+        Returns:
+            dict: {namespace: {'hits', 'misses', 'sets', 'errors', 'hit_ratio'}}
+        """
+        with self._lock:
+            stats = {name: dict(counters) for name, counters in self._stats.items()}
+        for counters in stats.values():
+            lookups = counters['hits'] + counters['misses']
+            counters['hit_ratio'] = counters['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Remove every entry of every namespace from the backend."""
+        self.backend.clear()
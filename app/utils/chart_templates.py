@@ -0,0 +1,155 @@
+import threading
+from functools import lru_cache
+from io import BytesIO
+
+import matplotlib
+matplotlib.use('Agg')  # Use Agg backend for non-GUI environments
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image as PILImage
+
+CHART_DPI = 150
+CHART_COLOR = '#9370DB'
+
+
+class ChartTemplate:
+    """
+    A chart whose static parts (axes, grid, rings, category labels, title) are
+    rendered once and kept as a raster background.
+
+    Rendering a set of scores restores that background and draws only the data
+    artists on top of it, so the per-report cost is one polygon or a few bars
+    instead of a full figure layout.
+    """
+
+    def __init__(self, kind, categories, max_score):
+        self.kind = kind
+        self.categories = tuple(categories)
+        self.max_score = max_score
+        self._lock = threading.Lock()
+
+        labels = [cat.replace('_', ' ').title() for cat in self.categories]
+        if kind == 'radar':
+            self._build_radar(labels)
+        else:
+            self._build_bar(labels)
+
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._crop = self._tight_crop()
+
+    def _build_radar(self, labels):
+        with plt.style.context('default'):
+            # Leave room around the polar axes for long category labels; the
+            # background is cropped to the drawn content afterwards
+            self.figure = Figure(figsize=(10, 9), dpi=CHART_DPI, facecolor='none')
+            self.canvas = FigureCanvasAgg(self.figure)
+            ax = self.figure.add_axes([0.15, 0.07, 0.7, 0.78], projection='polar')
+
+            self.angles = np.linspace(0, 2*np.pi, len(labels), endpoint=False)
+            ax.set_xticks(self.angles)
+            ax.set_xticklabels(labels, color='black', size=10)  # Black text for better visibility
+            ax.set_ylim(0, self.max_score)
+
+            ax.grid(True, color='gray', alpha=0.3)
+            ax.spines['polar'].set_color('gray')
+            ax.tick_params(axis='y', colors='black')
+            ax.patch.set_alpha(0)  # Transparent background
+            ax.set_title('Assessment Results', pad=20, color='black', size=14)
+        self.ax = ax
+
+    def _build_bar(self, labels):
+        with plt.style.context('dark_background'):
+            self.figure = Figure(figsize=(10, 6), dpi=CHART_DPI, facecolor='#1a1a1a')
+            self.canvas = FigureCanvasAgg(self.figure)
+            ax = self.figure.add_subplot(111)
+
+            self.positions = np.arange(len(labels))
+            ax.set_ylim(0, self.max_score)
+            ax.set_xlim(-0.5, len(labels) - 0.5)
+            ax.set_xticks(self.positions)
+            ax.set_xticklabels(labels, rotation=45, ha='right', color='white')
+
+            ax.grid(True, axis='y', alpha=0.3)
+            ax.set_axisbelow(True)
+            ax.set_title('Assessment Results', pad=20, color='white', size=14)
+            self.figure.tight_layout()
+        self.ax = ax
+
+    def _tight_crop(self):
+        """Pixel box around the drawn content, like savefig(bbox_inches='tight')."""
+        renderer = self.canvas.get_renderer()
+        bbox = self.figure.get_tightbbox(renderer).padded(0.1)
+        width, height = self.canvas.get_width_height()
+        x0 = max(int(bbox.x0 * CHART_DPI), 0)
+        x1 = min(int(np.ceil(bbox.x1 * CHART_DPI)), width)
+        # Figure coordinates grow upwards, image rows grow downwards
+        y0 = max(height - int(np.ceil(bbox.y1 * CHART_DPI)), 0)
+        y1 = min(height - int(bbox.y0 * CHART_DPI), height)
+        return slice(y0, y1), slice(x0, x1)
+
+    def render(self, scores):
+        """
+        Draw scores over the cached background.
+
+        Args:
+            scores (list): Scores in the same order as the template categories
+
+        Returns:
+            BytesIO: PNG image data of the chart
+        """
+        with self._lock:
+            self.canvas.restore_region(self._background)
+            if self.kind == 'radar':
+                artists = self._draw_radar(scores)
+            else:
+                artists = self._draw_bars(scores)
+            for artist in artists:
+                self.ax.draw_artist(artist)
+            pixels = np.asarray(self.canvas.buffer_rgba())[self._crop].copy()
+            for artist in artists:
+                artist.remove()
+
+        # The PNG is only handed to ReportLab, which recompresses it into the PDF,
+        # so favour encoding speed over file size
+        buffer = BytesIO()
+        PILImage.fromarray(pixels, 'RGBA').save(buffer, format='PNG', compress_level=1)
+        buffer.seek(0)
+        return buffer
+
+    def _draw_radar(self, scores):
+        # Close the polygon by repeating the first point
+        values = np.concatenate((scores, [scores[0]]))
+        angles = np.concatenate((self.angles, [self.angles[0]]))
+        fill, = self.ax.fill(angles, values, alpha=0.25, color=CHART_COLOR)
+        line, = self.ax.plot(angles, values, 'o-', linewidth=2.5, color=CHART_COLOR, label='Scores')
+        return [fill, line]
+
+    def _draw_bars(self, scores):
+        bars = self.ax.bar(self.positions, scores, color=CHART_COLOR, alpha=0.7)
+        artists = list(bars.patches)
+        for bar in bars:
+            height = bar.get_height()
+            artists.append(self.ax.text(bar.get_x() + bar.get_width()/2., height,
+                                        f'{height:.1f}', ha='center', va='bottom', color='white'))
+        # Bar containers register with the axes; drop it along with its patches
+        self.ax.containers.remove(bars)
+        return artists
+
+
+@lru_cache(maxsize=32)
+def get_chart_template(kind, categories, max_score):
+    """
+    Get the cached template for a chart layout.
+
+    Args:
+        kind (str): 'radar' or 'bar'
+        categories (tuple): Category names, in display order
+        max_score (int): Maximum possible score for any category
+
+    Returns:
+        ChartTemplate: Shared template for that layout
+    """
+    return ChartTemplate(kind, categories, max_score)
@@ -0,0 +1,235 @@
+import csv
+import io
+import json
+from itertools import islice
+from app import db
+from app.models.assessment import (
+    Assessment, AssessmentResponse, AssessmentResult, Question,
+    ASSESSMENT_TYPES, SCORING_VERSION, averages_from_totals
+)
+
+EXPORT_KINDS = ('results', 'responses')
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+# Rows fetched from the server-side cursor at a time; also the size of the
+# batches whose outdated snapshots are rescored together
+BATCH_SIZE = 1000
+
+# Encoded rows joined into one chunk of the response body
+ROWS_PER_CHUNK = 200
+
+RESULT_COLUMNS = ['assessment_id', 'user_id', 'assessment_type', 'completed_at', 'score', 'percentile']
+RESPONSE_COLUMNS = ['response_id', 'assessment_id', 'user_id', 'assessment_type', 'completed_at',
+                    'question_id', 'category', 'score']
+
+
+def category_columns(assessment_type=None):
+    """
+    Category score columns of the results CSV.
+
+    Args:
+        assessment_type (str): Only this type's categories, or None for every type's
+
+    Returns:
+        list: Category names in ASSESSMENT_TYPES order, without duplicates
+    """
+    types = [assessment_type] if assessment_type else list(ASSESSMENT_TYPES)
+    columns = []
+    for name in types:
+        for category in ASSESSMENT_TYPES[name]['categories']:
+            if category not in columns:
+                columns.append(category)
+    return columns
+
+
+def filter_assessments(query, assessment_type=None, since=None, until=None, user_ids=None):
+    """
+    Restrict a query that includes Assessment to the given filters.
+
+    Args:
+        query (Query): Query selecting from or joined to Assessment
+        assessment_type (str): Only this assessment type, or None for all
+        since (datetime): Only assessments completed at or after this time
+        until (datetime): Only assessments completed before this time
+        user_ids: Only these users' assessments (a list or a subquery), or None
+
+    Returns:
+        Query: The filtered query
+    """
+    if assessment_type:
+        query = query.filter(Assessment.assessment_type == assessment_type)
+    if since is not None:
+        query = query.filter(Assessment.completed_at >= since)
+    if until is not None:
+        query = query.filter(Assessment.completed_at < until)
+    if user_ids is not None:
+        query = query.filter(Assessment.user_id.in_(user_ids))
+    return query
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def result_rows(assessment_type=None, since=None, until=None, user_ids=None, batch_size=BATCH_SIZE):
+    """
+    Lazily yield one dict per completed assessment, oldest first.
+
+    Rows are read through a server-side cursor (yield_per), so memory use does
+    not grow with the number of assessments. Scores come from the stored
+    snapshots; those missing or outdated are rescored with one aggregate query
+    per batch.
+
+    Args:
+        assessment_type, since, until, user_ids: Filters, see filter_assessments
+        batch_size (int): Rows fetched per round trip
+
+    Yields:
+        dict: RESULT_COLUMNS plus 'category_scores' ({category: score})
+    """
+    query = db.session.query(
+        Assessment.id, Assessment.user_id, Assessment.assessment_type, Assessment.completed_at,
+        AssessmentResult.score, AssessmentResult.percentile,
+        AssessmentResult.category_scores, AssessmentResult.scoring_version
+    ).outerjoin(
+        AssessmentResult, AssessmentResult.assessment_id == Assessment.id
+    )
+    query = filter_assessments(query, assessment_type, since, until, user_ids)
+    rows = query.order_by(Assessment.id).yield_per(batch_size)
+
+    for batch in _batches(rows, batch_size):
+        stale = [row.id for row in batch
+                 if row.scoring_version != SCORING_VERSION and row.assessment_type in ASSESSMENT_TYPES]
+        totals = Assessment.get_category_totals(stale)
+        for row in batch:
+            score = row.score
+            category_scores = row.category_scores or {}
+            if row.id in totals:
+                category_scores = {
+                    category: round(value, 2)
+                    for category, value in averages_from_totals(row.assessment_type, totals[row.id]).items()
+                }
+                score = round(sum(category_scores.values()) / len(category_scores), 2) if category_scores else None
+            yield {
+                'assessment_id': row.id,
+                'user_id': row.user_id,
+                'assessment_type': row.assessment_type,
+                'completed_at': row.completed_at,
+                'score': score,
+                'percentile': row.percentile,
+                'category_scores': category_scores,
+            }
+
+
+def response_rows(assessment_type=None, since=None, until=None, user_ids=None, batch_size=BATCH_SIZE):
+    """
+    Lazily yield one dict per answered question, in response id order.
+
+    Args:
+        assessment_type, since, until, user_ids: Filters, see filter_assessments
+        batch_size (int): Rows fetched per round trip
+
+    Yields:
+        dict: RESPONSE_COLUMNS
+    """
+    query = db.session.query(
+        AssessmentResponse.id, AssessmentResponse.assessment_id, Assessment.user_id,
+        Assessment.assessment_type, Assessment.completed_at,
+        AssessmentResponse.question_id, Question.category, AssessmentResponse.score
+    ).join(
+        Assessment, AssessmentResponse.assessment_id == Assessment.id
+    ).join(
+        Question, AssessmentResponse.question_id == Question.id
+    )
+    query = filter_assessments(query, assessment_type, since, until, user_ids)
+    for row in query.order_by(AssessmentResponse.id).yield_per(batch_size):
+        yield {
+            'response_id': row.id,
+            'assessment_id': row.assessment_id,
+            'user_id': row.user_id,
+            'assessment_type': row.assessment_type,
+            'completed_at': row.completed_at,
+            'question_id': row.question_id,
+            'category': row.category,
+            'score': row.score,
+        }
+
+
+def _isoformat(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_csv(rows, columns):
+    """Encode dict rows as CSV text, yielding the header and then chunks of rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    # The header goes out before the first query runs
+    yield buffer.getvalue()
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            if row.get('completed_at') is not None:
+                row['completed_at'] = row['completed_at'].isoformat()
+            writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def encode_jsonl(rows):
+    """Encode dict rows as JSON Lines, yielding chunks of lines."""
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        yield ''.join(json.dumps(row, default=_isoformat) + '\n' for row in batch)
+
+
+def _flatten_scores(row):
+    row.update(row.pop('category_scores'))
+    return row
+
+
+def export_stream(kind, fmt, assessment_type=None, since=None, until=None, user_ids=None):
+    """
+    Text chunks of a results or responses export, generated as they are sent.
+
+    Nothing is read from the database until the first chunk is requested.
+
+    Args:
+        kind (str): 'results' or 'responses'
+        fmt (str): 'csv' or 'jsonl'
+        assessment_type, since, until, user_ids: Filters, see filter_assessments
+
+    Returns:
+        generator: str chunks
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind: {kind}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if assessment_type and assessment_type not in ASSESSMENT_TYPES:
+        raise ValueError(f"Unknown assessment type: {assessment_type}")
+
+    filters = dict(assessment_type=assessment_type, since=since, until=until, user_ids=user_ids)
+    if kind == 'responses':
+        rows = response_rows(**filters)
+        if fmt == 'csv':
+            return encode_csv(rows, RESPONSE_COLUMNS)
+        return encode_jsonl(rows)
+
+    rows = result_rows(**filters)
+    if fmt == 'csv':
+        # One column per category; a row leaves other types' categories empty
+        return encode_csv((_flatten_scores(row) for row in rows),
+                          RESULT_COLUMNS + category_columns(assessment_type))
+    return encode_jsonl(rows)
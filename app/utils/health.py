@@ -0,0 +1,168 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from sqlalchemy import text
+
+
+class CheckFailed(Exception):
+    """Raised by a readiness check to mark it unhealthy; the message is reported as the detail."""
+
+
+class HealthChecks:
+    """
+    Liveness and readiness checks for load balancer probes.
+
+    Liveness only says that the process answers requests. Readiness checks
+    what the worker needs to serve traffic: a database round trip within
+    HEALTH_DB_TIMEOUT, free connections in the pool, at most
+    HEALTH_MAX_PENDING_JOBS report jobs queued in this process and
+    HEALTH_MIN_FREE_BYTES of free space for the PDF cache. The readiness result is kept for HEALTH_CACHE_SECONDS, so
+    however often the probes come, the checks run at most once per window per
+    process.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.started_at = time.time()
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._db_future = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('HEALTH_CACHE_SECONDS', 5)
+        app.config.setdefault('HEALTH_DB_TIMEOUT', 2)
+        app.config.setdefault('HEALTH_POOL_MAX_USAGE', 0.9)
+        app.config.setdefault('HEALTH_MAX_PENDING_JOBS', 100)
+        app.config.setdefault('HEALTH_MIN_FREE_BYTES', 100 * 1024 * 1024)
+        app.extensions['health'] = self
+        self.app = app
+        # A result cached for a previous app says nothing about this one
+        self._result = None
+
+    def liveness(self):
+        return {'status': 'alive', 'pid': os.getpid(), 'uptime_seconds': round(time.time() - self.started_at, 1)}
+
+    def readiness(self):
+        """
+        Run the readiness checks, or return the result of a run within the cache window.
+
+        Returns:
+            dict: {'status': 'ready' | 'unavailable', 'checked_at', 'age_seconds',
+            'checks': {name: {'ok', 'latency_ms', 'detail'}}}
+        """
+        with self._lock:
+            # Probes arriving while a run is in progress wait for it and share the result
+            if self._result is None or time.time() - self._checked_at >= self.app.config['HEALTH_CACHE_SECONDS']:
+                self._result = self._run_checks()
+                self._checked_at = time.time()
+            result = dict(self._result)
+        result['age_seconds'] = round(time.time() - self._checked_at, 3)
+        return result
+
+    def _run_checks(self):
+        from app import db
+
+        engine = db.engine
+        checks = {}
+        # The pool is measured before the database check takes a connection of its own
+        checks['db_pool'] = self._timed(lambda: self.check_pool(engine))
+        checks['database'] = self._timed(lambda: self.check_database(engine))
+        if checks['database']['ok']:
+            checks['report_backlog'] = self._timed(self.check_backlog)
+        else:
+            checks['report_backlog'] = {'ok': False, 'latency_ms': 0.0, 'detail': 'skipped: database unavailable'}
+        checks['disk'] = self._timed(self.check_disk)
+        ready = all(check['ok'] for check in checks.values())
+        if not ready:
+            failed = ', '.join(f"{name} ({check['detail']})" for name, check in checks.items() if not check['ok'])
+            logging.warning(f"Readiness check failed: {failed}")
+        return {'status': 'ready' if ready else 'unavailable', 'checked_at': time.time(), 'checks': checks}
+
+    @staticmethod
+    def _timed(check):
+        start = time.perf_counter()
+        try:
+            detail, ok = check(), True
+        except CheckFailed as e:
+            detail, ok = str(e), False
+        except Exception as e:
+            detail, ok = f'{type(e).__name__}: {str(e)}', False
+        return {'ok': ok, 'latency_ms': round((time.perf_counter() - start) * 1000, 2), 'detail': detail}
+
+    def check_database(self, engine):
+        """SELECT 1 in a helper thread, so a hung connection costs at most HEALTH_DB_TIMEOUT."""
+        timeout = self.app.config['HEALTH_DB_TIMEOUT']
+        executor = self._get_executor()
+        if self._db_future is not None and not self._db_future.done():
+            # Never stack threads behind a query that is still stuck
+            raise CheckFailed(f'previous check still running after {timeout}s')
+
+        def ping():
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+
+        self._db_future = executor.submit(ping)
+        try:
+            self._db_future.result(timeout=timeout)
+        except TimeoutError:
+            raise CheckFailed(f'no answer within {timeout}s')
+        return 'ok'
+
+    def check_pool(self, engine):
+        """Connections checked out of the pool against its capacity (pool size plus overflow)."""
+        pool = engine.pool
+        if not hasattr(pool, 'checkedout') or not hasattr(pool, 'size'):
+            return f'{type(pool).__name__}: not pooled'
+        capacity = pool.size() + max(getattr(pool, '_max_overflow', 0), 0)
+        in_use = pool.checkedout()
+        detail = f'{in_use} of {capacity} connections in use'
+        if capacity and in_use / capacity >= self.app.config['HEALTH_POOL_MAX_USAGE']:
+            raise CheckFailed(detail)
+        return detail
+
+    def check_backlog(self):
+        """
+        Report jobs queued in this process against the limit; the shared total is only reported.
+
+        The report_job table is shared by every instance, so failing on its
+        total would take them all out of rotation at once during a burst of
+        reports, including for pages that need no PDF.
+        """
+        report_queue = self.app.extensions['report_queue']
+        local = report_queue.local_depth()
+        limit = self.app.config['HEALTH_MAX_PENDING_JOBS']
+        detail = f'{local} report jobs queued here (limit {limit}), {report_queue.pending_count()} pending in total'
+        if local > limit:
+            raise CheckFailed(detail)
+        return detail
+
+    def check_disk(self):
+        """Free space and write access where PDFs are cached (its nearest existing parent if not created yet)."""
+        directory = os.path.abspath(self.app.config['REPORT_CACHE_DIR'])
+        while not os.path.isdir(directory):
+            directory = os.path.dirname(directory)
+        if not os.access(directory, os.W_OK):
+            raise CheckFailed(f'{directory} is not writable')
+        free = shutil.disk_usage(directory).free
+        minimum = self.app.config['HEALTH_MIN_FREE_BYTES']
+        detail = f'{free // (1024 * 1024)} MiB free (minimum {minimum // (1024 * 1024)} MiB)'
+        if free < minimum:
+            raise CheckFailed(detail)
+        return detail
+
+    def _get_executor(self):
+        # A forked worker must not reuse the parent's thread
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='health-check')
+            self._pid = os.getpid()
+            self._db_future = None
+        return self._executor
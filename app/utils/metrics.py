@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds or counts) of the histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+RENDER_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Label used for queries run outside a request (report workers, commands)
+NO_REQUEST = 'none'
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, as Prometheus expects."""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            # One slot per bucket plus +Inf; made cumulative when rendered
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for label_values, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                bucket_labels = format_labels(self.labels + ('le',), label_values + (str(bound),))
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            labels = format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {total:.6f}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label set."""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            lines.append(f'{self.name}{format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+def sampled(name, help_text, kind, samples):
+    """Lines of a metric read at scrape time; samples is [(labels dict, value)]."""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    for labels, value in samples:
+        lines.append(f'{name}{format_labels(tuple(labels), tuple(labels.values()))} {value}')
+    return lines
+
+
+class Metrics:
+    """
+    Request, database and report timings, exposed in Prometheus text format.
+
+    Records per-endpoint latency and status, the number and duration of SQL
+    queries per request (SQLAlchemy cursor events), and PDF build time split
+    into chart, layout and write phases. Values live in this process: under
+    gunicorn every worker keeps its own, so a scrape shows the worker that
+    answered it. METRICS_ENABLED = False turns recording and /metrics off.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.requests = Counter('http_requests_total', 'Requests by endpoint, method and status.',
+                                ('endpoint', 'method', 'status'))
+        self.latency = Histogram('http_request_duration_seconds', 'Time to produce the response, by endpoint.',
+                                 ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.request_queries = Histogram('http_request_db_queries', 'SQL queries run per request, by endpoint.',
+                                         ('endpoint',), QUERY_COUNT_BUCKETS)
+        self.query_duration = Histogram('db_query_duration_seconds', 'SQL query time, by endpoint.',
+                                        ('endpoint',), QUERY_DURATION_BUCKETS)
+        self.render_phases = Histogram('pdf_render_phase_seconds', 'PDF build time by report kind and phase.',
+                                       ('kind', 'phase'), RENDER_BUCKETS)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_TOKEN', None)
+        app.extensions['metrics'] = self
+        self.app = app
+        if not app.config['METRICS_ENABLED']:
+            return
+        listen_for_queries()
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+
+    def _after_request(self, response):
+        self._finish(response.status_code)
+        return response
+
+    def _teardown_request(self, exception=None):
+        # after_request is skipped when a view raises, so record the 500 here
+        if exception is not None:
+            self._finish(500)
+
+    def _finish(self, status):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return
+        endpoint = request.endpoint or 'unmatched'
+        self.requests.inc(endpoint, request.method, str(status))
+        self.latency.observe(time.perf_counter() - start, endpoint, request.method)
+        self.request_queries.observe(g.pop('metrics_queries', 0), endpoint)
+
+    def record_query(self, duration):
+        endpoint = NO_REQUEST
+        if has_request_context():
+            endpoint = request.endpoint or 'unmatched'
+            if 'metrics_queries' in g:
+                g.metrics_queries += 1
+        self.query_duration.observe(duration, endpoint)
+
+    def record_render(self, kind, phases):
+        """
+        Record the phase timings of one PDF build.
+
+        Args:
+            kind (str): 'assessment' or 'cohort'
+            phases (dict): {phase: seconds} as returned by the build functions
+        """
+        for phase, seconds in (phases or {}).items():
+            self.render_phases.observe(seconds, kind, phase)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in (self.requests, self.latency, self.request_queries, self.query_duration, self.render_phases):
+            lines.extend(metric.render())
+        lines.extend(self._scrape_time_metrics())
+        return '\n'.join(lines) + '\n'
+
+    def _scrape_time_metrics(self):
+        lines = []
+        cache = self.app.extensions.get('shared_cache')
+        if cache is not None:
+            stats = cache.stats()
+            samples = [
+                ({'namespace': namespace, 'result': result}, counters[result])
+                for namespace, counters in stats.items()
+                for result in ('hits', 'misses', 'sets', 'errors')
+            ]
+            lines.extend(sampled('cache_operations_total', 'Shared cache operations by namespace and result.',
+                                 'counter', samples))
+        queue = self.app.extensions.get('report_queue')
+        if queue is not None:
+            try:
+                pending = queue.pending_count()
+            except Exception as e:
+                logging.warning(f"Could not count pending report jobs: {type(e).__name__}: {str(e)}")
+            else:
+                lines.extend(sampled('report_jobs_pending', 'Report jobs waiting or rendering.', 'gauge', [({}, pending)]))
+        return lines
+
+
+def record_render(kind, phases):
+    """Record PDF phase timings on the current app's metrics, if any."""
+    if not has_app_context():
+        return
+    metrics = current_app.extensions.get('metrics')
+    if metrics is not None and current_app.config['METRICS_ENABLED']:
+        metrics.record_render(kind, phases)
+
+
+_listening = False
+
+
+def listen_for_queries():
+    """Time every SQL statement on every engine; registered once per process."""
+    global _listening
+    if _listening:
+        return
+    _listening = True
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_metrics_start', None)
+        if start is None or not has_app_context():
+            return
+        metrics = current_app.extensions.get('metrics')
+        if metrics is not None and current_app.config['METRICS_ENABLED']:
+            metrics.record_query(time.perf_counter() - start)
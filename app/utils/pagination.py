@@ -0,0 +1,35 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(completed_at, row_id):
+    """
+    Opaque keyset cursor for the row a page ended on.
+
+    Args:
+        completed_at (datetime): Naive UTC sort key of the last row
+        row_id (int): Id of the last row, the tie-breaker
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = f"{completed_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Reverse encode_cursor.
+
+    Returns:
+        tuple: (completed_at, row_id)
+
+    Raises:
+        ValueError: The cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        completed_at, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(completed_at), int(row_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -1,11 +1,7 @@
+import logging
 import os
-from datetime import datetime
+import time
 from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')  # Use Agg backend for non-GUI environments
-import matplotlib.pyplot as plt
-import numpy as np
-
 from flask import current_app
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, letter
@@ -14,6 +10,10 @@ from reportlab.lib.units import inch, mm
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
 from reportlab.lib.colors import HexColor
 
+from app.utils.metrics import record_render
+from app.utils.render_pool import CHART_BACKENDS, cohort_payload, render_cohort_report, report_payload
+from app.utils.report_cache import report_fingerprint
+
 def create_radar_chart(categories, scores, max_score=5):
     """
     Create a radar chart for the assessment scores.
@@ -46,48 +46,9 @@ def create_radar_chart(categories, scores, max_score=5):
             print("Error: Invalid score values")
             return None
             
-        # Format category labels
-        categories = [cat.replace('_', ' ').title() for cat in categories]
-            
-        # Set up the plot with a default style
-        plt.style.use('default')  # Use default style instead of dark_background
-        fig = plt.figure(figsize=(8, 8), facecolor='none')  # Transparent background
-        ax = fig.add_subplot(111, projection='polar')
-        
-        # Calculate angles for the radar chart
-        num_vars = len(categories)
-        angles = np.linspace(0, 2*np.pi, num_vars, endpoint=False)
-        
-        # Close the plot by appending first value
-        scores = np.array(scores)
-        scores = np.concatenate((scores, [scores[0]]))
-        angles = np.concatenate((angles, [angles[0]]))
-        
-        # Plot data with enhanced styling
-        ax.plot(angles, scores, 'o-', linewidth=2.5, color='#9370DB', label='Scores')
-        ax.fill(angles, scores, alpha=0.25, color='#9370DB')
-        
-        # Set chart properties
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(categories, color='black', size=10)  # Black text for better visibility
-        ax.set_ylim(0, max_score)
-        
-        # Customize grid
-        ax.grid(True, color='gray', alpha=0.3)
-        ax.spines['polar'].set_color('gray')
-        ax.tick_params(axis='y', colors='black')  # Black text for better visibility
-        
-        # Add title
-        plt.title('Assessment Results', pad=20, color='black', size=14)  # Black text for better visibility
-        
-        # Save plot to bytes buffer
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight', dpi=150,
-                   facecolor='none', edgecolor='none', transparent=True)  # Transparent background
-        buffer.seek(0)
-        plt.close(fig)
-        
-        return buffer
+        # Axes, rings and labels come from the cached template; only the scores are drawn
+        from app.utils.chart_templates import get_chart_template
+        return get_chart_template('radar', tuple(categories), max_score).render(scores)
         
     except Exception as e:
         print(f"Error creating radar chart: {str(e)}")
@@ -99,217 +60,379 @@ def create_bar_chart(categories, scores, max_score=5):
         if not categories or not scores:
             return None
             
-        categories = [cat.replace('_', ' ').title() for cat in categories]
-        
-        plt.style.use('dark_background')
-        fig, ax = plt.subplots(figsize=(10, 6), facecolor='#1a1a1a')
-        
-        x = np.arange(len(categories))
-        bars = ax.bar(x, scores, color='#9370DB', alpha=0.7)
-        
-        ax.set_ylim(0, max_score)
-        ax.set_xticks(x)
-        ax.set_xticklabels(categories, rotation=45, ha='right', color='white')
-        
-        ax.grid(True, axis='y', alpha=0.3)
-        ax.set_axisbelow(True)
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}', ha='center', va='bottom', color='white')
-        
-        plt.title('Assessment Results', pad=20, color='white', size=14)
-        plt.tight_layout()
-        
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight', dpi=150,
-                   facecolor='#1a1a1a', edgecolor='none')
-        buffer.seek(0)
-        plt.close(fig)
-        
-        return buffer
+        from app.utils.chart_templates import get_chart_template
+        scores = [float(score) for score in scores]
+        return get_chart_template('bar', tuple(categories), max_score).render(scores)
         
     except Exception as e:
         print(f"Error creating bar chart: {str(e)}")
         return None
 
+def create_chart(visualization_type, category_scores, max_score, backend='matplotlib'):
+    """
+    Create the results chart as a platypus flowable.
+
+    Args:
+        visualization_type (str): The 'visualization' key of the assessment type
+        category_scores (dict): Category name to score
+        max_score (int): Maximum possible score for any category
+        backend (str): One of CHART_BACKENDS
+
+    Returns:
+        Flowable: Chart to add to the story, or None if it could not be drawn
+    """
+    if backend not in CHART_BACKENDS:
+        raise ValueError(f"Unknown chart backend {backend!r}, expected one of {', '.join(CHART_BACKENDS)}")
+    categories = list(category_scores.keys())
+    scores = list(category_scores.values())
+
+    if backend == 'reportlab':
+        from app.utils.vector_charts import create_vector_chart
+        return create_vector_chart(visualization_type, categories, scores, max_score)
+
+    if visualization_type == 'radar':
+        chart_buffer = create_radar_chart(categories, scores, max_score)
+    else:  # bar chart
+        chart_buffer = create_bar_chart(categories, scores, max_score)
+    if not chart_buffer:
+        return None
+
+    img = Image(chart_buffer)
+    # Adjust size based on chart type
+    if visualization_type == 'radar':
+        img.drawHeight = 140*mm  # Make radar chart slightly larger
+        img.drawWidth = 140*mm
+    else:
+        img.drawHeight = 120*mm
+        img.drawWidth = 160*mm
+    return img
+
+# Bump whenever the report layout changes so cached PDFs are rebuilt
+REPORT_TEMPLATE_VERSION = 2
+COHORT_TEMPLATE_VERSION = 2
+
+def report_key(assessment_id, category_scores, interpretation, chart_backend):
+    """Report cache key of an assessment's PDF report."""
+    return report_fingerprint(assessment_id, category_scores, interpretation,
+                              f"{REPORT_TEMPLATE_VERSION}-{chart_backend}")
+
 def generate_pdf_report(assessment, user, assessment_info, category_scores, interpretation):
-    """Generate a PDF report for the assessment results."""
+    """
+    Get the PDF report for the assessment results, rendering it only on a cache miss.
+
+    Returns:
+        str: File name of the report inside the report cache, or None on failure
+    """
     try:
-        # Create directory if it doesn't exist
-        output_dir = os.path.join(current_app.root_path, 'static', 'pdfs')
-        os.makedirs(output_dir, exist_ok=True)
-        print(f"PDF output directory: {output_dir}")
-        
-        # Use predefined abbreviations for assessment types
-        assessment_abbreviations = {
-            'lsi': 'LSI',
-            'oci': 'OCI',
-            'lpi': 'LPI',
-            'influence': 'ISP'
-        }
-        
-        # Get the correct abbreviation or fallback to cleaned name if not found
-        assessment_abbr = assessment_abbreviations.get(assessment.assessment_type)
-        if not assessment_abbr:
-            # Fallback to previous logic if type not found
-            clean_name = (assessment_info['name']
-                         .replace('(', '')
-                         .replace(')', '')
-                         .replace('Leadership', '')
-                         .strip())
-            assessment_abbr = ''.join(word[0].upper() for word in clean_name.split())
-            
-        timestamp = datetime.now().strftime('%d%b%y')  # Format: 30Apr25
-        filename = f"{assessment_abbr}_{timestamp}.pdf"
-        filepath = os.path.join(output_dir, filename)
-        print(f"Generating PDF at: {filepath}")
-        
-        # Create the PDF document with A4 size and custom margins
-        doc = SimpleDocTemplate(
-            filepath,
-            pagesize=A4,
-            rightMargin=30*mm,
-            leftMargin=30*mm,
-            topMargin=30*mm,
-            bottomMargin=30*mm
-        )
-        
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=10*mm,
-            alignment=1,  # Center alignment
-            textColor=HexColor('#333333')
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceBefore=8*mm,
-            spaceAfter=4*mm,
-            textColor=HexColor('#444444')
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceBefore=2*mm,
-            spaceAfter=2*mm,
-            leading=14,
-            textColor=HexColor('#333333')
-        )
-        
-        # Title with assessment name
-        story.append(Paragraph(assessment_info['name'], title_style))
-        
-        # User Information Table
-        user_data = [
-            ["Name:", user.name],
-            ["Date:", assessment.completed_at.strftime('%B %d, %Y')],
-            ["Email:", user.email if hasattr(user, 'email') else 'N/A']
-        ]
-        
-        user_table = Table(user_data, colWidths=[80, 300])
-        user_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#333333')),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(user_table)
-        story.append(Spacer(1, 10*mm))
-        
-        # Results visualization - always use the same type as specified in assessment_info
-        visualization_type = assessment_info.get('visualization', 'radar')  # Default to radar if not specified
-        print(f"Using visualization type: {visualization_type}")
-        
-        if visualization_type == 'radar':
-            chart_buffer = create_radar_chart(
-                list(category_scores.keys()),
-                list(category_scores.values()),
-                assessment_info['max_score']
-            )
-        else:  # bar chart
-            chart_buffer = create_bar_chart(
-                list(category_scores.keys()),
-                list(category_scores.values()),
-                assessment_info['max_score']
-            )
-            
-        if chart_buffer:
-            img = Image(chart_buffer)
-            # Adjust size based on chart type
-            if visualization_type == 'radar':
-                img.drawHeight = 140*mm  # Make radar chart slightly larger
-                img.drawWidth = 140*mm
-            else:
-                img.drawHeight = 120*mm
-                img.drawWidth = 160*mm
-            story.append(img)
-        
-        story.append(Spacer(1, 5*mm))
-        
-        # Category Scores Table
-        story.append(Paragraph("Detailed Scores", heading_style))
-        data = [["Category", "Score"]]
-        for category, score in category_scores.items():
-            category_name = category.replace('_', ' ').title()
-            data.append([
-                category_name,
-                f"{score:.1f}"
-            ])
-        
-        table = Table(data, colWidths=[300, 100])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#444444')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), HexColor('#333333')),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ]))
-        story.append(table)
-        
-        # Assessment Interpretation
-        story.append(Spacer(1, 10*mm))
-        story.append(Paragraph("Your Assessment Insight", heading_style))
-        story.append(Paragraph(interpretation, normal_style))
-        
-        # Build the PDF
-        doc.build(story)
+        cache = current_app.extensions['report_cache']
+        chart_backend = current_app.config.get('CHART_BACKEND', 'matplotlib')
+        key = report_key(assessment.id, category_scores, interpretation, chart_backend)
+        filename = cache.get(key)
+        if filename:
+            return filename
+
+        phases = {}
+        # Build in the render pool's worker processes when it is enabled
+        pool = current_app.extensions.get('render_pool')
+        if pool is not None and pool.enabled:
+            report = report_payload(assessment, user, assessment_info, category_scores,
+                                    interpretation, chart_backend)
+            filename = cache.put(key, lambda filepath: phases.update(pool.render(filepath, report)))
+        else:
+            filename = cache.put(key, lambda filepath: phases.update(build_pdf_report(
+                filepath, assessment, user, assessment_info, category_scores, interpretation,
+                chart_backend=chart_backend
+            )))
+        record_render('assessment', phases)
+        return filename
+
+    except Exception as e:
+        logging.error(f"Error generating PDF report: {type(e).__name__}: {str(e)}")
+        return None
+
+def get_report_styles():
+    """Paragraph styles shared by the PDF reports: (title, heading, body text)."""
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=10*mm,
+        alignment=1,  # Center alignment
+        textColor=HexColor('#333333')
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceBefore=8*mm,
+        spaceAfter=4*mm,
+        textColor=HexColor('#444444')
+    )
+    
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceBefore=2*mm,
+        spaceAfter=2*mm,
+        leading=14,
+        textColor=HexColor('#333333')
+    )
+    
+    return title_style, heading_style, normal_style
+
+def build_pdf_report(filepath, assessment, user, assessment_info, category_scores, interpretation,
+                     chart_backend='matplotlib'):
+    """
+    Render the PDF report for the assessment results to filepath.
+
+    Returns:
+        dict: Seconds spent per phase: 'chart', 'layout' (building the story and
+        laying out the pages in memory) and 'write' (saving the file)
+    """
+    print(f"Generating PDF at: {filepath}")
+    start = time.perf_counter()
+    # Create the PDF document with A4 size and custom margins, laid out in memory
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=30*mm,
+        leftMargin=30*mm,
+        topMargin=30*mm,
+        bottomMargin=30*mm
+    )
+    
+    title_style, heading_style, normal_style = get_report_styles()
+    story = []
+    
+    # Title with assessment name
+    story.append(Paragraph(assessment_info['name'], title_style))
+    
+    # User Information Table
+    user_data = [
+        ["Name:", user.name],
+        ["Date:", assessment.completed_at.strftime('%B %d, %Y')],
+        ["Email:", user.email if hasattr(user, 'email') else 'N/A']
+    ]
+    
+    user_table = Table(user_data, colWidths=[80, 300])
+    user_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#333333')),
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    story.append(user_table)
+    story.append(Spacer(1, 10*mm))
+    
+    # Results visualization - always use the same type as specified in assessment_info
+    visualization_type = assessment_info.get('visualization', 'radar')  # Default to radar if not specified
+    print(f"Using visualization type: {visualization_type} ({chart_backend} backend)")
+    
+    chart_start = time.perf_counter()
+    chart = create_chart(visualization_type, category_scores, assessment_info['max_score'], chart_backend)
+    chart_seconds = time.perf_counter() - chart_start
+    if chart:
+        story.append(chart)
+    
+    story.append(Spacer(1, 5*mm))
+    
+    # Category Scores Table
+    story.append(Paragraph("Detailed Scores", heading_style))
+    data = [["Category", "Score"]]
+    for category, score in category_scores.items():
+        category_name = category.replace('_', ' ').title()
+        data.append([
+            category_name,
+            f"{score:.1f}"
+        ])
+    
+    table = Table(data, colWidths=[300, 100])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#444444')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), HexColor('#333333')),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 11),
+        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+    ]))
+    story.append(table)
+    
+    # Assessment Interpretation
+    story.append(Spacer(1, 10*mm))
+    story.append(Paragraph("Your Assessment Insight", heading_style))
+    story.append(Paragraph(interpretation, normal_style))
+    
+    # Build the PDF
+    doc.build(story)
+    return finish_pdf(buffer, filepath, start, chart_seconds)
+
+def finish_pdf(buffer, filepath, start, chart_seconds):
+    """Write a PDF laid out into buffer to filepath and return the phase timings."""
+    layout_seconds = time.perf_counter() - start - chart_seconds
+    write_start = time.perf_counter()
+    with open(filepath, 'wb') as f:
+        f.write(buffer.getbuffer())
+    phases = {'chart': chart_seconds, 'layout': layout_seconds, 'write': time.perf_counter() - write_start}
+    print(f"PDF report generated successfully, {os.path.getsize(filepath)} bytes")
+    return phases
+
+def generate_cohort_pdf_report(cohort, assessment_type, stats, member_count):
+    """
+    Get the cohort summary PDF for one assessment type, rendering it only on a cache miss.
+    
+    Args:
+        cohort (Cohort): The cohort being reported
+        assessment_type (str): Key of ASSESSMENT_TYPES
+        stats (list): CategoryStats of the cohort for that type
+        member_count (int): Number of cohort members
         
-        # Verify the file was created
-        if os.path.exists(filepath):
-            print(f"PDF report generated successfully at {filepath}")
-            print(f"File size: {os.path.getsize(filepath)} bytes")
-            return filename  # Return just the filename, not the full path
+    Returns:
+        str: File name of the report inside the report cache, or None on failure
+    """
+    from app.models.assessment import ASSESSMENT_TYPES
+    
+    try:
+        cache = current_app.extensions['report_cache']
+        chart_backend = current_app.config.get('CHART_BACKEND', 'matplotlib')
+        assessment_info = ASSESSMENT_TYPES[assessment_type]
+        # The aggregates are the whole content, so they address the cached file
+        summary = {}
+        for stat in stats:
+            summary[f'{stat.category}.count'] = stat.count
+            summary[f'{stat.category}.mean'] = stat.mean
+            summary[f'{stat.category}.std'] = stat.std
+        summary['members'] = member_count
+        key = report_fingerprint(f'cohort-{cohort.id}-{assessment_type}', summary, cohort.name,
+                                 f"{COHORT_TEMPLATE_VERSION}-cohort-{chart_backend}")
+        filename = cache.get(key)
+        if filename:
+            return filename
+        
+        phases = {}
+        # Off the request worker, like the assessment reports, when the render pool is enabled
+        pool = current_app.extensions.get('render_pool')
+        if pool is not None and pool.enabled:
+            report = cohort_payload(cohort.name, assessment_info, stats, member_count, chart_backend)
+            filename = cache.put(key, lambda filepath: phases.update(
+                pool.render(filepath, report, render_cohort_report)))
         else:
-            print(f"Error: PDF file not found after generation at {filepath}")
-            return None
+            filename = cache.put(key, lambda filepath: phases.update(build_cohort_pdf_report(
+                filepath, cohort.name, assessment_info, stats, member_count, chart_backend=chart_backend
+            )))
+        record_render('cohort', phases)
+        return filename
         
     except Exception as e:
-        print(f"Error generating PDF report: {str(e)}")
+        logging.error(f"Error generating cohort PDF report: {type(e).__name__}: {str(e)}")
         return None
 
+def build_cohort_pdf_report(filepath, cohort_name, assessment_info, stats, member_count,
+                            chart_backend='matplotlib'):
+    """Render the cohort summary PDF for one assessment type to filepath; returns the phase timings."""
+    start = time.perf_counter()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=30*mm,
+        leftMargin=30*mm,
+        topMargin=30*mm,
+        bottomMargin=30*mm
+    )
+    
+    title_style, heading_style, normal_style = get_report_styles()
+    story = []
+    
+    story.append(Paragraph(assessment_info['name'], title_style))
+    
+    assessments_counted = max((stat.count for stat in stats), default=0)
+    # No date: the file is cached by its aggregates and served unchanged on later days
+    info_data = [
+        ["Cohort:", cohort_name],
+        ["Members:", str(member_count)],
+        ["Assessments:", str(assessments_counted)]
+    ]
+    info_table = Table(info_data, colWidths=[90, 290])
+    info_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#333333')),
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    story.append(info_table)
+    story.append(Spacer(1, 10*mm))
+    
+    # Chart of the cohort's mean scores
+    means = {stat.category: min(max(stat.mean, 0), assessment_info['max_score']) for stat in stats}
+    chart_start = time.perf_counter()
+    chart = create_chart(assessment_info.get('visualization', 'radar'), means,
+                         assessment_info['max_score'], chart_backend)
+    chart_seconds = time.perf_counter() - chart_start
+    if chart:
+        story.append(chart)
+    story.append(Spacer(1, 5*mm))
+    
+    story.append(Paragraph("Cohort Scores", heading_style))
+    data = [["Category", "Mean", "Std Dev", "N"]]
+    for stat in stats:
+        data.append([
+            stat.category.replace('_', ' ').title(),
+            f"{stat.mean:.2f}",
+            f"{stat.std:.2f}",
+            str(stat.count)
+        ])
+    table = Table(data, colWidths=[220, 70, 70, 60])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#444444')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), HexColor('#333333')),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ]))
+    story.append(table)
+    
+    # Strongest and weakest categories on average
+    ranked = sorted((stat for stat in stats if stat.count), key=lambda stat: stat.mean, reverse=True)
+    if len(ranked) >= 2:
+        story.append(Spacer(1, 10*mm))
+        story.append(Paragraph("Cohort Insight", heading_style))
+        highest = ' and '.join(stat.category.replace('_', ' ').title() for stat in ranked[:2])
+        lowest = ' and '.join(stat.category.replace('_', ' ').title() for stat in ranked[-2:])
+        story.append(Paragraph(
+            f"Across the cohort, the highest average scores are in {highest}, "
+            f"and the lowest are in {lowest}.",
+            normal_style
+        ))
+    
+    doc.build(story)
+    return finish_pdf(buffer, filepath, start, chart_seconds)
+
 def get_score_interpretation(score):
     """Get a concise interpretation of the score."""
     if score >= 4.5:
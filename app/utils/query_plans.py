@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event
+
+
+@contextmanager
+def capture_statements(engine):
+    """Collect (statement, parameters) of every query run on the engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def full_scans(plan):
+    """
+    Steps of an SQLite query plan that read a whole table.
+
+    "SCAN table" without an index is a full scan; "SCAN table USING INDEX ..."
+    walks an index in order and "SEARCH ..." is an index lookup, so both pass.
+    """
+    scans = []
+    for row in plan:
+        detail = row[-1]
+        if detail.startswith('SCAN ') and 'USING' not in detail and 'CONSTANT ROW' not in detail:
+            scans.append(detail)
+    return scans
+
+
+def hot_queries():
+    """
+    Read queries behind the request paths, as (name, callable) pairs.
+
+    Each callable issues the same SQL as its route does; the values are
+    placeholders, as the plan does not depend on them.
+    """
+    from sqlalchemy.orm import joinedload
+    from app import db, report_queue
+    from app.models.assessment import Assessment, AssessmentResult, Question, QuestionCatalogVersion
+    from app.models.cohort import CohortAggregate, CohortMember
+    from app.models.percentile import ScoreHistogram
+    from app.models.report import ReportJob
+    from app.models.user import User
+
+    return [
+        ('login: user by email', lambda: User.query.filter_by(email='someone@example.com').first()),
+        ('question catalog version', QuestionCatalogVersion.current),
+        ('questions of one type', lambda: Question.query.filter_by(assessment_type='lsi').all()),
+        ('results: assessment with snapshot',
+         lambda: Assessment.query.options(joinedload(Assessment.result)).get(1)),
+        ('results: snapshot by assessment', lambda: AssessmentResult.query.filter_by(assessment_id=1).first()),
+        ('category score totals', lambda: Assessment.get_category_totals([1, 2])),
+        ('history: first page', lambda: Assessment.history_page(1)),
+        ('history: next page', lambda: Assessment.history_page(1, after=(datetime.utcnow(), 10))),
+        ('percentiles', lambda: ScoreHistogram.percentiles('lsi', {'achievement': 3.0}, overall=3.0)),
+        ('results etag: owner and type', lambda: db.session.query(Assessment.user_id, Assessment.assessment_type)
+         .filter(Assessment.id == 1).first()),
+        ('results etag: percentile sample', lambda: ScoreHistogram.sample_size('lsi')),
+        ('report job by assessment', lambda: ReportJob.query.filter_by(assessment_id=1).first()),
+        ('report download', lambda: ReportJob.query.filter_by(filename='report.pdf', user_id=1).first()),
+        ('pending report jobs', report_queue.pending_count),
+        ('submit: cohorts of the user', lambda: CohortMember.query.filter_by(user_id=1).all()),
+        ('cohort dashboard: aggregates', lambda: CohortAggregate.query.filter_by(cohort_id=1).all()),
+        ('cohort dashboard: members', lambda: CohortMember.query.filter_by(cohort_id=1).options(
+            joinedload(CohortMember.user)).order_by(CohortMember.joined_at.desc()).limit(50).all()),
+    ]
+
+
+def explain_hot_queries(db):
+    """
+    Run EXPLAIN QUERY PLAN on every hot query.
+
+    Args:
+        db (SQLAlchemy): The app's database; it must be SQLite
+
+    Returns:
+        list: (name, statement, full scan steps) for each statement issued
+    """
+    if db.engine.dialect.name != 'sqlite':
+        raise RuntimeError(f"EXPLAIN QUERY PLAN needs SQLite, not {db.engine.dialect.name}")
+
+    # The question catalog is read whole once per version, not per request
+    current_app.extensions['question_catalog'].get()
+
+    results = []
+    for name, run in hot_queries():
+        with capture_statements(db.engine) as statements:
+            run()
+        connection = db.session.connection()
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+            results.append((name, statement, full_scans(plan)))
+    db.session.rollback()
+    return results
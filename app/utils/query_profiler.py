@@ -0,0 +1,217 @@
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Same statement this many times in one request (or profiled block) is flagged as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `IN (?, ?, ?)` lists differ only in length from call to call
+_IN_LIST = re.compile(r'IN \((?:\?|%\(\w+\)s|%s)(?:, (?:\?|%\(\w+\)s|%s))*\)')
+
+
+def normalize(statement):
+    """Statement text with whitespace collapsed and IN lists of any length made equal."""
+    return _IN_LIST.sub('IN (...)', ' '.join(statement.split()))
+
+
+def call_site():
+    """The innermost frame in the app's own code (not this module), as 'path:line in function'."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename != __file__:
+            lineno = frame.f_lineno
+            # Compiled Jinja templates run under the template's file name; map back to its line
+            template = frame.f_globals.get('__jinja_template__')
+            if template is not None:
+                lineno = template.get_corresponding_lineno(lineno)
+            return f"{os.path.relpath(filename, os.path.dirname(APP_DIR))}:{lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryGroup:
+    """Every execution of one normalized statement."""
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.count = 0
+        self.seconds = 0.0
+        self.sites = {}
+
+    def add(self, seconds, site):
+        self.count += 1
+        self.seconds += seconds
+        self.sites[site] = self.sites.get(site, 0) + 1
+
+
+class QueryProfile:
+    """Statements run in one request or profiled block, grouped by normalized text."""
+
+    def __init__(self, label=None):
+        self.label = label
+        self.groups = {}
+
+    def record(self, statement, seconds, site):
+        key = normalize(statement)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = QueryGroup(key)
+        group.add(seconds, site)
+
+    @property
+    def count(self):
+        return sum(group.count for group in self.groups.values())
+
+    @property
+    def seconds(self):
+        return sum(group.seconds for group in self.groups.values())
+
+    def n_plus_one(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """Groups run at least threshold times, most repeated first."""
+        return sorted((group for group in self.groups.values() if group.count >= threshold),
+                      key=lambda group: group.count, reverse=True)
+
+    def report(self, limit=10):
+        """Human-readable summary: totals, then the most frequent statements with their call sites."""
+        lines = [f"{self.label or 'profile'}: {self.count} queries in {self.seconds * 1000:.1f} ms, "
+                 f"{len(self.groups)} distinct"]
+        for group in sorted(self.groups.values(), key=lambda group: group.count, reverse=True)[:limit]:
+            statement = group.statement if len(group.statement) <= 120 else group.statement[:117] + '...'
+            lines.append(f"  {group.count:>4}x {group.seconds * 1000:>7.1f} ms  {statement}")
+            for site, count in sorted(group.sites.items(), key=lambda item: item[1], reverse=True)[:3]:
+                lines.append(f"         {count:>4}x from {site}")
+        return '\n'.join(lines)
+
+
+def _listen(target, on_query):
+    """Hook before/after_cursor_execute on target; returns a function that removes the hooks."""
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._profiler_start = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_profiler_start', None)
+        on_query(statement, time.perf_counter() - start if start is not None else 0.0)
+
+    event.listen(target, 'before_cursor_execute', before_cursor_execute)
+    event.listen(target, 'after_cursor_execute', after_cursor_execute)
+
+    def remove():
+        event.remove(target, 'before_cursor_execute', before_cursor_execute)
+        event.remove(target, 'after_cursor_execute', after_cursor_execute)
+    return remove
+
+
+@contextmanager
+def profile_queries(target=Engine, label=None, all_threads=False):
+    """
+    Profile every query run inside the block.
+
+    Args:
+        target: Engine to watch; by default every engine in the process
+        label (str): Name shown in the report
+        all_threads (bool): Also count queries from other threads, such as the
+            report workers; by default only the calling thread's are counted
+
+    Yields:
+        QueryProfile: Filled in as queries run
+    """
+    profile = QueryProfile(label)
+    owner = threading.get_ident()
+
+    def on_query(statement, seconds):
+        if all_threads or threading.get_ident() == owner:
+            profile.record(statement, seconds, call_site())
+
+    remove = _listen(target, on_query)
+    try:
+        yield profile
+    finally:
+        remove()
+
+
+@contextmanager
+def assert_max_queries(max_queries, target=Engine, label=None, n_plus_one=None):
+    """
+    Fail with AssertionError when the block runs more than max_queries queries.
+
+    Meant for tests, e.g. `with assert_max_queries(6, label='history'):
+    client.get('/assessment/history')`. The error message carries the
+    profile report, so it names the repeated statements and where they ran.
+
+    Args:
+        max_queries (int): Highest allowed number of queries
+        target: Engine to watch; by default every engine in the process
+        label (str): Name shown in the failure message
+        n_plus_one (int): Also fail when one statement runs this many times or more
+
+    Yields:
+        QueryProfile
+    """
+    with profile_queries(target, label) as profile:
+        yield profile
+    if profile.count > max_queries:
+        raise AssertionError(f"{profile.count} queries, expected at most {max_queries}\n{profile.report()}")
+    repeated = profile.n_plus_one(n_plus_one) if n_plus_one else []
+    if repeated:
+        raise AssertionError(f"N+1 pattern: {repeated[0].count}x {repeated[0].statement}\n{profile.report()}")
+
+
+class QueryProfiler:
+    """
+    Per-request query profiling for development.
+
+    With QUERY_PROFILER_ENABLED, every request is profiled: the response gets
+    an X-Query-Count header, and a statement repeated QUERY_PROFILER_N_PLUS_ONE
+    times or more is logged as a likely N+1 with the route and the code that
+    issued it. Costs a stack walk per query, so leave it off in production.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._remove = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_PROFILER_ENABLED', False)
+        app.config.setdefault('QUERY_PROFILER_N_PLUS_ONE', N_PLUS_ONE_THRESHOLD)
+        app.extensions['query_profiler'] = self
+        self.app = app
+        if not app.config['QUERY_PROFILER_ENABLED']:
+            return
+        if self._remove is None:
+            self._remove = _listen(Engine, self._record)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    @staticmethod
+    def _record(statement, seconds):
+        if has_request_context() and 'query_profile' in g:
+            g.query_profile.record(statement, seconds, call_site())
+
+    @staticmethod
+    def _before_request():
+        g.query_profile = QueryProfile()
+
+    def _after_request(self, response):
+        profile = g.pop('query_profile', None)
+        if profile is None:
+            return response
+        profile.label = f"{request.method} {request.path} ({request.endpoint})"
+        response.headers['X-Query-Count'] = str(profile.count)
+        for group in profile.n_plus_one(self.app.config['QUERY_PROFILER_N_PLUS_ONE']):
+            sites = ', '.join(group.sites)
+            logging.warning(f"Possible N+1 in {profile.label}: {group.count}x {group.statement} from {sites}")
+        return response
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+
+class CatalogQuestion(namedtuple('CatalogQuestion', ['id', 'text', 'category', 'assessment_type'])):
+    """Read-only copy of a Question row that can be shared between requests."""
+    __slots__ = ()
+
+    def get_scale_label(self, value):
+        """Return the label for a given scale value."""
+        from app.models.assessment import ASSESSMENT_TYPES
+        return ASSESSMENT_TYPES[self.assessment_type]['scale'].get(value, str(value))
+
+
+class Catalog:
+    """Immutable snapshot of the question set at one catalog version."""
+
+    def __init__(self, version, questions):
+        self.version = version
+        by_type = {}
+        by_category = {}
+        for question in questions:
+            by_type.setdefault(question.assessment_type, []).append(question)
+            by_category.setdefault(question.assessment_type, {}).setdefault(question.category, []).append(question)
+        self.by_type = MappingProxyType({key: tuple(value) for key, value in by_type.items()})
+        self.by_id = MappingProxyType({question.id: question for question in questions})
+        self.by_category = MappingProxyType({
+            assessment_type: MappingProxyType({category: tuple(value) for category, value in categories.items()})
+            for assessment_type, categories in by_category.items()
+        })
+
+
+class QuestionCatalog:
+    """
+    Per-process cache of the assessment questions.
+
+    Questions only change when the database is seeded, so they are loaded once
+    into an immutable Catalog and shared by every request. Seeding bumps the
+    version stamp in ``question_catalog_version``; each process compares it with
+    the version it loaded at most every QUESTION_CATALOG_CHECK_INTERVAL seconds
+    and reloads the questions when it has moved.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._catalog = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUESTION_CATALOG_CHECK_INTERVAL', 30)
+        app.extensions['question_catalog'] = self
+        self.app = app
+
+    def get(self):
+        """
+        Get the current catalog, loading or reloading it if needed.
+
+        Returns:
+            Catalog: Snapshot of all questions
+        """
+        if self._is_fresh():
+            return self._catalog
+        with self._lock:
+            if self._is_fresh():
+                return self._catalog
+            from app.models.assessment import QuestionCatalogVersion
+
+            # Read the version before the rows: a reseed in between only causes an extra reload
+            version = QuestionCatalogVersion.current()
+            if self._catalog is None or self._catalog.version != version:
+                self._catalog = self._load(version)
+            self._checked_at = time.monotonic()
+            return self._catalog
+
+    def questions_for(self, assessment_type):
+        """Questions of an assessment type, in id order (an empty tuple if there are none)."""
+        return self.get().by_type.get(assessment_type, ())
+
+    def get_question(self, question_id):
+        """Look up a question by id, or None."""
+        return self.get().by_id.get(question_id)
+
+    def invalidate(self):
+        """Drop the cached catalog so the next access reloads it."""
+        with self._lock:
+            self._catalog = None
+
+    def _is_fresh(self):
+        interval = self.app.config['QUESTION_CATALOG_CHECK_INTERVAL']
+        return self._catalog is not None and time.monotonic() - self._checked_at < interval
+
+    def _load(self, version):
+        from app import shared_cache
+        from app.models.assessment import Question
+
+        def rows():
+            # None (not cached) rather than an empty list before the questions are seeded
+            return [tuple(row) for row in Question.query.with_entities(
+                Question.id, Question.text, Question.category, Question.assessment_type
+            ).order_by(Question.id).all()] or None
+
+        # The first process to load a version shares it with the others through the cache
+        questions = shared_cache.namespace('questions').get_or_set(version, rows) or []
+        return Catalog(version, [CatalogQuestion(*row) for row in questions])
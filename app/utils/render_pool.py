@@ -0,0 +1,208 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from types import SimpleNamespace
+
+# Chart backends: 'matplotlib' embeds a PNG, 'reportlab' draws vector graphics
+# and never imports matplotlib
+CHART_BACKENDS = ('matplotlib', 'reportlab')
+
+
+class RenderPoolFull(Exception):
+    """Raised when the render pool already has RENDER_POOL_MAX_PENDING jobs in flight."""
+
+
+def warm_worker(chart_backend):
+    """Pool initializer: import the report dependencies once per worker process."""
+    import reportlab.platypus  # noqa: F401
+    if chart_backend == 'matplotlib':
+        import matplotlib.font_manager
+        from app.utils import chart_templates  # noqa: F401
+        # Loading the font list is the slow part of the first matplotlib render
+        matplotlib.font_manager.findfont('DejaVu Sans')
+    else:
+        from app.utils import vector_charts  # noqa: F401
+
+
+def render_report(filepath, report):
+    """
+    Build a PDF report inside a worker process.
+
+    Args:
+        filepath (str): Where to write the PDF
+        report (dict): Plain, picklable report data, see report_payload()
+
+    Returns:
+        dict: Seconds spent per build phase, see build_pdf_report()
+    """
+    from app.utils.pdf_generator import build_pdf_report
+
+    assessment = SimpleNamespace(completed_at=report['completed_at'])
+    user = SimpleNamespace(name=report['user_name'], email=report['user_email'])
+    return build_pdf_report(
+        filepath, assessment, user,
+        report['assessment_info'], report['category_scores'], report['interpretation'],
+        chart_backend=report['chart_backend']
+    )
+
+
+def render_cohort_report(filepath, report):
+    """
+    Build a cohort summary PDF inside a worker process.
+
+    Args:
+        filepath (str): Where to write the PDF
+        report (dict): Plain, picklable report data, see cohort_payload()
+
+    Returns:
+        dict: Seconds spent per build phase
+    """
+    from app.utils.pdf_generator import build_cohort_pdf_report
+
+    stats = [SimpleNamespace(**stat) for stat in report['stats']]
+    return build_cohort_pdf_report(
+        filepath, report['cohort_name'], report['assessment_info'], stats, report['member_count'],
+        chart_backend=report['chart_backend']
+    )
+
+
+def report_payload(assessment, user, assessment_info, category_scores, interpretation, chart_backend):
+    """Copy what the PDF needs out of the ORM objects so it can be sent to another process."""
+    return {
+        'completed_at': assessment.completed_at,
+        'user_name': user.name,
+        'user_email': getattr(user, 'email', None) or 'N/A',
+        'assessment_info': dict(assessment_info),
+        'category_scores': dict(category_scores),
+        'interpretation': interpretation,
+        'chart_backend': chart_backend
+    }
+
+
+def cohort_payload(cohort_name, assessment_info, stats, member_count, chart_backend):
+    """Copy what the cohort PDF needs into plain data so it can be sent to another process."""
+    return {
+        'cohort_name': cohort_name,
+        'assessment_info': dict(assessment_info),
+        'stats': [stat._asdict() for stat in stats],
+        'member_count': member_count,
+        'chart_backend': chart_backend
+    }
+
+
+class RenderPool:
+    """
+    Process pool that runs the CPU-bound PDF build off the request workers.
+
+    matplotlib's pyplot state and ReportLab builds are not safe to interleave in
+    gevent or threaded workers, so each render runs in a warm worker process that
+    has already imported the chart and PDF libraries. At most
+    RENDER_POOL_MAX_PENDING jobs may be queued or running; callers that would go
+    over the limit wait up to RENDER_POOL_QUEUE_TIMEOUT and then get RenderPoolFull.
+    A job running longer than RENDER_JOB_TIMEOUT gets TimeoutError, and the pool
+    is recycled so the stuck process does not keep its slot.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RENDER_POOL_SIZE', 2)
+        app.config.setdefault('RENDER_POOL_MAX_PENDING', app.config['RENDER_POOL_SIZE'] * 4)
+        app.config.setdefault('RENDER_POOL_QUEUE_TIMEOUT', 5)
+        app.config.setdefault('RENDER_JOB_TIMEOUT', 60)
+        app.config.setdefault('RENDER_POOL_START_METHOD', 'spawn')
+        app.config.setdefault('CHART_BACKEND', 'matplotlib')
+        # A typo would otherwise fall back to matplotlib and end up in the report cache keys
+        if app.config['CHART_BACKEND'] not in CHART_BACKENDS:
+            raise ValueError(f"Unknown CHART_BACKEND {app.config['CHART_BACKEND']!r}, "
+                             f"expected one of {', '.join(CHART_BACKENDS)}")
+        app.extensions['render_pool'] = self
+        self.app = app
+        self._slots = threading.BoundedSemaphore(max(app.config['RENDER_POOL_MAX_PENDING'], 1))
+
+    @property
+    def enabled(self):
+        """False when RENDER_POOL_SIZE = 0 and reports are built in the calling thread."""
+        return self.app.config['RENDER_POOL_SIZE'] > 0
+
+    def render(self, filepath, report, renderer=render_report):
+        """
+        Build a PDF report in the pool and wait for it.
+
+        Args:
+            filepath (str): Where to write the PDF
+            report (dict): Report data from report_payload() or cohort_payload()
+            renderer: render_report, or render_cohort_report for a cohort payload
+
+        Returns:
+            dict: Seconds spent per build phase
+
+        Raises:
+            RenderPoolFull: Too many jobs are already waiting
+            TimeoutError: The job took longer than RENDER_JOB_TIMEOUT
+        """
+        future = self.submit(filepath, report, renderer)
+        try:
+            return future.result(timeout=self.app.config['RENDER_JOB_TIMEOUT'])
+        except TimeoutError:
+            logging.error(f"PDF render timed out after {self.app.config['RENDER_JOB_TIMEOUT']}s, recycling render pool")
+            self._recycle()
+            raise
+
+    def submit(self, filepath, report, renderer=render_report):
+        """Queue a PDF build and return its Future, applying backpressure when the pool is saturated."""
+        if not self._slots.acquire(timeout=self.app.config['RENDER_POOL_QUEUE_TIMEOUT']):
+            raise RenderPoolFull(f"{self.app.config['RENDER_POOL_MAX_PENDING']} render jobs already pending")
+        try:
+            future = self._get_executor().submit(renderer, filepath, report)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        return future
+
+    def warm_up(self):
+        """Start every worker process now rather than on the first report."""
+        executor = self._get_executor()
+        futures = [executor.submit(os.getpid) for _ in range(self.app.config['RENDER_POOL_SIZE'])]
+        return sorted({future.result() for future in futures})
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            # A forked child must not reuse the parent's pool
+            if self._executor is None or self._pid != os.getpid():
+                context = multiprocessing.get_context(self.app.config['RENDER_POOL_START_METHOD'])
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.app.config['RENDER_POOL_SIZE'],
+                    mp_context=context,
+                    initializer=warm_worker,
+                    initargs=(self.app.config.get('CHART_BACKEND', 'matplotlib'),)
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _recycle(self):
+        """Kill the current worker processes; the next submit starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # ProcessPoolExecutor cannot cancel a running job, so stop its processes directly
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
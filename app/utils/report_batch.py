@@ -0,0 +1,183 @@
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.models.assessment import Assessment, AssessmentResult, ASSESSMENT_TYPES
+from app.utils.export import filter_assessments
+from app.utils.pdf_generator import report_key
+from app.utils.render_pool import render_report, report_payload, warm_worker
+from app.utils.report_cache import report_download_name
+
+# Summary of a batch build
+BuildStats = namedtuple('BuildStats', ['total', 'rendered', 'cached', 'failed', 'seconds'])
+
+# Assessments loaded (and their outdated snapshots rescored) per query
+BATCH_SIZE = 200
+
+
+class ReportWriter:
+    """Collects finished PDFs into a directory, or into a zip file when the path ends in .zip."""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = None
+        if path.lower().endswith('.zip'):
+            parent = os.path.dirname(os.path.abspath(path))
+            os.makedirs(parent, exist_ok=True)
+            # PDFs are already compressed; storing them is much faster than deflating again
+            self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED)
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def add(self, source, name):
+        if self._zip is not None:
+            self._zip.write(source, name)
+            return
+        target = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target)
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+def batch_jobs(assessment_type=None, since=None, until=None, user_ids=None, chart_backend='matplotlib'):
+    """
+    Yield what each selected assessment's report needs, oldest assessment first.
+
+    Assessments are read in keyset-paginated batches with their snapshot and user
+    joined in. Missing or outdated snapshots are rescored and saved once per batch.
+
+    Yields:
+        tuple: (cache key, archive name, report payload)
+    """
+    last_id = 0
+    while True:
+        query = Assessment.query.options(
+            joinedload(Assessment.result), joinedload(Assessment.user)
+        ).filter(
+            Assessment.id > last_id,
+            Assessment.assessment_type.in_(list(ASSESSMENT_TYPES))
+        )
+        query = filter_assessments(query, assessment_type, since, until, user_ids)
+        assessments = query.order_by(Assessment.id).limit(BATCH_SIZE).all()
+        if not assessments:
+            return
+        last_id = assessments[-1].id
+
+        stale = [assessment for assessment in assessments
+                 if assessment.result is None or not assessment.result.is_current]
+        totals = Assessment.get_category_totals([assessment.id for assessment in stale])
+        for assessment in stale:
+            AssessmentResult.snapshot(assessment, totals[assessment.id], assessment.result)
+
+        # Copy everything out before the commit expires the ORM objects
+        jobs = []
+        for assessment in assessments:
+            assessment_info = ASSESSMENT_TYPES[assessment.assessment_type]
+            result = assessment.result
+            user_folder = secure_filename(assessment.user.email.replace('@', '_at_')) or str(assessment.user_id)
+            name = f"{user_folder}/{assessment.id}_{report_download_name(assessment, assessment_info)}"
+            jobs.append((
+                report_key(assessment.id, result.category_scores, result.interpretation, chart_backend),
+                name,
+                report_payload(assessment, assessment.user, assessment_info, result.category_scores,
+                               result.interpretation, chart_backend)
+            ))
+        if stale:
+            db.session.commit()
+        yield from jobs
+
+
+def build_reports(output, workers=None, assessment_type=None, since=None, until=None, user_ids=None,
+                  progress=None):
+    """
+    Render the PDF reports of many assessments in a process pool.
+
+    Reports already in the report cache are copied as they are; the rest are
+    built by warm worker processes, which keep their imports, fonts and chart
+    templates from one report to the next, and are stored in the cache too.
+    At most four jobs per worker are in flight, so memory stays flat however
+    many assessments match.
+
+    Args:
+        output (str): Directory to write the PDFs to, or a path ending in .zip
+        workers (int): Worker processes; defaults to the number of CPUs
+        assessment_type, since, until, user_ids: Filters, see filter_assessments
+        progress (callable): Called with the BuildStats so far after each report
+
+    Returns:
+        BuildStats: Counts and elapsed seconds
+    """
+    cache = current_app.extensions['report_cache']
+    chart_backend = current_app.config.get('CHART_BACKEND', 'matplotlib')
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    counts = {'total': 0, 'rendered': 0, 'cached': 0, 'failed': 0}
+
+    def stats():
+        return BuildStats(seconds=time.perf_counter() - start, **counts)
+
+    def finish(future, key, name, tmp_path):
+        try:
+            future.result()
+            cache_path = cache.path_for(cache.store(key, tmp_path))
+            writer.add(cache_path, name)
+            counts['rendered'] += 1
+        except Exception as e:
+            logging.error(f"Batch report {name} failed: {type(e).__name__}: {str(e)}")
+            counts['failed'] += 1
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if progress is not None:
+            progress(stats())
+
+    writer = ReportWriter(output)
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(current_app.config.get('RENDER_POOL_START_METHOD', 'spawn')),
+        initializer=warm_worker,
+        initargs=(chart_backend,)
+    )
+    in_flight = {}
+    try:
+        for key, name, report in batch_jobs(assessment_type, since, until, user_ids, chart_backend):
+            counts['total'] += 1
+            filename = cache.get(key)
+            if filename:
+                writer.add(cache.path_for(filename), name)
+                counts['cached'] += 1
+                if progress is not None:
+                    progress(stats())
+                continue
+
+            # Wait for a free slot before queueing more work
+            while len(in_flight) >= workers * 4:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future, *in_flight.pop(future))
+
+            tmp_path = cache.reserve()
+            in_flight[executor.submit(render_report, tmp_path, report)] = (key, name, tmp_path)
+
+        for future in list(in_flight):
+            finish(future, *in_flight.pop(future))
+    finally:
+        executor.shutdown(cancel_futures=True)
+        for _, _, tmp_path in in_flight.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        writer.close()
+        cache.evict()
+    return stats()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+
+def report_fingerprint(assessment_id, category_scores, interpretation, template_version):
+    """
+    Build the content address of a PDF report.
+
+    Args:
+        assessment_id (int): Assessment the report belongs to (or another unique subject key)
+        category_scores (dict): Category name to score
+        interpretation (str): Interpretation text printed in the report
+        template_version (int): Version of the PDF layout
+
+    Returns:
+        str: Hex SHA-256 digest identifying the rendered report
+    """
+    payload = json.dumps({
+        'assessment_id': assessment_id,
+        'category_scores': {category: float(score) for category, score in category_scores.items()},
+        'interpretation': interpretation,
+        'template_version': template_version
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def report_download_name(assessment, assessment_info):
+    """Human friendly file name for a report download, e.g. LSI_30Apr25.pdf."""
+    assessment_abbr = assessment_info.get('abbreviation')
+    if not assessment_abbr:
+        clean_name = (assessment_info['name']
+                     .replace('(', '')
+                     .replace(')', '')
+                     .replace('Leadership', '')
+                     .strip())
+        assessment_abbr = ''.join(word[0].upper() for word in clean_name.split())
+    timestamp = assessment.completed_at.strftime('%d%b%y')  # Format: 30Apr25
+    return f"{assessment_abbr}_{timestamp}.pdf"
+
+
+class ReportCache:
+    """
+    On-disk cache of rendered PDF reports addressed by their fingerprint.
+
+    Files are named ``<fingerprint>.pdf`` so different users and assessments never
+    collide, and a report is only rendered again when its content would change.
+    Entries unused for longer than REPORT_CACHE_MAX_AGE are dropped, and the least
+    recently used ones are dropped once the directory grows past REPORT_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, app=None):
+        self.directory = None
+        self.max_bytes = None
+        self.max_age = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REPORT_CACHE_DIR', os.path.join(app.instance_path, 'reports'))
+        app.config.setdefault('REPORT_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+        app.config.setdefault('REPORT_CACHE_MAX_AGE', 30 * 24 * 3600)
+        self.directory = app.config['REPORT_CACHE_DIR']
+        self.max_bytes = app.config['REPORT_CACHE_MAX_BYTES']
+        self.max_age = app.config['REPORT_CACHE_MAX_AGE']
+        app.extensions['report_cache'] = self
+
+    def path_for(self, filename):
+        """Absolute path of a cached report, or None for names outside the cache."""
+        if not filename or os.path.basename(filename) != filename or not filename.endswith('.pdf'):
+            return None
+        return os.path.join(self.directory, filename)
+
+    def exists(self, filename):
+        path = self.path_for(filename)
+        return path is not None and os.path.exists(path)
+
+    def get(self, key):
+        """
+        Look up a report by fingerprint.
+
+        Returns:
+            str: Cached filename, or None on a miss
+        """
+        filename = f"{key}.pdf"
+        path = self.path_for(filename)
+        try:
+            # Refresh the access time used for LRU eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return filename
+
+    def put(self, key, build):
+        """
+        Render a report into the cache.
+
+        Args:
+            key (str): Report fingerprint
+            build (callable): Called with a temporary path to write the PDF to
+
+        Returns:
+            str: Cached filename
+        """
+        tmp_path = self.reserve()
+        try:
+            build(tmp_path)
+            filename = self.store(key, tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+        return filename
+
+    def reserve(self):
+        """Create an empty temporary file in the cache directory for a report to be written to."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(fd)
+        return tmp_path
+
+    def store(self, key, tmp_path):
+        """
+        Move a finished report from a reserve() path into the cache, without evicting.
+
+        Returns:
+            str: Cached filename
+        """
+        filename = f"{key}.pdf"
+        # Atomic rename so readers never see a partially written file
+        os.replace(tmp_path, self.path_for(filename))
+        return filename
+
+    def evict(self):
+        """Remove expired reports, then the least recently used ones over the size budget."""
+        with self._lock:
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                return
+
+            now = time.time()
+            entries = []
+            for name in names:
+                if not name.endswith('.pdf'):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if self.max_age and now - stat.st_mtime > self.max_age:
+                    self._remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            if not self.max_bytes or total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            logging.info(f"Evicted cached report {os.path.basename(path)}")
+        except OSError:
+            pass
@@ -0,0 +1,297 @@
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+
+class ReportQueue:
+    """
+    Local worker pool that renders PDF reports in the background.
+
+    Jobs live in the ``report_job`` table, which deduplicates them per assessment and
+    lets pending work survive a restart; the in-memory queue only carries job ids.
+    Workers claim a job with a conditional UPDATE, so several gunicorn processes can
+    share the table without rendering the same report twice. Each process also runs a
+    sweeper that requeues jobs left behind by a worker that died, and a failed job is
+    tried again when its report is viewed after REPORT_JOB_FAILED_COOLDOWN.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue = queue.Queue()
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REPORT_WORKERS', 2)
+        app.config.setdefault('REPORT_JOB_MAX_ATTEMPTS', 3)
+        app.config.setdefault('REPORT_JOB_RETRY_DELAY', 5)
+        app.config.setdefault('REPORT_JOB_STALE_AFTER', 600)
+        app.config.setdefault('REPORT_JOB_FAILED_COOLDOWN', 900)
+        app.config.setdefault('REPORT_JOB_SWEEP_INTERVAL', 60)
+        app.extensions['report_queue'] = self
+        self.app = app
+
+    @property
+    def eager(self):
+        """True when jobs run inline in the calling request (REPORT_WORKERS = 0)."""
+        return self.app.config['REPORT_WORKERS'] <= 0
+
+    def enqueue(self, assessment_id, user_id):
+        """
+        Get the report job for an assessment, creating and scheduling it if needed.
+
+        Args:
+            assessment_id (int): Assessment the report is generated for
+            user_id (int): Owner of the assessment
+
+        Returns:
+            ReportJob: The existing or newly created job
+        """
+        from app import db
+        from app.models.report import ReportJob
+
+        job = ReportJob.query.filter_by(assessment_id=assessment_id).first()
+        if job is not None:
+            if self._needs_rerun(job):
+                self._rerun(job)
+            return job
+
+        job = ReportJob(assessment_id=assessment_id, user_id=user_id)
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request created the job first
+            db.session.rollback()
+            return ReportJob.query.filter_by(assessment_id=assessment_id).first()
+
+        self._schedule(job.id)
+        if self.eager:
+            db.session.refresh(job)
+        return job
+
+    def pending_count(self):
+        """Number of jobs waiting for or currently being rendered."""
+        from app.models.report import ReportJob
+
+        return ReportJob.query.filter(
+            ReportJob.status.in_([ReportJob.STATUS_PENDING, ReportJob.STATUS_RUNNING])
+        ).count()
+
+    def local_depth(self):
+        """Jobs waiting in this process's in-memory queue (0 before its workers start)."""
+        if self.eager or self._pid != os.getpid():
+            return 0
+        return self._queue.qsize()
+
+    def _is_cached(self, filename):
+        return self.app.extensions['report_cache'].exists(filename)
+
+    def _needs_rerun(self, job):
+        from app.models.report import ReportJob
+
+        now = datetime.utcnow()
+        if job.status == ReportJob.STATUS_READY:
+            # The cached PDF was evicted
+            return not self._is_cached(job.filename)
+        if job.status == ReportJob.STATUS_FAILED:
+            # Retry after a cooldown, so a transient failure does not stick but a broken job is not rendered on every view
+            return job.updated_at < now - timedelta(seconds=self.app.config['REPORT_JOB_FAILED_COOLDOWN'])
+        if job.status == ReportJob.STATUS_RUNNING:
+            # The worker that claimed it died mid-render
+            return job.updated_at < now - timedelta(seconds=self.app.config['REPORT_JOB_STALE_AFTER'])
+        return False
+
+    def _rerun(self, job):
+        """Reset the job to pending with fresh attempts and schedule it, unless another request already did."""
+        from app import db
+        from app.models.report import ReportJob
+
+        reset = ReportJob.query.filter_by(id=job.id, status=job.status).update({
+            'status': ReportJob.STATUS_PENDING,
+            'attempts': 0,
+            'updated_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        if reset:
+            logging.info(f"Rendering report job {job.id} again")
+            self._schedule(job.id)
+        db.session.refresh(job)
+
+    def _schedule(self, job_id):
+        if self.eager:
+            self._run(job_id)
+            return
+        self._start()
+        self._queue.put(job_id)
+
+    def start(self):
+        """
+        Start the workers and requeue persisted jobs in this process.
+
+        Called by gunicorn as each worker boots (post_worker_init), so jobs left
+        by a previous deploy are picked up without waiting for a request. Safe to
+        call more than once; requests start the workers on demand otherwise.
+        """
+        if self.eager:
+            return
+        with self.app.app_context():
+            self._start()
+
+    def _start(self):
+        """Start the worker and sweeper threads on first use (again after a fork) and resume persisted jobs."""
+        with self._lock:
+            if self._pid == os.getpid() and self._threads:
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._threads = []
+            for i in range(self.app.config['REPORT_WORKERS']):
+                thread = threading.Thread(target=self._work, name=f'report-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._sweep_forever, name='report-sweeper', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._resume()
+
+    def _resume(self):
+        """Requeue jobs left pending by a previous process, and running ones that went stale."""
+        from app.models.report import ReportJob
+
+        self._reset_stale()
+        pending = ReportJob.query.with_entities(ReportJob.id).filter_by(status=ReportJob.STATUS_PENDING).all()
+        for (job_id,) in pending:
+            self._queue.put(job_id)
+        if pending:
+            logging.info(f"Resumed {len(pending)} pending report jobs")
+
+    def _reset_stale(self):
+        """Set running jobs whose worker died back to pending; returns how many were reset."""
+        from app import db
+        from app.models.report import ReportJob
+
+        stale_before = datetime.utcnow() - timedelta(seconds=self.app.config['REPORT_JOB_STALE_AFTER'])
+        reset = ReportJob.query.filter(
+            ReportJob.status == ReportJob.STATUS_RUNNING,
+            ReportJob.updated_at < stale_before
+        ).update({'status': ReportJob.STATUS_PENDING, 'updated_at': stale_before}, synchronize_session=False)
+        db.session.commit()
+        return reset
+
+    def sweep(self):
+        """
+        Requeue jobs that no worker is going to finish.
+
+        These are running jobs whose worker was killed mid-render, and pending
+        jobs that have waited longer than REPORT_JOB_STALE_AFTER, e.g. queued in
+        a process that has since exited. A job another worker still holds is
+        skipped when it is claimed, so requeueing is harmless.
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        from app.models.report import ReportJob
+
+        reset = self._reset_stale()
+        stale_before = datetime.utcnow() - timedelta(seconds=self.app.config['REPORT_JOB_STALE_AFTER'])
+        orphaned = ReportJob.query.with_entities(ReportJob.id).filter(
+            ReportJob.status == ReportJob.STATUS_PENDING,
+            ReportJob.updated_at <= stale_before
+        ).all()
+        for (job_id,) in orphaned:
+            self._queue.put(job_id)
+        if reset or orphaned:
+            logging.warning(f"Requeued {len(orphaned)} stale report jobs ({reset} left running by a dead worker)")
+        return len(orphaned)
+
+    def _sweep_forever(self):
+        while True:
+            time.sleep(self.app.config['REPORT_JOB_SWEEP_INTERVAL'])
+            try:
+                with self.app.app_context():
+                    self.sweep()
+            except Exception as e:
+                logging.error(f"Report job sweep failed: {str(e)}")
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                with self.app.app_context():
+                    self._run(job_id)
+            except Exception as e:
+                logging.error(f"Report worker failed on job {job_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id):
+        from app import db
+        from app.models.report import ReportJob
+
+        # Claim the job; if nothing is updated another worker already has it
+        claimed = ReportJob.query.filter_by(id=job_id, status=ReportJob.STATUS_PENDING).update({
+            'status': ReportJob.STATUS_RUNNING,
+            'attempts': ReportJob.attempts + 1,
+            'updated_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return
+
+        job = db.session.get(ReportJob, job_id)
+        try:
+            filename = self._render(job)
+            if not filename:
+                raise RuntimeError('PDF generator did not produce a file')
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(ReportJob, job_id)
+            job.error = str(e)
+            if job.attempts < self.app.config['REPORT_JOB_MAX_ATTEMPTS']:
+                logging.warning(f"Report job {job_id} failed (attempt {job.attempts}), retrying: {str(e)}")
+                job.status = ReportJob.STATUS_PENDING
+                db.session.commit()
+                self._retry(job_id, job.attempts)
+            else:
+                logging.error(f"Report job {job_id} failed after {job.attempts} attempts: {str(e)}")
+                job.status = ReportJob.STATUS_FAILED
+                db.session.commit()
+            return
+
+        job.status = ReportJob.STATUS_READY
+        job.filename = filename
+        job.error = None
+        db.session.commit()
+
+    def _retry(self, job_id, attempts):
+        if self.eager:
+            self._run(job_id)
+            return
+        delay = self.app.config['REPORT_JOB_RETRY_DELAY'] * attempts
+        timer = threading.Timer(delay, self._queue.put, args=(job_id,))
+        timer.daemon = True
+        timer.start()
+
+    def _render(self, job):
+        from app.models.assessment import ASSESSMENT_TYPES
+        from app.utils.pdf_generator import generate_pdf_report
+
+        assessment = job.assessment
+        assessment_info = ASSESSMENT_TYPES[assessment.assessment_type]
+        result = assessment.get_result()
+        return generate_pdf_report(
+            assessment=assessment,
+            user=assessment.user,
+            assessment_info=assessment_info,
+            category_scores=result.category_scores,
+            interpretation=result.interpretation
+        )
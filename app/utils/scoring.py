@@ -1,22 +1,59 @@
+import numpy as np
+
+# Question indexes of each scale, shared by the per-respondent and batch scorers
+LSI_STYLES = {
+    'humanistic': [0, 1, 2, 3],
+    'affiliative': [4, 5, 6, 7],
+    'achievement': [8, 9, 10, 11],
+    'self_actualizing': [12, 13, 14, 15],
+    'approval': [16, 17, 18, 19],
+    'conventional': [20, 21, 22, 23],
+    'dependent': [24, 25, 26, 27],
+    'avoidance': [28, 29, 30, 31],
+    'oppositional': [32, 33, 34, 35],
+    'power': [36, 37, 38, 39],
+    'competitive': [40, 41, 42, 43],
+    'perfectionistic': [44, 45, 46, 47]
+}
+
+OCI_NORMS = {
+    'constructive': {
+        'achievement': [0, 1, 2, 3, 4],
+        'self_actualizing': [5, 6, 7, 8, 9],
+        'humanistic': [10, 11, 12, 13, 14],
+        'affiliative': [15, 16, 17, 18, 19]
+    },
+    'passive_defensive': {
+        'approval': [20, 21, 22, 23, 24],
+        'conventional': [25, 26, 27, 28, 29],
+        'dependent': [30, 31, 32, 33, 34],
+        'avoidance': [35, 36, 37, 38, 39]
+    },
+    'aggressive_defensive': {
+        'oppositional': [40, 41, 42, 43, 44],
+        'power': [45, 46, 47, 48, 49]
+    }
+}
+
+LPI_PRACTICES = {
+    'model_way': [0, 1, 2, 3, 4, 5],
+    'inspire_vision': [6, 7, 8, 9, 10, 11],
+    'challenge_process': [12, 13, 14, 15, 16, 17],
+    'enable_others': [18, 19, 20, 21, 22, 23],
+    'encourage_heart': [24, 25, 26, 27, 28, 29]
+}
+
+INFLUENCE_POWER_TYPES = {
+    'expert': list(range(0, 8)),
+    'referent': list(range(8, 16)),
+    'legitimate': list(range(16, 24)),
+    'coercive': list(range(24, 32))
+}
+
 def calculate_lsi_scores(responses):
     """Calculate Life Styles Inventory scores"""
-    styles = {
-        'humanistic': [0, 1, 2, 3],
-        'affiliative': [4, 5, 6, 7],
-        'achievement': [8, 9, 10, 11],
-        'self_actualizing': [12, 13, 14, 15],
-        'approval': [16, 17, 18, 19],
-        'conventional': [20, 21, 22, 23],
-        'dependent': [24, 25, 26, 27],
-        'avoidance': [28, 29, 30, 31],
-        'oppositional': [32, 33, 34, 35],
-        'power': [36, 37, 38, 39],
-        'competitive': [40, 41, 42, 43],
-        'perfectionistic': [44, 45, 46, 47]
-    }
-    
     raw_scores = {}
-    for style, questions in styles.items():
+    for style, questions in LSI_STYLES.items():
         style_scores = [responses.get(str(q), 0) for q in questions]
         raw_scores[style] = sum(style_scores) / len(style_scores)
     
@@ -24,27 +61,8 @@ def calculate_lsi_scores(responses):
 
 def calculate_oci_scores(responses):
     """Calculate Organizational Culture Inventory scores"""
-    norms = {
-        'constructive': {
-            'achievement': [0, 1, 2, 3, 4],
-            'self_actualizing': [5, 6, 7, 8, 9],
-            'humanistic': [10, 11, 12, 13, 14],
-            'affiliative': [15, 16, 17, 18, 19]
-        },
-        'passive_defensive': {
-            'approval': [20, 21, 22, 23, 24],
-            'conventional': [25, 26, 27, 28, 29],
-            'dependent': [30, 31, 32, 33, 34],
-            'avoidance': [35, 36, 37, 38, 39]
-        },
-        'aggressive_defensive': {
-            'oppositional': [40, 41, 42, 43, 44],
-            'power': [45, 46, 47, 48, 49]
-        }
-    }
-    
     scores = {}
-    for category, styles in norms.items():
+    for category, styles in OCI_NORMS.items():
         category_scores = {}
         for style, indices in styles.items():
             style_scores = [responses.get(str(i), 0) for i in indices]
@@ -55,16 +73,8 @@ def calculate_oci_scores(responses):
 
 def calculate_lpi_scores(responses):
     """Calculate Leadership Practices Inventory scores"""
-    practices = {
-        'model_way': [0, 1, 2, 3, 4, 5],
-        'inspire_vision': [6, 7, 8, 9, 10, 11],
-        'challenge_process': [12, 13, 14, 15, 16, 17],
-        'enable_others': [18, 19, 20, 21, 22, 23],
-        'encourage_heart': [24, 25, 26, 27, 28, 29]
-    }
-    
     scores = {}
-    for practice, indices in practices.items():
+    for practice, indices in LPI_PRACTICES.items():
         practice_scores = [responses.get(str(i), 0) for i in indices]
         scores[practice] = {
             'raw_score': sum(practice_scores),
@@ -75,20 +85,88 @@ def calculate_lpi_scores(responses):
 
 def calculate_influence_scores(responses):
     """Calculate Influence Style Profiler scores"""
-    power_types = {
-        'expert': list(range(0, 8)),
-        'referent': list(range(8, 16)),
-        'legitimate': list(range(16, 24)),
-        'coercive': list(range(24, 32))
-    }
-    
     scores = {}
-    for power_type, indices in power_types.items():
+    for power_type, indices in INFLUENCE_POWER_TYPES.items():
         type_scores = [responses.get(str(i), 0) for i in indices]
         scores[power_type] = sum(type_scores) / len(type_scores)
     
     return scores
 
+def responses_to_matrix(response_sets, num_questions):
+    """
+    Stack per-respondent response dicts into a respondents x questions matrix.
+    
+    Args:
+        response_sets (list): Response dicts keyed by the question index as a string
+        num_questions (int): Number of question columns
+        
+    Returns:
+        numpy.ndarray: float matrix; unanswered questions are 0, like the per-respondent scorers
+    """
+    matrix = np.zeros((len(response_sets), num_questions))
+    for row, responses in enumerate(response_sets):
+        for key, value in responses.items():
+            index = int(key)
+            if 0 <= index < num_questions:
+                matrix[row, index] = value
+    return matrix
+
+def score_matrix(responses, index_map):
+    """
+    Sum and average the scores of every group in an index map for all respondents at once.
+    
+    Args:
+        responses (array-like): respondents x questions matrix of answers
+        index_map (dict): Group name to the question indexes it averages
+        
+    Returns:
+        tuple: (group names, respondents x groups sums, respondents x groups averages)
+    """
+    responses = np.asarray(responses, dtype=float)
+    if responses.ndim != 2:
+        raise ValueError("responses must be a respondents x questions matrix")
+    names = list(index_map)
+    num_questions = max(max(indices) for indices in index_map.values()) + 1
+    if responses.shape[1] < num_questions:
+        # Missing trailing questions count as 0, like responses.get(key, 0)
+        responses = np.pad(responses, ((0, 0), (0, num_questions - responses.shape[1])))
+    
+    # 0/1 membership matrix: one matmul sums every group, and dividing by the
+    # group sizes afterwards gives the same floats as sum() / len()
+    membership = np.zeros((num_questions, len(names)))
+    for column, name in enumerate(names):
+        membership[index_map[name], column] = 1
+    sums = responses[:, :num_questions] @ membership
+    return names, sums, sums / membership.sum(axis=0)
+
+def batch_lsi_scores(responses):
+    """Vectorized calculate_lsi_scores: {style: array of averages, one per respondent}"""
+    names, _, averages = score_matrix(responses, LSI_STYLES)
+    return {name: averages[:, column] for column, name in enumerate(names)}
+
+def batch_oci_scores(responses):
+    """Vectorized calculate_oci_scores: {category: {style: array of averages}}"""
+    styles = {style: indices for group in OCI_NORMS.values() for style, indices in group.items()}
+    names, _, averages = score_matrix(responses, styles)
+    columns = {name: averages[:, column] for column, name in enumerate(names)}
+    return {
+        category: {style: columns[style] for style in group}
+        for category, group in OCI_NORMS.items()
+    }
+
+def batch_lpi_scores(responses):
+    """Vectorized calculate_lpi_scores: {practice: {'raw_score': array, 'average': array}}"""
+    names, sums, averages = score_matrix(responses, LPI_PRACTICES)
+    return {
+        name: {'raw_score': sums[:, column], 'average': averages[:, column]}
+        for column, name in enumerate(names)
+    }
+
+def batch_influence_scores(responses):
+    """Vectorized calculate_influence_scores: {power_type: array of averages}"""
+    names, _, averages = score_matrix(responses, INFLUENCE_POWER_TYPES)
+    return {name: averages[:, column] for column, name in enumerate(names)}
+
 def calculate_scores(data):
     """
     Calculate scores for each dimension based on user responses.
@@ -0,0 +1,197 @@
+from functools import lru_cache
+from math import cos, sin, pi
+
+from reportlab.graphics.shapes import Drawing, Group, Circle, Line, Polygon, Rect, String, Wedge
+from reportlab.lib.colors import HexColor, white
+from reportlab.lib.units import mm
+
+CHART_COLOR = HexColor('#9370DB')
+GRID_COLOR = HexColor('#808080')
+TEXT_COLOR = HexColor('#333333')
+
+# Drawing sizes match the raster charts they replace in the report
+RADIAL_SIZE = (140*mm, 140*mm)
+BAR_SIZE = (160*mm, 120*mm)
+RADIAL_VISUALIZATIONS = ('radar', 'pentagon', 'circumplex', 'polar')
+
+
+def format_label(category):
+    return category.replace('_', ' ').title()
+
+
+def ring_levels(max_score):
+    """Score values that get a grid ring or line, at most about five of them."""
+    step = max(1, max_score // 5)
+    return list(range(step, max_score + 1, step))
+
+
+def category_angles(count):
+    """Angle of each category, counter-clockwise from the positive x axis like matplotlib's polar axes."""
+    return [2 * pi * i / count for i in range(count)]
+
+
+def _radial_geometry(width, height):
+    # Leave room around the plot for category labels and the title
+    cx, cy = width / 2, height / 2 - 6
+    radius = min(width, height) / 2 - 40
+    return cx, cy, radius
+
+
+def _point(cx, cy, radius, angle):
+    return cx + radius * cos(angle), cy + radius * sin(angle)
+
+
+@lru_cache(maxsize=32)
+def radial_background(visualization, categories, max_score):
+    """
+    Static part of a radial chart: title, rings, spokes and labels.
+
+    Built once per layout and shared between drawings, since shapes are not
+    modified when a drawing is rendered.
+    """
+    width, height = RADIAL_SIZE
+    cx, cy, radius = _radial_geometry(width, height)
+    angles = category_angles(len(categories))
+    group = Group()
+
+    group.add(String(width / 2, height - 14, 'Assessment Results',
+                     fontName='Helvetica', fontSize=14, fillColor=TEXT_COLOR, textAnchor='middle'))
+
+    for level in ring_levels(max_score):
+        ring_radius = radius * level / max_score
+        if visualization == 'pentagon':
+            points = []
+            for angle in angles:
+                points.extend(_point(cx, cy, ring_radius, angle))
+            group.add(Polygon(points, fillColor=None, strokeColor=GRID_COLOR, strokeWidth=0.5, strokeOpacity=0.5))
+        else:
+            group.add(Circle(cx, cy, ring_radius, fillColor=None, strokeColor=GRID_COLOR, strokeWidth=0.5, strokeOpacity=0.5))
+        # Ring values sit between spokes, like matplotlib's radial tick labels
+        label_x, label_y = _point(cx, cy, ring_radius, pi / 8)
+        group.add(String(label_x + 2, label_y + 2, str(level), fontName='Helvetica', fontSize=7, fillColor=TEXT_COLOR))
+
+    for angle, category in zip(angles, categories):
+        x, y = _point(cx, cy, radius, angle)
+        group.add(Line(cx, cy, x, y, strokeColor=GRID_COLOR, strokeWidth=0.5, strokeOpacity=0.5))
+
+        label_x, label_y = _point(cx, cy, radius + 8, angle)
+        if cos(angle) > 0.1:
+            anchor = 'start'
+        elif cos(angle) < -0.1:
+            anchor = 'end'
+        else:
+            anchor = 'middle'
+        if sin(angle) < -0.1:
+            label_y -= 8
+        group.add(String(label_x, label_y, format_label(category),
+                         fontName='Helvetica', fontSize=8, fillColor=TEXT_COLOR, textAnchor=anchor))
+
+    return group
+
+
+@lru_cache(maxsize=32)
+def bar_background(categories, max_score):
+    """Static part of a bar chart: title, axes, grid lines and rotated labels."""
+    width, height = BAR_SIZE
+    left, bottom, right, top = 30, 80, width - 10, height - 30
+    slot = (right - left) / len(categories)
+    group = Group()
+
+    group.add(String(width / 2, height - 14, 'Assessment Results',
+                     fontName='Helvetica', fontSize=14, fillColor=TEXT_COLOR, textAnchor='middle'))
+
+    for level in [0] + ring_levels(max_score):
+        y = bottom + (top - bottom) * level / max_score
+        group.add(Line(left, y, right, y, strokeColor=GRID_COLOR, strokeWidth=0.5, strokeOpacity=0.5))
+        group.add(String(left - 4, y - 3, str(level), fontName='Helvetica', fontSize=7,
+                         fillColor=TEXT_COLOR, textAnchor='end'))
+    group.add(Line(left, bottom, left, top, strokeColor=GRID_COLOR, strokeWidth=0.75))
+
+    for i, category in enumerate(categories):
+        label = Group(String(0, 0, format_label(category), fontName='Helvetica', fontSize=8,
+                             fillColor=TEXT_COLOR, textAnchor='end'))
+        label.translate(left + slot * (i + 0.5), bottom - 6)
+        label.rotate(45)
+        group.add(label)
+
+    return group
+
+
+def _radar_layer(categories, scores, max_score):
+    width, height = RADIAL_SIZE
+    cx, cy, radius = _radial_geometry(width, height)
+    points = []
+    for angle, score in zip(category_angles(len(categories)), scores):
+        points.extend(_point(cx, cy, radius * score / max_score, angle))
+
+    group = Group(Polygon(points, fillColor=CHART_COLOR, fillOpacity=0.25,
+                          strokeColor=CHART_COLOR, strokeWidth=2.5))
+    for x, y in zip(points[::2], points[1::2]):
+        group.add(Circle(x, y, 3, fillColor=CHART_COLOR, strokeColor=None))
+    return group
+
+
+def _polar_layer(categories, scores, max_score):
+    """Polar area chart: one wedge per category whose radius is the score."""
+    width, height = RADIAL_SIZE
+    cx, cy, radius = _radial_geometry(width, height)
+    span = 360.0 / len(categories)
+    group = Group()
+    for angle, score in zip(category_angles(len(categories)), scores):
+        wedge_radius = radius * score / max_score
+        if wedge_radius <= 0:
+            continue
+        center = angle * 180 / pi
+        group.add(Wedge(cx, cy, wedge_radius, center - span / 2, center + span / 2,
+                        fillColor=CHART_COLOR, fillOpacity=0.6, strokeColor=white, strokeWidth=1))
+    return group
+
+
+def _bar_layer(categories, scores, max_score):
+    width, height = BAR_SIZE
+    left, bottom, right, top = 30, 80, width - 10, height - 30
+    slot = (right - left) / len(categories)
+    group = Group()
+    for i, score in enumerate(scores):
+        bar_height = (top - bottom) * score / max_score
+        x = left + slot * i + slot * 0.1
+        group.add(Rect(x, bottom, slot * 0.8, bar_height, fillColor=CHART_COLOR, fillOpacity=0.7, strokeColor=None))
+        group.add(String(x + slot * 0.4, bottom + bar_height + 3, f'{score:.1f}', fontName='Helvetica',
+                         fontSize=8, fillColor=TEXT_COLOR, textAnchor='middle'))
+    return group
+
+
+def create_vector_chart(visualization, categories, scores, max_score=5):
+    """
+    Draw the results chart with ReportLab graphics primitives.
+
+    Args:
+        visualization (str): Chart type from ASSESSMENT_TYPES ('radar', 'pentagon',
+            'circumplex', 'polar'); anything else is drawn as a bar chart
+        categories (list): List of category names
+        scores (list): List of scores corresponding to categories
+        max_score (int): Maximum possible score for any category
+
+    Returns:
+        Drawing: Vector chart that can be added to a platypus story, or None
+    """
+    if not categories or not scores or len(categories) != len(scores):
+        print("Error: Categories and scores must be non-empty and have the same length")
+        return None
+
+    categories = tuple(categories)
+    scores = [min(max(float(score), 0), max_score) for score in scores]
+
+    if visualization in RADIAL_VISUALIZATIONS:
+        drawing = Drawing(*RADIAL_SIZE)
+        drawing.add(radial_background(visualization, categories, max_score))
+        if visualization in ('circumplex', 'polar'):
+            drawing.add(_polar_layer(categories, scores, max_score))
+        else:
+            drawing.add(_radar_layer(categories, scores, max_score))
+    else:
+        drawing = Drawing(*BAR_SIZE)
+        drawing.add(bar_background(categories, max_score))
+        drawing.add(_bar_layer(categories, scores, max_score))
+    drawing.hAlign = 'CENTER'
+    return drawing
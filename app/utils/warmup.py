@@ -0,0 +1,83 @@
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+
+def warm_up(app):
+    """
+    Build the state every worker would otherwise build on its first requests.
+
+    Meant for the gunicorn master with preload_app: whatever is loaded here is
+    shared copy-on-write by all the workers forked afterwards. Compiles every
+    Jinja template, loads the question catalog, renders one report per
+    assessment type (chart templates, fonts, ReportLab styles) and runs the
+    interpretation code once per type. Closes the database connections it
+    opened, so the workers start with an empty pool.
+
+    Args:
+        app (Flask): The application
+
+    Returns:
+        dict: Seconds spent per step
+    """
+    timings = {}
+
+    def step(name, run):
+        start = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            # A missing table or font must not stop the server from starting
+            logging.warning(f"Warm-up step {name} failed: {type(e).__name__}: {str(e)}")
+        timings[name] = time.perf_counter() - start
+
+    with app.app_context():
+        step('templates', lambda: compile_templates(app))
+        step('question catalog', lambda: app.extensions['question_catalog'].get())
+        step('interpretation', warm_interpretation)
+        step('reports', lambda: warm_reports(app.config.get('CHART_BACKEND', 'matplotlib')))
+
+        from app import db
+        db.session.remove()
+        db.engine.dispose()
+    return timings
+
+
+def compile_templates(app):
+    """Compile every template into the Jinja environment's cache."""
+    env = app.jinja_env
+    for name in env.list_templates(extensions=['html']):
+        env.get_template(name)
+
+
+def warm_interpretation():
+    from app.models.assessment import ASSESSMENT_TYPES
+    from app.utils.interpretation import get_assessment_interpretation
+
+    for assessment_type, info in ASSESSMENT_TYPES.items():
+        get_assessment_interpretation(assessment_type, {category: 1.0 for category in info['categories']})
+
+
+def warm_reports(chart_backend):
+    """
+    Render one throwaway PDF per assessment type into a temporary directory.
+
+    Helps reports built in the web process itself (cohort reports, and all of
+    them when RENDER_POOL_SIZE = 0); render pool processes warm themselves up.
+    """
+    from app.models.assessment import ASSESSMENT_TYPES
+    from app.utils.pdf_generator import build_pdf_report
+    from app.utils.render_pool import warm_worker
+
+    warm_worker(chart_backend)
+    assessment = SimpleNamespace(completed_at=datetime.utcnow())
+    user = SimpleNamespace(name='Warm-up', email='warm-up@localhost')
+    with tempfile.TemporaryDirectory() as directory:
+        for assessment_type, info in ASSESSMENT_TYPES.items():
+            # Same category order as the stored snapshots, so the chart caches hit later
+            category_scores = {category: 1.0 for category in info['categories']}
+            build_pdf_report(os.path.join(directory, f'{assessment_type}.pdf'), assessment, user, info,
+                             category_scores, '', chart_backend=chart_backend)
@@ -0,0 +1,75 @@
+"""
+Scoring throughput of the per-respondent scorers versus the batch (matrix) API.
+
+Random response sets are scored both ways. That the two agree exactly is
+checked by tests/test_scoring.py; this script only measures throughput.
+
+Usage:
+    python benchmarks/batch_scoring.py [--respondents 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import scoring
+
+SCORERS = {
+    'lsi': (scoring.calculate_lsi_scores, scoring.batch_lsi_scores, scoring.LSI_STYLES, 5),
+    'oci': (scoring.calculate_oci_scores, scoring.batch_oci_scores, scoring.OCI_NORMS, 5),
+    'lpi': (scoring.calculate_lpi_scores, scoring.batch_lpi_scores, scoring.LPI_PRACTICES, 10),
+    'influence': (scoring.calculate_influence_scores, scoring.batch_influence_scores,
+                  scoring.INFLUENCE_POWER_TYPES, 5),
+}
+
+
+def question_count(index_map):
+    indices = []
+    for value in index_map.values():
+        # OCI nests its styles one level deeper than the other scales
+        groups = value.values() if isinstance(value, dict) else [value]
+        for group in groups:
+            indices.extend(group)
+    return max(indices) + 1
+
+
+def random_responses(count, num_questions, max_score):
+    response_sets = []
+    for _ in range(count):
+        # Leave a few questions unanswered to exercise the missing-answer path
+        response_sets.append({
+            str(i): random.randint(1, max_score)
+            for i in range(num_questions) if random.random() > 0.05
+        })
+    return response_sets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--respondents', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'scale':<12}{'loop /s':>14}{'batch /s':>16}{'speedup':>10}")
+    for name, (single, batch, index_map, max_score) in SCORERS.items():
+        num_questions = question_count(index_map)
+        response_sets = random_responses(args.respondents, num_questions, max_score)
+        matrix = scoring.responses_to_matrix(response_sets, num_questions)
+
+        start = time.perf_counter()
+        for responses in response_sets:
+            single(responses)
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch(matrix)
+        batch_seconds = time.perf_counter() - start
+
+        print(f"{name:<12}{args.respondents / loop_seconds:>14,.0f}{args.respondents / batch_seconds:>16,.0f}"
+              f"{loop_seconds / batch_seconds:>9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
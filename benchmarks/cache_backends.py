@@ -0,0 +1,85 @@
+"""
+Correctness and latency of the shared cache backends.
+
+Runs the same checks (round trip, overwrite, delete, expiry, LRU bound) and
+then a get/set loop against the memory, SQLite and Redis-protocol backends.
+The Redis backend is pointed at the stand-in in resp_server.py unless
+--redis-url is given. The script stops at the first check that fails.
+
+Usage:
+    python benchmarks/cache_backends.py [--operations 20000] [--redis-url redis://localhost:6379/0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.cache import MemoryBackend, RedisBackend, SQLiteBackend
+
+import resp_server
+
+
+def check(backend, name):
+    value = {'achievement': (31, 8), 'power': (12, 8)}
+    backend.set('check:a', value)
+    assert backend.get('check:a') == value, f"{name}: round trip"
+    backend.set('check:a', 'other')
+    assert backend.get('check:a') == 'other', f"{name}: overwrite"
+    backend.delete('check:a')
+    assert backend.get('check:a') is None, f"{name}: delete"
+    assert backend.get('check:missing') is None, f"{name}: miss"
+    backend.set('check:ttl', 1, ttl=0.05)
+    assert backend.get('check:ttl') == 1, f"{name}: before expiry"
+    time.sleep(0.1)
+    assert backend.get('check:ttl') is None, f"{name}: expiry"
+
+
+def timed(backend, operations):
+    payload = {f'category_{i}': (i * 3, 4) for i in range(12)}
+    keys = [f'bench:{i % 1000}' for i in range(operations)]
+    start = time.perf_counter()
+    for key in keys:
+        backend.set(key, payload)
+    set_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        backend.get(key)
+    get_seconds = time.perf_counter() - start
+    return set_seconds / operations * 1e6, get_seconds / operations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--operations', type=int, default=20000)
+    parser.add_argument('--redis-url', help='Use a real server instead of the stand-in')
+    args = parser.parse_args()
+
+    redis_url = args.redis_url
+    if redis_url is None:
+        server = resp_server.start()
+        redis_url = f'redis://127.0.0.1:{server.server_address[1]}/0'
+
+    lru = MemoryBackend(max_entries=2)
+    for key in ('a', 'b', 'a', 'c'):
+        lru.set(key, key)
+    assert lru.get('b') is None and lru.get('a') == 'a', 'memory: least recently used entry evicted'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            ('memory', MemoryBackend()),
+            ('sqlite', SQLiteBackend(os.path.join(tmp, 'cache.sqlite3'))),
+            ('redis', RedisBackend(redis_url)),
+        ]
+        print(f"{'backend':<10}{'set us':>10}{'get us':>10}")
+        for name, backend in backends:
+            check(backend, name)
+            set_us, get_us = timed(backend, args.operations)
+            backend.clear()
+            print(f"{name:<10}{set_us:>10.1f}{get_us:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
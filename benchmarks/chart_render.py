@@ -0,0 +1,129 @@
+"""
+Per-chart rendering latency before and after the cached chart templates.
+
+"Before" is the pyplot create_radar_chart / create_bar_chart the PDF report
+used until the templates were added, kept below as it was: every chart
+builds its figure, axes, grid, labels and title. "After" reuses the
+template's pre-rendered background and only draws the scores.
+
+Usage:
+    python benchmarks/chart_render.py [--iterations 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from io import BytesIO
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.assessment import ASSESSMENT_TYPES
+from app.utils.chart_templates import get_chart_template
+
+
+def baseline_radar_chart(categories, scores, max_score=5):
+    """create_radar_chart as it was before the chart templates (input checks left out)."""
+    categories = [cat.replace('_', ' ').title() for cat in categories]
+    plt.style.use('default')
+    fig = plt.figure(figsize=(8, 8), facecolor='none')
+    ax = fig.add_subplot(111, projection='polar')
+
+    num_vars = len(categories)
+    angles = np.linspace(0, 2*np.pi, num_vars, endpoint=False)
+    scores = np.array([float(score) for score in scores])
+    scores = np.concatenate((scores, [scores[0]]))
+    angles = np.concatenate((angles, [angles[0]]))
+
+    ax.plot(angles, scores, 'o-', linewidth=2.5, color='#9370DB', label='Scores')
+    ax.fill(angles, scores, alpha=0.25, color='#9370DB')
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(categories, color='black', size=10)
+    ax.set_ylim(0, max_score)
+    ax.grid(True, color='gray', alpha=0.3)
+    ax.spines['polar'].set_color('gray')
+    ax.tick_params(axis='y', colors='black')
+    plt.title('Assessment Results', pad=20, color='black', size=14)
+
+    buffer = BytesIO()
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=150,
+                facecolor='none', edgecolor='none', transparent=True)
+    buffer.seek(0)
+    plt.close(fig)
+    return buffer
+
+
+def baseline_bar_chart(categories, scores, max_score=5):
+    """create_bar_chart as it was before the chart templates."""
+    categories = [cat.replace('_', ' ').title() for cat in categories]
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots(figsize=(10, 6), facecolor='#1a1a1a')
+
+    x = np.arange(len(categories))
+    bars = ax.bar(x, scores, color='#9370DB', alpha=0.7)
+    ax.set_ylim(0, max_score)
+    ax.set_xticks(x)
+    ax.set_xticklabels(categories, rotation=45, ha='right', color='white')
+    ax.grid(True, axis='y', alpha=0.3)
+    ax.set_axisbelow(True)
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height:.1f}', ha='center', va='bottom', color='white')
+    plt.title('Assessment Results', pad=20, color='white', size=14)
+    plt.tight_layout()
+
+    buffer = BytesIO()
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=150,
+                facecolor='#1a1a1a', edgecolor='none')
+    buffer.seek(0)
+    plt.close(fig)
+    return buffer
+
+
+BASELINE = {'radar': baseline_radar_chart, 'bar': baseline_bar_chart}
+
+
+def time_calls(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'chart':<24}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for assessment_type, info in ASSESSMENT_TYPES.items():
+        kind = 'radar' if info.get('visualization') == 'radar' else 'bar'
+        categories = tuple(info['categories'])
+        max_score = info['max_score']
+
+        def scores():
+            return [random.uniform(1, max_score) for _ in categories]
+
+        # Warm matplotlib's font cache and the template outside the timings
+        BASELINE[kind](categories, scores(), max_score)
+        get_chart_template(kind, categories, max_score).render(scores())
+
+        before = time_calls(lambda: BASELINE[kind](categories, scores(), max_score), args.iterations)
+        after = time_calls(lambda: get_chart_template(kind, categories, max_score).render(scores()), args.iterations)
+
+        before_ms = statistics.median(before)
+        after_ms = statistics.median(after)
+        print(f"{assessment_type + ' (' + kind + ')':<24}{before_ms:>12.1f}{after_ms:>12.1f}{before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
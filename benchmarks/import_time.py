@@ -0,0 +1,109 @@
+"""
+Import-time budget for create_app().
+
+Runs ``python -X importtime`` on a fresh interpreter that builds the app,
+prints the slowest top-level imports, and exits with status 1 when the total
+import time exceeds the budget or when a report-only dependency (ReportLab,
+matplotlib, numpy, Pillow) is imported at startup. tests/test_import_time.py
+applies the same budget in the test suite.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 1000] [--runs 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Only the views that build reports may import these
+LAZY_PACKAGES = ('matplotlib', 'reportlab', 'numpy', 'PIL')
+
+SNIPPET = 'from app import create_app; create_app()'
+
+
+def measure():
+    """
+    Import create_app and build the app once, in a new interpreter.
+
+    Returns:
+        dict: {module: (self microseconds, cumulative microseconds, depth)}
+
+    Raises:
+        RuntimeError: create_app() failed in the new interpreter
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(tmp, 'import.db'))
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SNIPPET],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"create_app() failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def best_run(runs):
+    """
+    Measure several times and keep the run with the least total import time.
+
+    The best run is the least disturbed by the rest of the machine.
+
+    Returns:
+        tuple: (modules of the best run as returned by measure(), total milliseconds,
+        sorted top-level names of the LAZY_PACKAGES it imported)
+    """
+    best = min((measure() for _ in range(runs)),
+               key=lambda modules: sum(self_us for self_us, _, _ in modules.values()))
+    total_ms = sum(self_us for self_us, _, _ in best.values()) / 1000
+    eager = sorted({name.split('.')[0] for name in best if name.split('.')[0] in LAZY_PACKAGES})
+    return best, total_ms, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=1000,
+                        help='Maximum total import time (best of the runs)')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+    args = parser.parse_args()
+
+    try:
+        best, total_ms, eager = best_run(args.runs)
+    except RuntimeError as e:
+        sys.exit(str(e))
+
+    top_level = sorted(
+        ((cumulative_us, name) for name, (_, cumulative_us, depth) in best.items() if depth <= 1),
+        reverse=True
+    )[:args.top]
+    print(f"{'cumulative ms':>14}  module")
+    for cumulative_us, name in top_level:
+        print(f"{cumulative_us / 1000:>14.1f}  {name}")
+
+    print(f"\nTotal import time {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms), {len(best)} modules")
+
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: over budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Interpretations per second: per-call text building versus the memoized engine.
+
+The reference builds the interpretation the way it used to be built, rebuilding
+the description table and sorting every category on each call. Score vectors
+are averages of 8 answers on the assessment's scale, as in real results. The
+engine's output is checked against the reference before anything is timed.
+
+Usage:
+    python benchmarks/interpretation.py [--results 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.assessment import ASSESSMENT_TYPES
+from app.utils import interpretation
+
+ANSWERS_PER_CATEGORY = 8
+
+
+def reference_interpretation(assessment_type, category_scores):
+    text = interpretation.INTERPRETATION_TEXT[assessment_type]
+    descriptions = dict(text['descriptions'])
+    ranked = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
+
+    def phrase(category):
+        desc = descriptions.get(category, '')
+        name = interpretation.format_category_name(category)
+        return f"{name} ({desc})" if desc else name
+
+    return text['template'].format(
+        strengths=' and '.join(phrase(c) for c, _ in ranked[:2]),
+        improvements=' and '.join(phrase(c) for c, _ in ranked[-2:])
+    )
+
+
+def random_results(assessment_type, count):
+    info = ASSESSMENT_TYPES[assessment_type]
+    max_score = max(info['scale'])
+    return [
+        {
+            category: round(sum(random.randint(1, max_score) for _ in range(ANSWERS_PER_CATEGORY))
+                            / ANSWERS_PER_CATEGORY, 2)
+            for category in info['categories']
+        }
+        for _ in range(count)
+    ]
+
+
+def rate(function, assessment_type, results):
+    start = time.perf_counter()
+    for category_scores in results:
+        function(assessment_type, category_scores)
+    return len(results) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--results', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'type':<12}{'reference /s':>14}{'cold /s':>12}{'warm /s':>12}{'memo hits':>11}")
+    for assessment_type in ASSESSMENT_TYPES:
+        results = random_results(assessment_type, args.results)
+        for category_scores in results[:2000]:
+            expected = reference_interpretation(assessment_type, category_scores)
+            actual = interpretation.get_assessment_interpretation(assessment_type, category_scores)
+            assert actual == expected, f"{assessment_type} {category_scores}: {actual!r} != {expected!r}"
+
+        reference = rate(reference_interpretation, assessment_type, results)
+        interpretation.clear_memo()
+        cold = rate(interpretation.get_assessment_interpretation, assessment_type, results)
+        info = interpretation.memo_info()
+        hits = info.hits / (info.hits + info.misses)
+        warm = rate(interpretation.get_assessment_interpretation, assessment_type, results[:interpretation.MEMO_SIZE])
+        print(f"{assessment_type:<12}{reference:>14,.0f}{cold:>12,.0f}{warm:>12,.0f}{hits:>11.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""
+Load test of the full assessment flow, with latency percentiles per step.
+
+Each simulated user registers, logs in, then for every assessment type opens
+the questions, submits answers, views the results page, fetches
+/assessment/api/results, waits for the PDF and downloads it. Forms are
+submitted with their CSRF tokens, as a browser would. Reports requests per
+second and p50/p95/p99 latency for every step.
+
+By default the app runs in this process on a throwaway SQLite database
+(--database-url selects another, e.g. a local PostgreSQL scratch database;
+benchmark users are left behind). --url sends real HTTP requests to a running
+server instead, e.g. gunicorn started with gunicorn.conf.py. Over plain HTTP
+the server must run with SESSION_COOKIE_SECURE off (DevelopmentConfig), or
+no session survives.
+
+Save a run with --json and compare later runs to it with --baseline: the
+script exits with status 1 when a step's p95 is more than --tolerance slower
+than in the baseline, or when any request fails.
+
+Usage:
+    python benchmarks/load_test.py [--users 20] [--concurrency 4]
+    python benchmarks/load_test.py --database-url postgresql://localhost/mindscape_bench
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --users 50 --concurrency 10
+    python benchmarks/load_test.py --json baseline.json
+    python benchmarks/load_test.py --baseline baseline.json --tolerance 0.5
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+STEPS = ('register', 'login', 'questions', 'submit', 'results', 'api_results', 'pdf_ready', 'pdf_download')
+
+CSRF_TOKEN = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+QUESTION_FIELD = re.compile(r'name="question_(\d+)"')
+
+PASSWORD = 'load-test-1'
+
+
+class StepFailed(Exception):
+    """A response other than the one the flow expects; ends the simulated user's run."""
+
+
+class AppClient:
+    """Requests served by the app in this process, through the Flask test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+        # The test client uses PREFERRED_URL_SCHEME, so requests are as secure as in production
+        self.origin = f"{app.config['PREFERRED_URL_SCHEME']}://localhost"
+
+    def request(self, method, path, data=None):
+        # HTTPS form posts need a same-origin Referer (WTF_CSRF_SSL_STRICT), as a browser sends
+        response = self.client.open(path, method=method, data=data, headers={'Referer': self.origin + path})
+        return response.status_code, response.headers, response.get_data()
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HTTPClient:
+    """Requests to a running server, with a cookie jar per simulated user and no redirect following."""
+
+    def __init__(self, base_url, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()), _NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urlencode(data).encode() if data is not None else None
+        request = Request(self.base_url + path, data=body, method=method, headers={'Referer': self.base_url + path})
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as e:
+            # Redirects and error statuses arrive as HTTPError without a redirect handler
+            return e.code, e.headers, e.read()
+
+
+class Recorder:
+    """Latencies and failures per step, shared by the simulated users."""
+
+    def __init__(self):
+        self.latencies = {step: [] for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+        self.failures = []
+        self._lock = threading.Lock()
+
+    def add(self, step, seconds):
+        with self._lock:
+            self.latencies[step].append(seconds)
+
+    def fail(self, step, message):
+        with self._lock:
+            self.errors[step] += 1
+            if len(self.failures) < 10:
+                self.failures.append(f'{step}: {message}')
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+
+def location_path(headers):
+    """Path of a redirect target; the test client makes Location absolute."""
+    location = headers.get('Location', '')
+    parts = urlsplit(location)
+    return parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+class VirtualUser:
+    """One user going through the whole flow."""
+
+    def __init__(self, client, recorder, email, assessment_types, pdf_timeout, record=True):
+        self.client = client
+        self.recorder = recorder
+        self.email = email
+        self.assessment_types = assessment_types
+        self.pdf_timeout = pdf_timeout
+        self.record = record
+
+    def step(self, name, method, path, data=None, expect=(200,)):
+        start = time.perf_counter()
+        status, headers, body = self.client.request(method, path, data)
+        if status not in expect:
+            raise StepFailed(f'{method} {path} returned {status}')
+        if self.record:
+            self.recorder.add(name, time.perf_counter() - start)
+        return headers, body
+
+    def form_token(self, path):
+        # Fetching the form is part of the user's experience but not a measured step
+        status, _, body = self.client.request('GET', path)
+        match = CSRF_TOKEN.search(body.decode('utf-8', 'replace'))
+        if status != 200 or not match:
+            raise StepFailed(f'no CSRF token on {path} (status {status})')
+        return match.group(1)
+
+    def run(self):
+        current = 'register'
+        try:
+            token = self.form_token('/auth/register')
+            self.step('register', 'POST', '/auth/register', {
+                'csrf_token': token, 'email': self.email, 'name': 'Load Test',
+                'password': PASSWORD, 'confirm_password': PASSWORD
+            }, expect=(302,))
+            current = 'login'
+            token = self.form_token('/auth/login')
+            self.step('login', 'POST', '/auth/login', {
+                'csrf_token': token, 'email': self.email, 'password': PASSWORD
+            }, expect=(302,))
+            for assessment_type, max_score in self.assessment_types:
+                current = 'questions'
+                self.take(assessment_type, max_score)
+        except StepFailed as e:
+            self.recorder.fail(current, str(e))
+        except Exception as e:
+            self.recorder.fail(current, f'{type(e).__name__}: {str(e)}')
+
+    def take(self, assessment_type, max_score):
+        _, body = self.step('questions', 'GET', f'/assessment/type/{assessment_type}')
+        html = body.decode('utf-8', 'replace')
+        token = CSRF_TOKEN.search(html)
+        question_ids = sorted(set(QUESTION_FIELD.findall(html)), key=int)
+        if not token or not question_ids:
+            raise StepFailed(f'questions page of {assessment_type} has no form')
+        data = {'csrf_token': token.group(1)}
+        for i, question_id in enumerate(question_ids):
+            data[f'question_{question_id}'] = str(i % max_score + 1)
+
+        headers, _ = self.step('submit', 'POST', f'/assessment/submit/{assessment_type}', data, expect=(302,))
+        results_path = location_path(headers)
+        match = re.search(r'/results/(\d+)', results_path)
+        if not match:
+            raise StepFailed(f'submit redirected to {results_path!r}, not to the results')
+        assessment_id = match.group(1)
+
+        self.step('results', 'GET', results_path)
+        self.step('api_results', 'GET', f'/assessment/api/results/{assessment_id}')
+
+        # The results page queued the PDF; poll as the page's script does
+        start = time.perf_counter()
+        deadline = start + self.pdf_timeout
+        while True:
+            status, _, body = self.client.request('GET', f'/assessment/api/pdf_status/{assessment_id}')
+            payload = json.loads(body) if status == 200 else {}
+            if payload.get('status') == 'ready':
+                break
+            if payload.get('status') == 'failed' or time.perf_counter() > deadline:
+                raise StepFailed(f'PDF of assessment {assessment_id}: {payload or status}')
+            time.sleep(0.05)
+        if self.record:
+            self.recorder.add('pdf_ready', time.perf_counter() - start)
+        self.step('pdf_download', 'GET', payload['pdf_path'])
+
+
+def local_app(database_url):
+    """Create the app on database_url with the schema and the question catalog in place."""
+    os.environ['DATABASE_URL'] = database_url
+
+    from config import Config
+    from app import create_app, db
+    from app.models.assessment import ASSESSMENT_QUESTIONS, ASSESSMENT_TYPES, Question, QuestionCatalogVersion
+
+    class LoadTestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url.replace('postgres://', 'postgresql://')
+        REPORT_CACHE_DIR = os.path.join(tempfile.mkdtemp(), 'reports')
+
+    app = create_app(LoadTestConfig)
+    with app.app_context():
+        db.create_all()
+        if not Question.query.count():
+            for assessment_type, questions in ASSESSMENT_QUESTIONS.items():
+                categories = ASSESSMENT_TYPES[assessment_type]['categories']
+                for i, text in enumerate(questions):
+                    db.session.add(Question(text=text, category=categories[i % len(categories)],
+                                            assessment_type=assessment_type))
+            QuestionCatalogVersion.bump()
+            db.session.commit()
+        print(f"database: {db.engine.url.render_as_string(hide_password=True)}")
+    return app
+
+
+def summarize(recorder, wall_seconds):
+    summary = {}
+    for step in STEPS:
+        values = sorted(recorder.latencies[step])
+        summary[step] = {
+            'count': len(values),
+            'errors': recorder.errors[step],
+            'per_second': len(values) / wall_seconds if wall_seconds else 0.0,
+            'p50_ms': percentile(values, 50) * 1000,
+            'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': (values[-1] if values else 0.0) * 1000,
+        }
+    return summary
+
+
+def compare(summary, baseline, tolerance):
+    """Steps whose p95 regressed by more than tolerance against the baseline."""
+    regressions = []
+    for step, stats in summary.items():
+        before = baseline.get('steps', {}).get(step)
+        if not before or not before['count'] or not stats['count']:
+            continue
+        if stats['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{step}: p95 {stats['p95_ms']:.1f} ms, baseline {before['p95_ms']:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=20, help='Simulated users (each takes every assessment)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Users running at the same time')
+    parser.add_argument('--warmup', type=int, default=1, help='Users run first and left out of the results')
+    parser.add_argument('--url', help='Base URL of a running server (default: run the app in this process)')
+    parser.add_argument('--database-url', help='Database for the in-process app (default: a temporary SQLite file)')
+    parser.add_argument('--types', help='Comma-separated assessment types (default: all)')
+    parser.add_argument('--pdf-timeout', type=float, default=60, help='Seconds to wait for each PDF')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Results file of an earlier run to compare p95 against')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed p95 slowdown against the baseline (0.5 = 50%%)')
+    args = parser.parse_args()
+
+    from app.models.assessment import ASSESSMENT_TYPES
+
+    names = args.types.split(',') if args.types else list(ASSESSMENT_TYPES)
+    unknown = [name for name in names if name not in ASSESSMENT_TYPES]
+    if unknown:
+        parser.error(f"unknown assessment type(s): {', '.join(unknown)}")
+    assessment_types = [(name, ASSESSMENT_TYPES[name]['max_score']) for name in names]
+
+    if args.url:
+        target = args.url
+        make_client = lambda: HTTPClient(args.url, timeout=args.pdf_timeout)
+    else:
+        database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load_test.db')
+        app = local_app(database_url)
+        target = 'in-process app'
+        make_client = lambda: AppClient(app)
+
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+
+    def simulate(n, record=True):
+        VirtualUser(make_client(), recorder, f'load-{run_id}-{n}@example.com',
+                    assessment_types, args.pdf_timeout, record).run()
+
+    for n in range(args.warmup):
+        simulate(f'warmup{n}', record=False)
+    warmup_errors = sum(recorder.errors.values())
+    if warmup_errors:
+        sys.exit(f"Warm-up user failed: {recorder.failures[0]}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(simulate, range(args.users)))
+    wall_seconds = time.perf_counter() - start
+
+    summary = summarize(recorder, wall_seconds)
+    requests = sum(stats['count'] for step, stats in summary.items() if step != 'pdf_ready')
+    print(f"{args.users} users x {len(assessment_types)} assessments against {target}, "
+          f"concurrency {args.concurrency}: {wall_seconds:.1f}s, {requests / wall_seconds:.1f} requests/s")
+    print(f"{'step':<14}{'count':>7}{'errors':>8}{'per s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for step, stats in summary.items():
+        print(f"{step:<14}{stats['count']:>7}{stats['errors']:>8}{stats['per_second']:>8.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+    for failure in recorder.failures:
+        print(f"FAIL: {failure}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'target': target, 'users': args.users, 'concurrency': args.concurrency,
+                       'types': names, 'wall_seconds': wall_seconds, 'steps': summary}, f, indent=2)
+
+    failed = bool(recorder.failures)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(summary, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"SLOWER: {regression}")
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == '__main__':
+    main()
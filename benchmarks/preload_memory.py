@@ -0,0 +1,101 @@
+"""
+Per-worker memory and first-request latency of gunicorn with and without preload.
+
+Starts gunicorn twice on a scratch SQLite database, once with GUNICORN_PRELOAD=1
+and once with 0, sends each worker's first requests, then reads every worker's
+PSS (shared pages split between the processes sharing them) and USS (pages
+only that worker has) from /proc. Linux only.
+
+Usage:
+    python benchmarks/preload_memory.py [--workers 4] [--port 8799]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PATHS = ['/', '/auth/login', '/auth/register']
+
+
+def memory_kib(pid):
+    """(PSS, USS) of a process in KiB."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values['Pss'], values['Private_Clean'] + values['Private_Dirty']
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def fetch(url):
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run(preload, workers, port, env):
+    env = dict(env, GUNICORN_PRELOAD='1' if preload else '0', WEB_CONCURRENCY=str(workers), PORT=str(port))
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'wsgi:app'], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f'http://127.0.0.1:{port}'
+        deadline = time.time() + 120
+        while True:
+            try:
+                fetch(base + '/health')
+                break
+            except OSError:
+                if time.time() > deadline or proc.poll() is not None:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.2)
+        ready = time.time()
+        while len(children(proc.pid)) < workers and time.time() < ready + 30:
+            time.sleep(0.2)
+
+        # Requests are spread over the workers, so the first few hit cold workers
+        latencies = [fetch(base + path) for _ in range(workers) for path in PATHS]
+        pids = children(proc.pid)
+        memory = [memory_kib(pid) for pid in pids]
+        return latencies, memory, memory_kib(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8799)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(tmp, 'preload.db'),
+                   FLASK_APP='run.py', REPORT_CACHE_DIR=os.path.join(tmp, 'reports'))
+        subprocess.run([sys.executable, '-m', 'flask', 'schema', 'create'], cwd=ROOT, env=env,
+                       check=True, capture_output=True)
+
+        print(f"{'preload':<9}{'worker PSS MiB':>16}{'worker USS MiB':>16}{'master PSS MiB':>16}"
+              f"{'first req ms':>14}{'max req ms':>12}")
+        for preload in (False, True):
+            latencies, memory, master = run(preload, args.workers, args.port, env)
+            pss = sum(p for p, _ in memory) / len(memory) / 1024
+            uss = sum(u for _, u in memory) / len(memory) / 1024
+            print(f"{'on' if preload else 'off':<9}{pss:>16.1f}{uss:>16.1f}{master[0] / 1024:>16.1f}"
+                  f"{latencies[0] * 1000:>14.1f}{max(latencies) * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
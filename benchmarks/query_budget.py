@@ -0,0 +1,141 @@
+"""
+Query budgets per endpoint, with N+1 detection.
+
+Builds a throwaway SQLite database with one member who has completed every
+assessment type a few times, and an admin with a cohort of eleven members. Then requests each
+page through the test client under assert_max_queries. Exits with status 1
+when an endpoint runs more queries than its budget, or repeats one statement
+--n-plus-one times or more; the report names the statements and the code
+that ran them. Run it in CI next to `flask queries explain`.
+
+Usage:
+    python benchmarks/query_budget.py [--assessments 3] [--n-plus-one 5] [--verbose]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+
+# (label, method, url, user, maximum queries); {id} is one of the member's assessments
+BUDGETS = [
+    ('home', 'GET', '/', 'member', 3),
+    ('assessment list', 'GET', '/assessment/', 'member', 2),
+    ('questions', 'GET', '/assessment/type/lsi', 'member', 4),
+    ('results', 'GET', '/assessment/results/{id}', 'member', 10),
+    ('results api', 'GET', '/assessment/api/results/{id}', 'member', 8),
+    ('pdf status', 'GET', '/assessment/api/pdf_status/{id}', 'member', 3),
+    ('history', 'GET', '/assessment/history', 'member', 4),
+    ('history api', 'GET', '/assessment/api/history', 'member', 4),
+    ('cohorts', 'GET', '/admin/cohorts', 'admin', 4),
+    ('cohort dashboard', 'GET', '/admin/cohorts/{cohort}', 'admin', 6),
+    ('readiness', 'GET', '/health/ready', None, 3),
+]
+
+
+class BudgetConfig(Config):
+    TESTING = True
+    WTF_CSRF_ENABLED = False
+    # Reports are irrelevant here; keep the workers from querying in the background
+    REPORT_WORKERS = 0
+    RENDER_POOL_SIZE = 0
+
+
+def seed(app, assessments_per_type):
+    """Questions, a member with completed assessments, an admin and a cohort of the member and ten peers."""
+    from app import db
+    from app.models.assessment import ASSESSMENT_QUESTIONS, ASSESSMENT_TYPES, Assessment, Question
+    from app.models.cohort import Cohort, CohortMember
+    from app.models.user import User
+
+    with app.app_context():
+        db.create_all()
+        for assessment_type, texts in ASSESSMENT_QUESTIONS.items():
+            categories = ASSESSMENT_TYPES[assessment_type]['categories']
+            for i, text in enumerate(texts):
+                db.session.add(Question(text=text, category=categories[i % len(categories)],
+                                        assessment_type=assessment_type))
+        users = {}
+        for name, is_admin in (('member', False), ('admin', True)):
+            user = User(email=f'{name}@example.com', name=name.title(), is_admin=is_admin)
+            user.set_password('secret1')
+            db.session.add(user)
+            users[name] = user
+        db.session.commit()
+        cohort = Cohort.create('Budget cohort', created_by=users['admin'].id)
+        db.session.add(CohortMember(cohort_id=cohort.id, user_id=users['member'].id))
+        # Enough members that a per-member lazy load would show up as N+1
+        for i in range(10):
+            user = User(email=f'peer{i}@example.com', name=f'Peer {i}')
+            user.set_password('secret1')
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(CohortMember(cohort_id=cohort.id, user_id=user.id))
+        db.session.commit()
+
+        assessment_ids = []
+        for assessment_type, info in ASSESSMENT_TYPES.items():
+            questions = Question.query.filter_by(assessment_type=assessment_type).all()
+            for n in range(assessments_per_type):
+                answers = [(question, (question.id + n) % max(info['scale']) + 1) for question in questions]
+                assessment_ids.append(Assessment.record(users['member'].id, assessment_type, answers).id)
+                db.session.commit()
+        return assessment_ids[0], cohort.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assessments', type=int, default=3, help='Completed assessments per type')
+    parser.add_argument('--n-plus-one', type=int, default=5,
+                        help='Fail when one statement runs this many times in a request')
+    parser.add_argument('--verbose', action='store_true', help='Print the profile of every endpoint')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp, 'budget.db')
+        BudgetConfig.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+        BudgetConfig.REPORT_CACHE_DIR = os.path.join(tmp, 'reports')
+
+        from app import create_app
+        from app.utils.query_profiler import assert_max_queries
+
+        app = create_app(BudgetConfig)
+        assessment_id, cohort_id = seed(app, args.assessments)
+
+        clients = {None: app.test_client()}
+        for name in ('member', 'admin'):
+            client = app.test_client()
+            client.post('/auth/login', data={'email': f'{name}@example.com', 'password': 'secret1'})
+            clients[name] = client
+
+        failures = 0
+        print(f"{'endpoint':<20}{'status':>7}{'queries':>9}{'budget':>8}{'ms':>8}")
+        for label, method, url, user, budget in BUDGETS:
+            url = url.format(id=assessment_id, cohort=cohort_id)
+            # Once to warm the per-process caches, then the measured request
+            clients[user].open(url, method=method)
+            try:
+                with assert_max_queries(budget, label=f'{method} {url}', n_plus_one=args.n_plus_one) as profile:
+                    response = clients[user].open(url, method=method)
+                error = None
+            except AssertionError as e:
+                error = str(e)
+            if response.status_code >= 400:
+                error = error or f"status {response.status_code}"
+            print(f"{label:<20}{response.status_code:>7}{profile.count:>9}{budget:>8}{profile.seconds * 1000:>8.1f}")
+            if error:
+                failures += 1
+                print(f"FAIL: {error}")
+            elif args.verbose:
+                print(profile.report())
+
+        print(f"{len(BUDGETS)} endpoints checked, {failures} over budget")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Local stand-in for a Redis server, for trying CACHE_BACKEND=redis without one.
+
+Implements the handful of commands the cache client sends (PING, GET, SET with
+EX/PX, DEL, FLUSHDB, SELECT, QUIT) over the Redis protocol, keeping the data in
+memory. Not for production use.
+
+Usage:
+    python benchmarks/resp_server.py [--port 6379]
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class Store:
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+
+    def delete(self, keys):
+        with self.lock:
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+def bulk(value):
+    if value is None:
+        return b'$-1\r\n'
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Inline command, as typed into telnet
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if not args:
+                return
+            command = args[0].upper()
+            if command == b'PING':
+                reply = b'+PONG\r\n'
+            elif command == b'GET':
+                reply = bulk(store.get(args[1]))
+            elif command == b'SET':
+                ttl = None
+                options = [arg.upper() for arg in args[3:]]
+                if b'PX' in options:
+                    ttl = int(args[3 + options.index(b'PX') + 1]) / 1000
+                elif b'EX' in options:
+                    ttl = int(args[3 + options.index(b'EX') + 1])
+                store.set(args[1], args[2], ttl)
+                reply = b'+OK\r\n'
+            elif command == b'DEL':
+                reply = b':%d\r\n' % store.delete(args[1:])
+            elif command == b'FLUSHDB':
+                store.clear()
+                reply = b'+OK\r\n'
+            elif command == b'SELECT':
+                reply = b'+OK\r\n'
+            elif command == b'QUIT':
+                self.wfile.write(b'+OK\r\n')
+                return
+            else:
+                reply = b'-ERR unknown command\r\n'
+            self.wfile.write(reply)
+
+
+class RESPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, RESPHandler)
+        self.store = Store()
+
+
+def start(port=0):
+    """Serve on localhost in a background thread; returns the server (server_address has the port)."""
+    server = RESPServer(('127.0.0.1', port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=6379)
+    args = parser.parse_args()
+    server = RESPServer(('127.0.0.1', args.port))
+    print(f"Listening on 127.0.0.1:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
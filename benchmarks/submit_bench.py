@@ -0,0 +1,98 @@
+"""
+Assessment submissions per second with per-object and bulk response inserts.
+
+"per-object" is what submit_assessment used to do: add the assessment, flush
+for its id, then add one AssessmentResponse per question and commit.
+"bulk" is Assessment.record, which writes the responses with a single
+executemany INSERT and also stores the score snapshot.
+
+Runs against a throwaway SQLite file by default. Pass --database-url to run
+against PostgreSQL; use a scratch database, since benchmark rows are left behind.
+
+Usage:
+    python benchmarks/submit_bench.py [--submissions 200]
+    python benchmarks/submit_bench.py --database-url postgresql://localhost/mindscape_bench
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def submit_per_object(db, Assessment, AssessmentResponse, user_id, assessment_type, answers):
+    assessment = Assessment(user_id=user_id, assessment_type=assessment_type, completed_at=datetime.utcnow())
+    db.session.add(assessment)
+    db.session.flush()
+    for question, score in answers:
+        db.session.add(AssessmentResponse(assessment_id=assessment.id, question_id=question.id, score=score))
+    db.session.commit()
+
+
+def submit_bulk(db, Assessment, user_id, assessment_type, answers):
+    Assessment.record(user_id, assessment_type, answers)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='Database to write to (default: a temporary SQLite file)')
+    parser.add_argument('--submissions', type=int, default=200, help='Submissions per assessment type and method')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'submit_bench.db')
+    os.environ['DATABASE_URL'] = database_url
+
+    from config import Config
+    from app import create_app, db
+    from app.models.assessment import (Question, Assessment, AssessmentResponse,
+                                       ASSESSMENT_QUESTIONS, ASSESSMENT_TYPES)
+    from app.models.user import User
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url.replace('postgres://', 'postgresql://')
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(email=f'bench-{time.time_ns()}@example.com', name='Benchmark')
+        user.set_password('benchmark')
+        db.session.add(user)
+        for assessment_type, questions in ASSESSMENT_QUESTIONS.items():
+            if Question.query.filter_by(assessment_type=assessment_type).count():
+                continue
+            categories = ASSESSMENT_TYPES[assessment_type]['categories']
+            for i, text in enumerate(questions):
+                db.session.add(Question(text=text, category=categories[i % len(categories)],
+                                        assessment_type=assessment_type))
+        db.session.commit()
+
+        print(f"database: {db.engine.url.render_as_string(hide_password=True)}")
+        print(f"{'assessment':<12}{'questions':>10}{'per-object/s':>14}{'bulk/s':>10}{'speedup':>10}")
+        for assessment_type, info in ASSESSMENT_TYPES.items():
+            questions = Question.query.filter_by(assessment_type=assessment_type).all()
+
+            def answers():
+                return [(question, random.randint(1, info['max_score'])) for question in questions]
+
+            rates = []
+            for submit in (
+                lambda: submit_per_object(db, Assessment, AssessmentResponse, user.id, assessment_type, answers()),
+                lambda: submit_bulk(db, Assessment, user.id, assessment_type, answers()),
+            ):
+                submit()  # Warm up the statement caches
+                start = time.perf_counter()
+                for _ in range(args.submissions):
+                    submit()
+                rates.append(args.submissions / (time.perf_counter() - start))
+
+            print(f"{assessment_type:<12}{len(questions):>10}{rates[0]:>14.1f}{rates[1]:>10.1f}{rates[1] / rates[0]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
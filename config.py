@@ -55,6 +55,64 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     ADMINS = ['your-email@example.com']
 
+    # PDF report job queue (REPORT_WORKERS = 0 renders inline in the request)
+    REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS') or 2)
+    REPORT_JOB_MAX_ATTEMPTS = int(os.environ.get('REPORT_JOB_MAX_ATTEMPTS') or 3)
+    REPORT_JOB_RETRY_DELAY = int(os.environ.get('REPORT_JOB_RETRY_DELAY') or 5)
+    # Running jobs untouched this long belong to a dead worker; the sweep looks for them every interval
+    REPORT_JOB_STALE_AFTER = int(os.environ.get('REPORT_JOB_STALE_AFTER') or 600)
+    REPORT_JOB_SWEEP_INTERVAL = int(os.environ.get('REPORT_JOB_SWEEP_INTERVAL') or 60)
+    # A failed job is rendered again when its report is viewed after this long
+    REPORT_JOB_FAILED_COOLDOWN = int(os.environ.get('REPORT_JOB_FAILED_COOLDOWN') or 900)
+
+    # Rendered PDF reports, addressed by a fingerprint of their content
+    REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR') or os.path.join(basedir, 'instance', 'reports')
+    REPORT_CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_BYTES') or 500 * 1024 * 1024)
+    REPORT_CACHE_MAX_AGE = int(os.environ.get('REPORT_CACHE_MAX_AGE') or 30 * 24 * 3600)
+
+    # 'matplotlib' (PNG charts) or 'reportlab' (vector charts, no matplotlib import)
+    CHART_BACKEND = os.environ.get('CHART_BACKEND') or 'matplotlib'
+
+    # Worker processes that build PDFs (RENDER_POOL_SIZE = 0 builds in the calling thread)
+    RENDER_POOL_SIZE = int(os.environ.get('RENDER_POOL_SIZE') or 2)
+    RENDER_POOL_MAX_PENDING = int(os.environ.get('RENDER_POOL_MAX_PENDING') or RENDER_POOL_SIZE * 4)
+    RENDER_JOB_TIMEOUT = int(os.environ.get('RENDER_JOB_TIMEOUT') or 60)
+    
+    # Cache of derived data: 'memory' (per process), 'sqlite' (shared by the
+    # processes on one host) or 'redis' (any Redis-protocol server)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'memory'
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL') or 3600)
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES') or 10000)
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH') or os.path.join(basedir, 'instance', 'cache.sqlite3')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or 'redis://localhost:6379/0'
+    
+    # Prometheus metrics at /metrics, behind `Authorization: Bearer <METRICS_TOKEN>`;
+    # off without a token unless METRICS_ENABLED=1 asks for an open endpoint
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1' if METRICS_TOKEN else '0') != '0'
+    
+    # Development only: profile the queries of every request and log likely N+1 patterns
+    QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', '0') != '0'
+    QUERY_PROFILER_N_PLUS_ONE = int(os.environ.get('QUERY_PROFILER_N_PLUS_ONE') or 5)
+    
+    # Readiness checks at /health/ready, rerun at most every HEALTH_CACHE_SECONDS;
+    # HEALTH_MAX_PENDING_JOBS limits the report jobs queued in one worker process
+    HEALTH_CACHE_SECONDS = int(os.environ.get('HEALTH_CACHE_SECONDS') or 5)
+    HEALTH_DB_TIMEOUT = int(os.environ.get('HEALTH_DB_TIMEOUT') or 2)
+    HEALTH_POOL_MAX_USAGE = float(os.environ.get('HEALTH_POOL_MAX_USAGE') or 0.9)
+    HEALTH_MAX_PENDING_JOBS = int(os.environ.get('HEALTH_MAX_PENDING_JOBS') or 100)
+    HEALTH_MIN_FREE_BYTES = int(os.environ.get('HEALTH_MIN_FREE_BYTES') or 100 * 1024 * 1024)
+    
+    # Seconds between checks of the question catalog version stamp
+    QUESTION_CATALOG_CHECK_INTERVAL = int(os.environ.get('QUESTION_CATALOG_CHECK_INTERVAL') or 30)
+    
+    # Percentiles are only shown once this many assessments of a type have been counted
+    PERCENTILE_MIN_SAMPLE = int(os.environ.get('PERCENTILE_MIN_SAMPLE') or 20)
+    
+    # Assessment history
+    HISTORY_PAGE_SIZE = int(os.environ.get('HISTORY_PAGE_SIZE') or 20)
+    DISPLAY_TIMEZONE = os.environ.get('DISPLAY_TIMEZONE') or 'America/New_York'
+
     @staticmethod
     def init_app(app):
         # Create the app directory if it doesn't exist
@@ -77,6 +135,8 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     DEBUG = False
     DEVELOPMENT = False
+    # Never serve traffic and queue figures to anyone without the token
+    METRICS_ENABLED = Config.METRICS_ENABLED and bool(Config.METRICS_TOKEN)
     
 config = {
     'development': DevelopmentConfig,
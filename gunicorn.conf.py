@@ -0,0 +1,51 @@
+"""
+Gunicorn settings.
+
+With preload_app (the default) the master builds the app once and warms it up
+before forking: compiled templates, the question catalog, chart templates and
+fonts are then shared copy-on-write by every worker instead of being rebuilt
+per worker. Set GUNICORN_PRELOAD=0 to load the app in each worker instead,
+e.g. to use --reload during development.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY') or 2)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS') or 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 120)
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+if preload_app and worker_class == 'gevent':
+    # The gevent worker patches the standard library after the fork, too late
+    # for the locks and threads the preloaded app has already created
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def when_ready(server):
+    """In the master, once the preloaded app is built: warm it up and freeze it."""
+    if not server.cfg.preload_app:
+        return
+    from app.utils.warmup import warm_up
+
+    timings = warm_up(server.app.wsgi())
+    server.log.info('Warmed up: ' + ', '.join(f'{name} {seconds * 1000:.0f} ms' for name, seconds in timings.items()))
+    # Keep the collector from touching (and so copying) the shared objects in every worker
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # warm_up() closed the master's database connections before forking, so
+    # each worker opens its own; the render pool detects the new pid and
+    # starts its own processes on first use
+    server.log.info(f"Worker {worker.pid} forked")
+
+
+def post_worker_init(worker):
+    """In each worker, once it has loaded the app: start the report queue."""
+    # Started here rather than on the first request, so jobs left by a previous
+    # deploy or a killed worker are picked up straight away
+    report_queue = getattr(worker.wsgi, 'extensions', {}).get('report_queue')
+    if report_queue is not None:
+        report_queue.start()
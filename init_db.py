@@ -1,7 +1,7 @@
 from flask import Flask
 from app import db, create_app
 from app.models.user import User
-from app.models.assessment import Question, ASSESSMENT_QUESTIONS, ASSESSMENT_TYPES
+from app.models.assessment import Question, QuestionCatalogVersion, ASSESSMENT_QUESTIONS, ASSESSMENT_TYPES
 from werkzeug.security import generate_password_hash
 import os
 
@@ -13,6 +13,9 @@ def init_db():
         db.create_all()
         print("Database tables recreated")
         
+        # Cached entries are keyed by ids that the new database reuses
+        app.extensions['shared_cache'].clear()
+        
         # Create admin user if it doesn't exist
         admin = User.query.filter_by(username='admin').first()
         if not admin:
@@ -44,6 +47,9 @@ def init_db():
                 db.session.add(question)
                 print(f"Added question {i+1}: {question_text[:50]}...")
         
+        # Tell running workers to reload their question catalog
+        QuestionCatalogVersion.bump()
+        
         try:
             db.session.commit()
             print("\nSuccessfully seeded all questions into the database")
@@ -0,0 +1,24 @@
+"""Add composite index for keyset-paginated assessment history
+
+Revision ID: 5d8c2b7e90f1
+Revises: e2a6f0b93d14
+Create Date: 2026-10-17 15:33:12.640958
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8c2b7e90f1'
+down_revision = 'e2a6f0b93d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_assessment_user_completed', 'assessment', ['user_id', 'completed_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_assessment_user_completed', table_name='assessment')
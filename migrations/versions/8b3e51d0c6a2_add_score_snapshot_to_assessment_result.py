@@ -0,0 +1,34 @@
+"""Add score snapshot columns to assessment_result
+
+Revision ID: 8b3e51d0c6a2
+Revises: 4f2a9c7d1e08
+Create Date: 2026-10-17 11:02:18.530417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3e51d0c6a2'
+down_revision = '4f2a9c7d1e08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('assessment_result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('category_scores', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('interpretation', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('visualization', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('scoring_version', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint('uq_assessment_result_assessment_id', ['assessment_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('assessment_result', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_assessment_result_assessment_id', type_='unique')
+        batch_op.drop_column('scoring_version')
+        batch_op.drop_column('visualization')
+        batch_op.drop_column('interpretation')
+        batch_op.drop_column('category_scores')
@@ -0,0 +1,30 @@
+"""Add indexes for the hot query paths
+
+Revision ID: a41f7c3b2d69
+Revises: 5d8c2b7e90f1
+Create Date: 2026-10-17 16:48:26.077135
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f7c3b2d69'
+down_revision = '5d8c2b7e90f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_question_assessment_type'), 'question', ['assessment_type'], unique=False)
+    op.create_index(op.f('ix_assessment_response_assessment_id'), 'assessment_response', ['assessment_id'], unique=False)
+    op.create_index(op.f('ix_assessment_result_user_id'), 'assessment_result', ['user_id'], unique=False)
+    op.create_index(op.f('ix_report_job_filename'), 'report_job', ['filename'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_report_job_filename'), table_name='report_job')
+    op.drop_index(op.f('ix_assessment_result_user_id'), table_name='assessment_result')
+    op.drop_index(op.f('ix_assessment_response_assessment_id'), table_name='assessment_response')
+    op.drop_index(op.f('ix_question_assessment_type'), table_name='question')
@@ -0,0 +1,61 @@
+"""Add cohort, cohort_member and cohort_aggregate tables
+
+Revision ID: b9e13f5a7c20
+Revises: a41f7c3b2d69
+Create Date: 2026-10-17 18:05:51.338704
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9e13f5a7c20'
+down_revision = 'a41f7c3b2d69'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cohort',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('cohort_member',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cohort_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['cohort_id'], ['cohort.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cohort_id', 'user_id')
+    )
+    op.create_index(op.f('ix_cohort_member_cohort_id'), 'cohort_member', ['cohort_id'], unique=False)
+    op.create_index(op.f('ix_cohort_member_user_id'), 'cohort_member', ['user_id'], unique=False)
+    op.create_table('cohort_aggregate',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cohort_id', sa.Integer(), nullable=False),
+    sa.Column('assessment_type', sa.String(length=50), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('total_squares', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['cohort_id'], ['cohort.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cohort_id', 'assessment_type', 'category')
+    )
+
+
+def downgrade():
+    op.drop_table('cohort_aggregate')
+    op.drop_index(op.f('ix_cohort_member_user_id'), table_name='cohort_member')
+    op.drop_index(op.f('ix_cohort_member_cohort_id'), table_name='cohort_member')
+    op.drop_table('cohort_member')
+    op.drop_table('cohort')
@@ -0,0 +1,29 @@
+"""Add question_catalog_version stamp table
+
+Revision ID: c7d94a1f2e35
+Revises: 8b3e51d0c6a2
+Create Date: 2026-10-17 12:40:05.118263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d94a1f2e35'
+down_revision = '8b3e51d0c6a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('question_catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('question_catalog_version')
@@ -0,0 +1,32 @@
+"""Add score_histogram table for population percentiles
+
+Revision ID: e2a6f0b93d14
+Revises: c7d94a1f2e35
+Create Date: 2026-10-17 14:21:47.902361
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6f0b93d14'
+down_revision = 'c7d94a1f2e35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('score_histogram',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('assessment_type', sa.String(length=50), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('bin', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('assessment_type', 'category', 'bin')
+    )
+
+
+def downgrade():
+    op.drop_table('score_histogram')
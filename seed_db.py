@@ -1,9 +1,12 @@
 from app import create_app, db
-from app.models.assessment import Question, ASSESSMENT_QUESTIONS
+from app.models.assessment import Question, QuestionCatalogVersion, ASSESSMENT_QUESTIONS
 
 def seed_questions():
     app = create_app()
     with app.app_context():
+        # Create the tables on a fresh database
+        db.create_all()
+        
         # Clear existing questions
         Question.query.delete()
         
@@ -34,6 +37,8 @@ def seed_questions():
                 )
                 db.session.add(question)
         
+        # Tell running workers to reload their question catalog
+        QuestionCatalogVersion.bump()
         db.session.commit()
         print(f"Database initialized with {Question.query.count()} questions")
 
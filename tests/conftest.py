@@ -0,0 +1,74 @@
+import pytest
+
+from config import Config
+
+
+@pytest.fixture
+def app(tmp_path):
+    """The app on a throwaway SQLite database with the question catalog loaded."""
+    from app import create_app, db
+    from app.models.assessment import ASSESSMENT_QUESTIONS, ASSESSMENT_TYPES, Question
+
+    class TestConfig(Config):
+        TESTING = True
+        WTF_CSRF_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'test.db')
+        REPORT_CACHE_DIR = str(tmp_path / 'reports')
+        CACHE_BACKEND = 'memory'
+        # Reports render inline in the request, with vector charts to keep the tests fast
+        REPORT_WORKERS = 0
+        RENDER_POOL_SIZE = 0
+        CHART_BACKEND = 'reportlab'
+        # Independent of the METRICS_* environment of the machine running the tests
+        METRICS_ENABLED = True
+        METRICS_TOKEN = 'test-token'
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        for assessment_type, texts in ASSESSMENT_QUESTIONS.items():
+            categories = ASSESSMENT_TYPES[assessment_type]['categories']
+            for i, text in enumerate(texts):
+                db.session.add(Question(text=text, category=categories[i % len(categories)],
+                                        assessment_type=assessment_type))
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def member(app, client):
+    """A registered user, logged in on client; returns the user's id."""
+    from app import db
+    from app.models.user import User
+
+    with app.app_context():
+        user = User(email='member@example.com', name='Member')
+        user.set_password('secret1')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    response = client.post('/auth/login', data={'email': 'member@example.com', 'password': 'secret1'})
+    assert response.status_code == 302
+    return user_id
+
+
+@pytest.fixture
+def completed_assessment(app, member):
+    """Factory for completed assessments of member: completed_assessment('lsi') -> assessment id."""
+    from app import db
+    from app.models.assessment import ASSESSMENT_TYPES, Assessment, Question
+
+    def create(assessment_type, offset=0):
+        scale = max(ASSESSMENT_TYPES[assessment_type]['scale'])
+        with app.app_context():
+            questions = Question.query.filter_by(assessment_type=assessment_type).all()
+            answers = [(question, (question.id + offset) % scale + 1) for question in questions]
+            assessment = Assessment.record(member, assessment_type, answers)
+            db.session.commit()
+            return assessment.id
+    return create
@@ -0,0 +1,25 @@
+"""Readiness fails on this process's report queue, not on the backlog shared by every instance."""
+from app import db
+from app.models.report import ReportJob
+
+
+def test_shared_backlog_does_not_fail_readiness(app, client, completed_assessment, member):
+    app.config['HEALTH_MAX_PENDING_JOBS'] = 2
+    with app.app_context():
+        # Pending jobs in the shared table, e.g. queued by other instances
+        for offset in range(4):
+            assessment_id = completed_assessment('lsi', offset)
+            db.session.add(ReportJob(assessment_id=assessment_id, user_id=member))
+        db.session.commit()
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    backlog = response.get_json()['checks']['report_backlog']
+    assert backlog['ok'] and '4 pending in total' in backlog['detail']
+
+
+def test_local_queue_over_limit_fails_readiness(app, client, monkeypatch):
+    app.config['HEALTH_MAX_PENDING_JOBS'] = 2
+    monkeypatch.setattr(app.extensions['report_queue'], 'local_depth', lambda: 3)
+    response = client.get('/health/ready')
+    assert response.status_code == 503
+    assert not response.get_json()['checks']['report_backlog']['ok']
@@ -0,0 +1,10 @@
+"""Startup stays within the import-time budget and leaves the report libraries unloaded."""
+from benchmarks.import_time import LAZY_PACKAGES, best_run
+
+BUDGET_MS = 1000
+
+
+def test_create_app_import_budget():
+    _, total_ms, eager = best_run(runs=3)
+    assert not eager, f"imported at startup: {', '.join(eager)} (only report views may import {LAZY_PACKAGES})"
+    assert total_ms <= BUDGET_MS, f"imports took {total_ms:.0f} ms, budget {BUDGET_MS} ms"
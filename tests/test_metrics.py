@@ -0,0 +1,14 @@
+"""/metrics is served only with its token, and only when enabled."""
+
+
+def test_metrics_requires_the_token(client):
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer test-token'})
+    assert response.status_code == 200
+    assert 'http_requests_total' in response.get_data(as_text=True)
+
+
+def test_metrics_disabled(app, client):
+    app.config['METRICS_ENABLED'] = False
+    assert client.get('/metrics', headers={'Authorization': 'Bearer test-token'}).status_code == 404
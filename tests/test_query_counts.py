@@ -0,0 +1,35 @@
+"""Query budgets of the results pages, so a lazy-load regression fails the suite."""
+import pytest
+
+from app.utils.query_profiler import assert_max_queries
+
+
+@pytest.mark.parametrize('url, budget', [
+    ('/assessment/results/{id}', 10),
+    ('/assessment/api/results/{id}', 8),
+])
+@pytest.mark.parametrize('assessment_type', ['lsi', 'oci', 'lpi', 'influence'])
+def test_results_query_budget(client, completed_assessment, url, budget, assessment_type):
+    url = url.format(id=completed_assessment(assessment_type))
+    # The first view renders the PDF and warms the per-process caches
+    assert client.get(url).status_code == 200
+    with assert_max_queries(budget, label=f'GET {url}', n_plus_one=5):
+        response = client.get(url)
+    assert response.status_code == 200
+
+
+def test_results_query_count_does_not_grow_with_history(client, completed_assessment):
+    """Scoring one assessment costs the same however many the user has taken."""
+    first = completed_assessment('lsi')
+    for offset in range(1, 6):
+        completed_assessment('lsi', offset)
+    latest = completed_assessment('lsi', 6)
+
+    counts = []
+    for assessment_id in (first, latest):
+        url = f'/assessment/results/{assessment_id}'
+        client.get(url)
+        with assert_max_queries(10, label=f'GET {url}') as profile:
+            client.get(url)
+        counts.append(profile.count)
+    assert counts[0] == counts[1]
@@ -0,0 +1,28 @@
+"""Query plan regression: no hot query may read a whole table on SQLite."""
+from sqlalchemy import text
+
+from app import db
+from app.utils.query_plans import explain_hot_queries, full_scans, hot_queries
+
+
+def test_hot_queries_use_indexes(app):
+    with app.app_context():
+        results = explain_hot_queries(db)
+    scans = [f"{name}: {', '.join(steps)}\n    {' '.join(statement.split())}"
+             for name, statement, steps in results if steps]
+    assert not scans, 'Full table scans:\n' + '\n'.join(scans)
+
+
+def test_every_hot_query_is_explained(app):
+    with app.app_context():
+        explained = {name for name, _, _ in explain_hot_queries(db)}
+    assert explained == {name for name, _ in hot_queries()}
+
+
+def test_full_scans_flags_an_unindexed_filter(app):
+    """The check itself: filtering on a column without an index is reported as a scan."""
+    with app.app_context():
+        plan = db.session.execute(text("EXPLAIN QUERY PLAN SELECT * FROM user WHERE name = 'x'")).fetchall()
+        indexed = db.session.execute(text("EXPLAIN QUERY PLAN SELECT * FROM user WHERE id = 1")).fetchall()
+    assert full_scans(plan) == ['SCAN user']
+    assert full_scans(indexed) == []
@@ -0,0 +1,98 @@
+"""The batch (matrix) scorers give exactly what the per-respondent scorers give."""
+import random
+
+import numpy as np
+import pytest
+
+from app.utils import scoring
+
+SCORERS = {
+    'lsi': (scoring.calculate_lsi_scores, scoring.batch_lsi_scores, scoring.LSI_STYLES, 5),
+    'oci': (scoring.calculate_oci_scores, scoring.batch_oci_scores, scoring.OCI_NORMS, 5),
+    'lpi': (scoring.calculate_lpi_scores, scoring.batch_lpi_scores, scoring.LPI_PRACTICES, 10),
+    'influence': (scoring.calculate_influence_scores, scoring.batch_influence_scores,
+                  scoring.INFLUENCE_POWER_TYPES, 5),
+}
+
+
+def question_count(index_map):
+    indices = []
+    for value in index_map.values():
+        # OCI nests its styles one level deeper than the other scales
+        groups = value.values() if isinstance(value, dict) else [value]
+        for group in groups:
+            indices.extend(group)
+    return max(indices) + 1
+
+
+def assert_same_scores(expected, batch, row, path=''):
+    assert set(batch) == set(expected), path
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same_scores(value, batch[key], row, f'{path}{key}.')
+        else:
+            # Exact equality: the batch path must produce the same floats, not nearly the same
+            assert batch[key][row] == value, f"respondent {row}: {path}{key}"
+
+
+def check(name, response_sets, num_questions=None):
+    single, batch, index_map, _ = SCORERS[name]
+    matrix = scoring.responses_to_matrix(response_sets, num_questions or question_count(index_map))
+    result = batch(matrix)
+    for row, responses in enumerate(response_sets):
+        assert_same_scores(single(responses), result, row)
+
+
+@pytest.mark.parametrize('name', SCORERS)
+def test_random_responses(name):
+    rng = random.Random(f'scoring-{name}')
+    _, _, index_map, max_score = SCORERS[name]
+    num_questions = question_count(index_map)
+    # A few unanswered questions per respondent exercise the missing-answer path
+    response_sets = [
+        {str(i): rng.randint(1, max_score) for i in range(num_questions) if rng.random() > 0.05}
+        for _ in range(500)
+    ]
+    check(name, response_sets)
+
+
+@pytest.mark.parametrize('name', SCORERS)
+def test_edge_cases(name):
+    _, _, index_map, max_score = SCORERS[name]
+    num_questions = question_count(index_map)
+    check(name, [
+        {},                                                    # nothing answered
+        {str(i): 1 for i in range(num_questions)},             # all minimum
+        {str(i): max_score for i in range(num_questions)},     # all maximum
+        {str(i): 1 + i % max_score for i in range(num_questions)},
+        {'0': max_score},                                      # a single answer
+        {str(num_questions + 5): 3, '-1': 3},                  # only keys outside the scale
+    ])
+
+
+@pytest.mark.parametrize('name', SCORERS)
+def test_single_respondent(name):
+    _, _, index_map, max_score = SCORERS[name]
+    check(name, [{str(i): max_score - i % 2 for i in range(question_count(index_map))}])
+
+
+@pytest.mark.parametrize('name', SCORERS)
+@pytest.mark.parametrize('extra_columns', [-7, 0, 3])
+def test_matrix_width(name, extra_columns):
+    """Missing trailing columns count as unanswered; extra columns are ignored."""
+    single, batch, index_map, max_score = SCORERS[name]
+    num_questions = question_count(index_map)
+    rng = random.Random(f'width-{name}-{extra_columns}')
+    response_sets = [{str(i): rng.randint(1, max_score) for i in range(num_questions)} for _ in range(20)]
+    width = num_questions + extra_columns
+    matrix = scoring.responses_to_matrix(response_sets, width)
+    result = batch(matrix)
+    for row, responses in enumerate(response_sets):
+        # Columns dropped from the matrix are unanswered for the per-respondent scorer too
+        visible = {key: value for key, value in responses.items() if int(key) < width}
+        assert_same_scores(single(visible), result, row)
+
+
+def test_batch_rejects_a_vector():
+    with pytest.raises(ValueError):
+        scoring.batch_lsi_scores(np.ones(48))